@@ -5,7 +5,10 @@ import json
 from flask import Flask, Response, render_template, jsonify, request
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from examples.camera import Camera
-from emotion_processor.main import EmotionRecognitionSystem
+from examples.replay import open_video_source
+from emotion_processor.main import EmotionRecognitionSystem, options_from_env
+from frame_hub import FrameHub
+from metrics import timed, render_prometheus, PROMETHEUS_CONTENT_TYPE
 
 app = Flask(__name__)
 
@@ -17,6 +20,8 @@ class VideoStream:
         self.emotion_recording = False
         self.video_writer = None
         self.out_file = "output.avi"
+        # Un solo hilo captura y analiza; todos los clientes de /video_feed leen de aquí
+        self.frame_hub = FrameHub(self.camera, self.process_frame)
 
     def start_video_recording(self, filename="output.avi"):
         """Inicia grabación de video."""
@@ -53,37 +58,34 @@ class VideoStream:
             return summary
         return None
 
-    def generate_frames(self):
-        """Genera frames para streaming."""
-        while True:
-            ret, frame = self.camera.read()
-            if not ret:
-                print("Error: Cannot read frame from camera")
-                continue
-            
-            try:
-                result = self.emotion_recognition_system.frame_processing(frame)
-                if isinstance(result, tuple):
-                    frame = result[0]
-                else:
-                    frame = result
-                    
-            except Exception as e:
-                print(f"Error in frame_processing: {e}")
-                continue
-            
-            # Grabar video si está activo
-            if self.video_recording and self.video_writer is not None:
+    def process_frame(self, frame):
+        """Analiza un frame y lo graba si corresponde."""
+        result = self.emotion_recognition_system.frame_processing(frame)
+        if isinstance(result, tuple):
+            frame = result[0]
+        else:
+            frame = result
+        
+        # Grabar video si está activo
+        if self.video_recording and self.video_writer is not None:
+            with timed('video_write'):
                 self.video_writer.write(frame)
-            
-            ret, buffer = cv2.imencode('.jpg', frame)
-            if not ret:
-                print("Error: Cannot encode frame to JPEG")
-                continue
-                
-            frame = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+        return frame
+
+    def generate_frames(self):
+        """Genera frames para streaming desde el hub compartido."""
+        yield from self.frame_hub.subscribe()
+
+    def get_metric_gauges(self):
+        """Valores instantáneos que acompañan a los histogramas en /metrics."""
+        stats = self.emotion_recognition_system.get_analysis_stats()
+        return {
+            'analysis_backoff': stats['backoff'],
+            'analysis_ratio': stats['analysis_ratio'],
+            'motion_skip_ratio': stats.get('motion_skip_ratio'),
+            'glass_to_result_lag_seconds': self.frame_hub.glass_to_result_lag,
+            'video_feed_subscribers': self.frame_hub.subscribers,
+        }
 
 @app.route('/')
 def index():
@@ -122,6 +124,16 @@ def get_current_summary():
     summary = video_stream.emotion_recognition_system.get_current_summary()
     return jsonify(summary)
 
+@app.route('/analysis_stats', methods=['GET'])
+def analysis_stats():
+    """Frames analizados/omitidos (frecuencia de análisis y cara estática) en la sesión actual."""
+    return jsonify(video_stream.emotion_recognition_system.get_analysis_stats())
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Histogramas de latencia por etapa en formato de texto de Prometheus."""
+    return Response(render_prometheus(video_stream.get_metric_gauges()), mimetype=PROMETHEUS_CONTENT_TYPE)
+
 @app.route('/download_history', methods=['GET'])
 def download_history():
     """Descarga el historial de emociones más reciente."""
@@ -137,18 +149,22 @@ def favicon():
 
 if __name__ == "__main__":
     try:
-        camera = Camera(0, 640, 480)
+        camera = open_video_source(0, 640, 480, threaded=True)
         print("✅ Camera initialized successfully")
     except Exception as e:
         print(f"❌ Failed to initialize camera: {e}")
         sys.exit(1)
     
     try:
-        emotion_recognition_system = EmotionRecognitionSystem()
+        emotion_recognition_system = EmotionRecognitionSystem(**options_from_env())
         print("✅ EmotionRecognitionSystem initialized successfully")
     except Exception as e:
         print(f"❌ Failed to initialize EmotionRecognitionSystem: {e}")
         sys.exit(1)
     
     video_stream = VideoStream(camera, emotion_recognition_system)
-    app.run(host='0.0.0.0', port=5001, debug=True, use_reloader=False)
\ No newline at end of file
+    try:
+        app.run(host='0.0.0.0', port=5001, debug=True, use_reloader=False)
+    finally:
+        # El productor de frames no debe seguir capturando al cerrar el servidor
+        video_stream.frame_hub.stop()
@@ -2,14 +2,20 @@ import os
 import sys
 import cv2
 import json
+import time
 import requests
 from flask import Flask, Response, render_template, jsonify, request
 from examples.camera import Camera
-from emotion_processor.main import EmotionRecognitionSystem
+from examples.replay import open_video_source
+from emotion_processor.main import EmotionRecognitionSystem, options_from_env
 from text_emotion_classifier import TextEmotionClassifier
-from speech_recognizer import SpeechRecognizer
+from speech_recognizer import SpeechRecognizer, speech_options_from_env
+from audio_recorder import save_sync_metadata
 from emotion_fusion import EmotionFusion
+from incremental_fusion import IncrementalFusion
 from voice_synthesizer import VoiceSynthesizer
+from frame_hub import FrameHub
+from metrics import timed, render_prometheus, PROMETHEUS_CONTENT_TYPE
 
 app = Flask(__name__)
 
@@ -33,10 +39,20 @@ class IntegratedVideoStream:
         self.latest_fusion = None
         self.text_mode = True
         self.voice_synthesizer = voice_synth
+        # Cada enunciado transcrito se clasifica y fusiona con su ventana facial al momento
+        self.fusion_stream = IncrementalFusion(text_classifier, fusion, face_system)
+        self.speech_recognizer.on_utterance = self.fusion_stream.submit
+        # perf_counter() de cada frame escrito: alinea el video con el audio y el historial
+        self.video_frame_clocks = []
+        # Si la sesión en curso arrancó la captura de voz; stop_session puede cambiar text_mode después
+        self.audio_capture = False
+        # Un solo hilo captura y analiza; todos los clientes de /video_feed leen de aquí
+        self.frame_hub = FrameHub(self.camera, self.process_frame)
 
     def start_recording(self):
         self.is_recording = True
         self.accumulated_text = ""
+        self.video_frame_clocks = []
 
         fourcc = cv2.VideoWriter_fourcc(*'XVID')
         fps = 20.0
@@ -55,13 +71,20 @@ class IntegratedVideoStream:
             idx += 1
 
         self.video_writer = cv2.VideoWriter(filename, fourcc, fps, frame_size)
+        self.current_video_path = filename
         print(f"🎬 Grabando en: {filename}")
 
-        if not self.text_mode:
-            self.speech_recognizer.start_listening()
-
+        # El historial arranca primero: su reloj es el origen de tiempo del audio grabado
         self.face_system.start_recording()
 
+        self.audio_capture = not self.text_mode
+        if self.audio_capture:
+            self.fusion_stream.start()
+            self.speech_recognizer.start_listening(
+                audio_path=os.path.splitext(filename)[0] + ".wav",
+                audio_start_clock=self.face_system.emotion_history.start_clock
+            )
+
         mode = "Texto" if self.text_mode else "Voz"
         print(f"✅ Grabación iniciada: Video + {mode} + Rostro")
 
@@ -74,27 +97,48 @@ class IntegratedVideoStream:
         if self.video_writer:
             self.video_writer.release()
 
+        session_fusion = None
+        # La captura se detiene según cómo arrancó la sesión, aunque el chat haya cambiado text_mode
+        if self.audio_capture:
+            self.speech_recognizer.stop_listening()
+            # Los enunciados ya se fusionaron mientras se hablaba; solo quedan los pendientes
+            session_fusion = self.fusion_stream.finalize()
         if self.text_mode and text_from_chat:
+            # El texto del chat reemplaza lo dictado: se clasifica completo más abajo
             self.accumulated_text = text_from_chat
+            session_fusion = None
         else:
-            self.speech_recognizer.stop_listening()
             self.accumulated_text = self.speech_recognizer.get_all_text()
 
+        save_sync_metadata(
+            os.path.splitext(self.current_video_path)[0] + "_sync.json",
+            self.speech_recognizer.last_recording if self.audio_capture else None,
+            self.current_video_path,
+            self.video_frame_clocks,
+            self.face_system.emotion_history.start_clock
+        )
+
         face_summary = self.face_system.stop_recording()
-        text_result = self.text_classifier.classify(self.accumulated_text)
 
-        if face_summary and 'emotion_statistics' in face_summary:
-            face_emotions = {
-                emotion: stats['mean']
-                for emotion, stats in face_summary['emotion_statistics'].items()
-            }
+        if session_fusion and session_fusion['fusion_result']:
+            text_result = session_fusion['text_result']
+            fusion_result = session_fusion['fusion_result']
         else:
-            face_emotions = {"neutral": 50.0}
+            with timed('text_classification'):
+                text_result = self.text_classifier.classify(self.accumulated_text)
+
+            if face_summary and 'emotion_statistics' in face_summary:
+                face_emotions = {
+                    emotion: stats['mean']
+                    for emotion, stats in face_summary['emotion_statistics'].items()
+                }
+            else:
+                face_emotions = {"neutral": 50.0}
 
-        fusion_result = self.fusion_engine.fuse(
-            text_result['emotions'],
-            face_emotions
-        )
+            fusion_result = self.fusion_engine.fuse(
+                text_result['emotions'],
+                face_emotions
+            )
         self.latest_fusion = fusion_result
 
         llm_payload = self.fusion_engine.to_llm_format(
@@ -134,12 +178,13 @@ class IntegratedVideoStream:
             print("\n📤 Enviando a Minimax:")
             print(json.dumps(minimax_payload, indent=2, ensure_ascii=False))
 
-            response = requests.post(
-                MINIMAX_URL,
-                headers=headers,
-                json=minimax_payload,
-                timeout=30
-            )
+            with timed('llm_request'):
+                response = requests.post(
+                    MINIMAX_URL,
+                    headers=headers,
+                    json=minimax_payload,
+                    timeout=30
+                )
 
             if response.status_code == 200:
                 data = response.json()
@@ -175,36 +220,40 @@ class IntegratedVideoStream:
             "text_result": text_result,
             "face_summary": face_summary,
             "fusion_result": fusion_result,
+            "utterance_fusion": session_fusion['utterances'] if session_fusion else [],
             "llm_payload": llm_payload,
             "therapist_response": therapist_response,
             "llm_output": json.dumps(llm_payload, indent=2, ensure_ascii=False)
         }
 
-    def generate_frames(self):
-        while True:
-            ret, frame = self.camera.read()
-            if not ret:
-                continue
-
-            try:
-                processed_frame = self.face_system.frame_processing(frame)
+    def process_frame(self, frame):
+        processed_frame = self.face_system.frame_processing(frame)
 
-                if self.is_recording and self.video_writer:
-                    self.video_writer.write(processed_frame)
+        if self.is_recording and self.video_writer:
+            with timed('video_write'):
+                self.video_writer.write(processed_frame)
+            self.video_frame_clocks.append(time.perf_counter())
 
-                ret, buffer = cv2.imencode('.jpg', processed_frame)
-                if not ret:
-                    continue
+        return processed_frame
 
-                frame_bytes = buffer.tobytes()
-                yield (
-                    b'--frame\r\n'
-                    b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n'
-                )
+    def generate_frames(self):
+        yield from self.frame_hub.subscribe()
 
-            except Exception as e:
-                print(f"❌ Error en frame: {e}")
-                continue
+    def get_metric_gauges(self):
+        stats = self.face_system.get_analysis_stats()
+        speech = self.speech_recognizer.get_metrics()
+        return {
+            'analysis_backoff': stats['backoff'],
+            'analysis_ratio': stats['analysis_ratio'],
+            'motion_skip_ratio': stats.get('motion_skip_ratio'),
+            'glass_to_result_lag_seconds': self.frame_hub.glass_to_result_lag,
+            'video_feed_subscribers': self.frame_hub.subscribers,
+            'speech_audio_backlog_seconds': speech['audio_backlog_seconds'],
+            'transcription_queue_depth': speech['job_queue_depth'],
+            'transcription_lag_seconds': speech['last_transcription_lag'],
+            'dropped_partial_transcriptions': speech['dropped_partial_jobs'],
+            'stale_transcription_jobs': speech['stale_jobs'],
+        }
 
 
 # === RUTAS ===
@@ -264,12 +313,22 @@ def get_current_emotions():
     return jsonify({'emotions': {}})
 
 
+@app.route('/analysis_stats')
+def analysis_stats():
+    return jsonify(video_stream.face_system.get_analysis_stats())
+
+
+@app.route('/metrics')
+def metrics():
+    return Response(render_prometheus(video_stream.get_metric_gauges()), mimetype=PROMETHEUS_CONTENT_TYPE)
+
+
 if __name__ == "__main__":
     try:
-        camera = Camera(0, 640, 480)
-        face_system = EmotionRecognitionSystem()
+        camera = open_video_source(0, 640, 480, threaded=True)
+        face_system = EmotionRecognitionSystem(**options_from_env())
         text_classifier = TextEmotionClassifier()
-        speech_recognizer = SpeechRecognizer()
+        speech_recognizer = SpeechRecognizer(**speech_options_from_env())
         fusion_engine = EmotionFusion()
         voice_synth = VoiceSynthesizer(voice="es-MX-DaliaNeural")
 
@@ -287,7 +346,11 @@ if __name__ == "__main__":
         print("=" * 60)
         print("🌐 http://localhost:5001\n")
 
-        app.run(host='0.0.0.0', port=5001, debug=True, use_reloader=False)
+        try:
+            app.run(host='0.0.0.0', port=5001, debug=True, use_reloader=False)
+        finally:
+            # El productor de frames no debe seguir capturando al cerrar el servidor
+            video_stream.frame_hub.stop()
 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -3,6 +3,7 @@ import os
 import sys
 import cv2
 import json
+import time
 import base64
 import requests
 from datetime import datetime
@@ -10,12 +11,17 @@ from flask import Flask, Response, render_template, jsonify, request
 from pymongo import MongoClient
 from bson import ObjectId
 from examples.camera import Camera
-from emotion_processor.main import EmotionRecognitionSystem
+from examples.replay import open_video_source
+from emotion_processor.main import EmotionRecognitionSystem, options_from_env
 from text_emotion_classifier import TextEmotionClassifier
 from coqui_tts_natural import NaturalSpanishTTS  # ← Archivo corregido abajo
-from speech_recognizer import SpeechRecognizer
+from speech_recognizer import SpeechRecognizer, speech_options_from_env
+from audio_recorder import save_sync_metadata
 from emotion_fusion import EmotionFusion
+from incremental_fusion import IncrementalFusion
 from voice_synthesizer import VoiceSynthesizer
+from frame_hub import FrameHub
+from metrics import timed, render_prometheus, PROMETHEUS_CONTENT_TYPE
 
 app = Flask(__name__)
 
@@ -52,13 +58,23 @@ class IntegratedVideoStream:
         self.latest_fusion = None
         self.text_mode = True
         self.voice_synthesizer = voice_synth
+        # Cada enunciado transcrito se clasifica y fusiona con su ventana facial al momento
+        self.fusion_stream = IncrementalFusion(text_classifier, fusion, face_system)
+        self.speech_recognizer.on_utterance = self.fusion_stream.submit
+        # perf_counter() de cada frame escrito: alinea el video con el audio y el historial
+        self.video_frame_clocks = []
+        # Si la sesión en curso arrancó la captura de voz; stop_session puede cambiar text_mode después
+        self.audio_capture = False
         self.current_session_id = None
         self.current_video_path = None
+        # Un solo hilo captura y analiza; todos los clientes de /video_feed leen de aquí
+        self.frame_hub = FrameHub(self.camera, self.process_frame)
 
     def start_recording(self):
         self.is_recording = True
         self.accumulated_text = ""
         self.video_writer = None
+        self.video_frame_clocks = []
 
         # Crear sesión en MongoDB
         session_doc = {
@@ -69,7 +85,8 @@ class IntegratedVideoStream:
             'emotion_history': [],
             'video_path': None
         }
-        result = sessions_collection.insert_one(session_doc)
+        with timed('mongo_write'):
+            result = sessions_collection.insert_one(session_doc)
         self.current_session_id = result.inserted_id
 
         # Configurar video
@@ -85,10 +102,16 @@ class IntegratedVideoStream:
 
         print(f"Grabando en: {filename}")
 
-        if not self.text_mode:
-            self.speech_recognizer.start_listening()
-
+        # El historial arranca primero: su reloj es el origen de tiempo del audio grabado
         self.face_system.start_recording()
+
+        self.audio_capture = not self.text_mode
+        if self.audio_capture:
+            self.fusion_stream.start()
+            self.speech_recognizer.start_listening(
+                audio_path=os.path.splitext(filename)[0] + ".wav",
+                audio_start_clock=self.face_system.emotion_history.start_clock
+            )
         mode = "Texto" if self.text_mode else "Voz"
         print(f"Grabación iniciada: Video + {mode} + Rostro")
 
@@ -104,31 +127,54 @@ class IntegratedVideoStream:
             self.video_writer = None
 
         # Obtener texto
+        session_fusion = None
+        # La captura se detiene según cómo arrancó la sesión, aunque el chat haya cambiado text_mode
+        if self.audio_capture:
+            self.speech_recognizer.stop_listening()
+            # Los enunciados ya se fusionaron mientras se hablaba; solo quedan los pendientes
+            session_fusion = self.fusion_stream.finalize()
         if self.text_mode and text_from_chat:
+            # El texto del chat reemplaza lo dictado: se clasifica completo más abajo
             self.accumulated_text = text_from_chat
+            session_fusion = None
         else:
-            self.speech_recognizer.stop_listening()
             self.accumulated_text = self.speech_recognizer.get_all_text()
 
+        audio_info = self.speech_recognizer.last_recording if self.audio_capture else None
+        sync_path = save_sync_metadata(
+            os.path.splitext(self.current_video_path)[0] + "_sync.json",
+            audio_info,
+            self.current_video_path,
+            self.video_frame_clocks,
+            self.face_system.emotion_history.start_clock
+        )
+
         # Detener análisis facial
         face_summary = self.face_system.stop_recording()
 
-        # Clasificar emociones del texto
-        text_result = self.text_classifier.classify(self.accumulated_text or "silencio")
-
-        # Emociones faciales
-        face_emotions = {"neutral": 50.0}
-        if face_summary and 'emotion_statistics' in face_summary:
-            face_emotions = {
-                emotion: stats['mean']
-                for emotion, stats in face_summary['emotion_statistics'].items()
-            }
-
-        # Fusión
-        fusion_result = self.fusion_engine.fuse(
-            text_result['emotions'],
-            face_emotions
-        )
+        if session_fusion and session_fusion['fusion_result']:
+            # Resultado acumulado por enunciado (texto y rostro de la misma ventana)
+            text_result = session_fusion['text_result']
+            face_emotions = session_fusion['face_emotions'] or {"neutral": 50.0}
+            fusion_result = session_fusion['fusion_result']
+        else:
+            # Clasificar emociones del texto
+            with timed('text_classification'):
+                text_result = self.text_classifier.classify(self.accumulated_text or "silencio")
+
+            # Emociones faciales
+            face_emotions = {"neutral": 50.0}
+            if face_summary and 'emotion_statistics' in face_summary:
+                face_emotions = {
+                    emotion: stats['mean']
+                    for emotion, stats in face_summary['emotion_statistics'].items()
+                }
+
+            # Fusión
+            fusion_result = self.fusion_engine.fuse(
+                text_result['emotions'],
+                face_emotions
+            )
         self.latest_fusion = fusion_result
 
         # Contexto previo
@@ -147,7 +193,8 @@ class IntegratedVideoStream:
         therapist_response = "Lo siento, no pude conectar con el terapeuta."
         try:
             print("Enviando al LLM...")
-            response = requests.post(LLM_API_URL, json=llm_payload, timeout=30)
+            with timed('llm_request'):
+                response = requests.post(LLM_API_URL, json=llm_payload, timeout=30)
             if response.status_code == 200:
                 llm_response = response.json()
                 therapist_response = llm_response.get('response', 'Sin respuesta.')
@@ -170,20 +217,25 @@ class IntegratedVideoStream:
             'text_emotions': text_result['emotions'],
             'face_emotions': face_emotions,
             'fusion_result': fusion_result,
-            'emotion_statistics': face_summary.get('emotion_statistics', {}) if face_summary else {}
+            'emotion_statistics': face_summary.get('emotion_statistics', {}) if face_summary else {},
+            'utterances': face_summary.get('utterances', []) if face_summary else [],
+            'utterance_fusion': session_fusion['utterances'] if session_fusion else []
         }
 
-        sessions_collection.update_one(
-            {'_id': self.current_session_id},
-            {
-                '$push': {'interactions': interaction_doc},
-                '$set': {
-                    'end_time': datetime.utcnow(),
-                    'status': 'completed',
-                    'video_path': self.current_video_path
+        with timed('mongo_write'):
+            sessions_collection.update_one(
+                {'_id': self.current_session_id},
+                {
+                    '$push': {'interactions': interaction_doc},
+                    '$set': {
+                        'end_time': datetime.utcnow(),
+                        'status': 'completed',
+                        'video_path': self.current_video_path,
+                        'audio_path': audio_info['audio_path'] if audio_info else None,
+                        'sync_path': sync_path
+                    }
                 }
-            }
-        )
+            )
 
         print(f"Sesión guardada: {self.current_video_path}")
         return {
@@ -209,24 +261,32 @@ class IntegratedVideoStream:
             } for i in interactions
         ]
 
+    def process_frame(self, frame):
+        processed_frame = self.face_system.frame_processing(frame)
+        if self.is_recording and self.video_writer:
+            with timed('video_write'):
+                self.video_writer.write(processed_frame)
+            self.video_frame_clocks.append(time.perf_counter())
+        return processed_frame
+
     def generate_frames(self):
-        while True:
-            ret, frame = self.camera.read()
-            if not ret:
-                continue
-            try:
-                processed_frame = self.face_system.frame_processing(frame)
-                if self.is_recording and self.video_writer:
-                    self.video_writer.write(processed_frame)
-
-                ret, buffer = cv2.imencode('.jpg', processed_frame)
-                if not ret:
-                    continue
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-            except Exception as e:
-                print(f"Error en frame: {e}")
-                continue
+        yield from self.frame_hub.subscribe()
+
+    def get_metric_gauges(self):
+        stats = self.face_system.get_analysis_stats()
+        speech = self.speech_recognizer.get_metrics()
+        return {
+            'analysis_backoff': stats['backoff'],
+            'analysis_ratio': stats['analysis_ratio'],
+            'motion_skip_ratio': stats.get('motion_skip_ratio'),
+            'glass_to_result_lag_seconds': self.frame_hub.glass_to_result_lag,
+            'video_feed_subscribers': self.frame_hub.subscribers,
+            'speech_audio_backlog_seconds': speech['audio_backlog_seconds'],
+            'transcription_queue_depth': speech['job_queue_depth'],
+            'transcription_lag_seconds': speech['last_transcription_lag'],
+            'dropped_partial_transcriptions': speech['dropped_partial_jobs'],
+            'stale_transcription_jobs': speech['stale_jobs'],
+        }
 
 # === RUTAS FLASK ===
 @app.route('/')
@@ -269,6 +329,14 @@ def get_current_emotions():
         return jsonify({'emotions': video_stream.face_system.emotion_history_list[-1]})
     return jsonify({'emotions': {}})
 
+@app.route('/analysis_stats')
+def analysis_stats():
+    return jsonify(video_stream.face_system.get_analysis_stats())
+
+@app.route('/metrics')
+def metrics():
+    return Response(render_prometheus(video_stream.get_metric_gauges()), mimetype=PROMETHEUS_CONTENT_TYPE)
+
 @app.route('/get_session_history/<session_id>')
 def get_session_history(session_id):
     try:
@@ -289,10 +357,10 @@ def get_all_sessions():
 
 if __name__ == "__main__":
     try:
-        camera = Camera(0, 640, 480)
-        face_system = EmotionRecognitionSystem()
+        camera = open_video_source(0, 640, 480, threaded=True)
+        face_system = EmotionRecognitionSystem(**options_from_env())
         text_classifier = TextEmotionClassifier()
-        speech_recognizer = SpeechRecognizer()
+        speech_recognizer = SpeechRecognizer(**speech_options_from_env())
         fusion_engine = EmotionFusion()
         voice_synth = NaturalSpanishTTS()  # ← Usa el corregido
 
@@ -310,7 +378,11 @@ if __name__ == "__main__":
         print("http://localhost:5001")
         print("="*60)
 
-        app.run(host='0.0.0.0', port=5001, debug=False, use_reloader=False, threaded=True)
+        try:
+            app.run(host='0.0.0.0', port=5001, debug=False, use_reloader=False, threaded=True)
+        finally:
+            # El productor de frames no debe seguir capturando al cerrar el servidor
+            video_stream.frame_hub.stop()
 
     except Exception as e:
         print(f"Error crítico: {e}")
@@ -0,0 +1,137 @@
+"""
+Grabación del audio de la sesión (WAV 16 kHz, 16 bits) a partir del buffer circular de captura
+"""
+import json
+import time
+import wave
+from threading import Thread
+from typing import Dict, List, Optional
+import numpy as np
+from audio_ring_buffer import AudioRingBuffer
+
+
+class AudioRecorder:
+    """
+    Escribe en disco el audio que el callback del micrófono deja en el AudioRingBuffer.
+
+    Un hilo propio lee el buffer con su propio cursor (como el hilo de VAD), convierte a PCM de
+    16 bits y escribe cada `flush_seconds`: el callback y el VAD no hacen ningún trabajo extra.
+
+    Si se indica `start_clock` (time.perf_counter(), p. ej. el inicio de EmotionHistory), el segundo 0
+    del archivo corresponde a ese instante: el audio anterior se omite y el que falta al inicio (el
+    micrófono todavía abriéndose) se rellena con silencio, así los tiempos del WAV coinciden con
+    los `elapsed_seconds` del historial.
+    """
+
+    def __init__(self, ring: AudioRingBuffer, flush_seconds: float = 0.5):
+        self.ring = ring
+        self.flush_seconds = flush_seconds
+        self.path: Optional[str] = None
+        self.start_clock: Optional[float] = None
+        self.samples_written = 0
+        self.dropped_samples = 0
+        self._cursor: Optional[int] = None
+        self._wav = None
+        self._running = False
+        self._thread: Optional[Thread] = None
+
+    @property
+    def is_recording(self) -> bool:
+        return self._running
+
+    def start(self, path: str, start_clock: Optional[float] = None):
+        """Empieza a escribir `path`; el audio del buffer desde `start_clock` (por defecto, ahora)."""
+        if self._running:
+            self.stop()
+        self.path = path
+        self.start_clock = time.perf_counter() if start_clock is None else start_clock
+        self.samples_written = 0
+        self.dropped_samples = 0
+        self._cursor = None
+
+        self._wav = wave.open(path, 'wb')
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(self.ring.sample_rate)
+
+        self._running = True
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"🎙️ Grabando audio en: {self.path}")
+
+    def stop(self) -> Optional[Dict]:
+        """Escribe el audio pendiente, cierra el archivo y retorna sus metadatos de sincronización."""
+        if not self._running:
+            return None
+        self._running = False
+        self._thread.join()
+        self._flush(self.ring.written)
+        self._wav.close()
+        self._wav = None
+        info = self.get_info()
+        print(f"💾 Audio guardado: {self.path} ({info['duration_seconds']:.1f}s)")
+        return info
+
+    def get_info(self) -> Dict:
+        return {
+            'audio_path': self.path,
+            'sample_rate': self.ring.sample_rate,
+            'start_clock': self.start_clock,
+            'samples': self.samples_written,
+            'duration_seconds': round(self.samples_written / self.ring.sample_rate, 3),
+            'dropped_samples': self.dropped_samples,
+        }
+
+    def _run(self):
+        chunk = int(self.flush_seconds * self.ring.sample_rate)
+        while self._running:
+            target = (self._cursor or 0) + chunk
+            self.ring.wait_for(target, timeout=self.flush_seconds)
+            self._flush(self.ring.written)
+
+    def _flush(self, end: int):
+        if self._cursor is None:
+            if self.ring.start_clock is None:
+                return  # el micrófono aún no entregó audio
+            position = int(round((self.start_clock - self.ring.start_clock) * self.ring.sample_rate))
+            if position < 0:
+                self._write_silence(-position)
+                position = 0
+            self._cursor = position
+
+        if self._cursor < self.ring.oldest:
+            # el escritor quedó una vuelta atrás: silencio en lugar del audio perdido, sin correr el tiempo
+            lost = self.ring.oldest - self._cursor
+            self.dropped_samples += lost
+            self._write_silence(lost)
+            self._cursor = self.ring.oldest
+
+        if end > self._cursor:
+            samples = self.ring.view(self._cursor, end)
+            pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).astype('<i2')
+            self._wav.writeframes(pcm.tobytes())
+            self.samples_written += len(pcm)
+            self._cursor = end
+
+    def _write_silence(self, count: int):
+        self._wav.writeframes(np.zeros(count, dtype='<i2').tobytes())
+        self.samples_written += count
+
+
+def save_sync_metadata(path: str, audio_info: Optional[Dict], video_path: Optional[str],
+                       video_frame_clocks: List[float], history_start_clock: float) -> str:
+    """
+    Guarda en JSON la relación entre audio, video e historial de emociones, todo en segundos desde
+    el inicio del historial: el desfase del audio (0 si se grabó con start_clock = inicio del
+    historial) y el instante en que se escribió cada frame del video.
+    """
+    metadata = {
+        'video_path': video_path,
+        'video_frame_times': [round(clock - history_start_clock, 4) for clock in video_frame_clocks],
+        'audio': audio_info,
+    }
+    if audio_info:
+        metadata['audio_offset_seconds'] = round(audio_info['start_clock'] - history_start_clock, 4)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    return path
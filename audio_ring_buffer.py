@@ -0,0 +1,107 @@
+"""
+Buffer circular de audio preasignado (float32, mono) para la captura del micrófono
+"""
+import time
+from threading import Condition
+from typing import Optional
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Buffer circular de capacidad fija escrito directamente por el callback de sounddevice.
+
+    Las posiciones son absolutas (muestras escritas desde el último reset), de modo que un
+    enunciado se identifica por (inicio, fin) aunque el buffer haya dado varias vueltas.
+
+    Cada muestra se escribe dos veces (en i y en i + capacidad): cualquier ventana de hasta
+    `capacity` muestras es contigua en memoria y `view` la retorna sin copiar. Una vista sigue siendo
+    válida mientras el escritor no la alcance, es decir, durante `capacity - (written - stop)` muestras.
+
+    `clock_at` convierte una posición al reloj time.perf_counter() (el mismo de EmotionHistory):
+    el origen se fija al llegar el primer bloque y desde ahí se cuenta con el reloj de muestreo.
+    """
+
+    def __init__(self, seconds: float = 120.0, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.capacity = int(seconds * sample_rate)
+        self._data = np.zeros(2 * self.capacity, dtype=np.float32)
+        self._written = 0
+        self._condition = Condition()
+        self.start_clock: Optional[float] = None  # perf_counter() de la muestra 0
+
+    @property
+    def written(self) -> int:
+        """Posición absoluta de la siguiente muestra a escribir."""
+        return self._written
+
+    @property
+    def oldest(self) -> int:
+        """Posición absoluta más antigua que aún está en el buffer."""
+        return max(0, self._written - self.capacity)
+
+    def reset(self):
+        with self._condition:
+            self._written = 0
+            self.start_clock = None
+
+    def write(self, samples: np.ndarray):
+        """Copia un bloque (1-D, o la primera columna de un bloque (frames, canales)) al buffer."""
+        if samples.ndim > 1:
+            samples = samples[:, 0]
+        if self.start_clock is None:
+            # el bloque termina de capturarse al invocarse el callback
+            self.start_clock = time.perf_counter() - len(samples) / self.sample_rate
+        # de un bloque más largo que el buffer solo sobreviven las últimas `capacity` muestras,
+        # pero las posiciones avanzan por el bloque completo
+        total = len(samples)
+        samples = samples[-self.capacity:]
+        count = len(samples)
+        start = (self._written + total - count) % self.capacity
+        first = min(count, self.capacity - start)
+
+        # copia principal y espejo; si el bloque cruza el final, el resto va al inicio
+        self._data[start:start + first] = samples[:first]
+        self._data[start + self.capacity:start + self.capacity + first] = samples[:first]
+        if first < count:
+            self._data[:count - first] = samples[first:]
+            self._data[self.capacity:self.capacity + count - first] = samples[first:]
+
+        with self._condition:
+            self._written += total
+            self._condition.notify_all()
+
+    def wait_for(self, position: int, timeout: Optional[float] = None) -> bool:
+        """Espera hasta que se haya escrito la muestra `position - 1`; False si vence el timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._written >= position, timeout)
+
+    def view(self, start: int, stop: int) -> np.ndarray:
+        """Vista sin copia de las muestras [start, stop) en posiciones absolutas."""
+        if start < self.oldest or stop > self._written or stop - start > self.capacity:
+            raise ValueError(f"Range [{start}, {stop}) is not in the buffer "
+                             f"(available [{self.oldest}, {self._written}))")
+        offset = start % self.capacity
+        return self._data[offset:offset + (stop - start)]
+
+    def snapshot(self, start: int, stop: int, margin: int = 0) -> Optional[np.ndarray]:
+        """
+        Copia de las muestras [start, stop); None si el escritor ya las alcanzó antes o durante la
+        copia. `margin` son las muestras que un bloque en escritura puede estar pisando sin haber
+        actualizado todavía `written`.
+        """
+        try:
+            audio = np.array(self.view(start, stop))
+        except ValueError:
+            if start < self.oldest:
+                return None
+            raise
+        if start < self._written - self.capacity + margin:
+            return None
+        return audio
+
+    def clock_at(self, position: int) -> Optional[float]:
+        """Instante (time.perf_counter()) en que se capturó la muestra `position`."""
+        if self.start_clock is None:
+            return None
+        return self.start_clock + position / self.sample_rate
@@ -0,0 +1,59 @@
+"""
+Micro-benchmark del costo de scoring por frame: checks por emoción (ruta anterior) vs. checks una vez por frame.
+
+    python -m benchmarks.bench_emotion_scoring --frames 5000
+"""
+import argparse
+import time
+import numpy as np
+from emotion_processor.data_processing.main import PointsProcessing
+from emotion_processor.emotions_recognition.main import EmotionRecognition
+
+
+def random_features(frames: int, seed: int = 0) -> list:
+    """Features de PointsProcessing calculados sobre landmarks aleatorios dentro de un rostro de 640x480."""
+    rng = np.random.default_rng(seed)
+    processing = PointsProcessing()
+    landmarks = rng.uniform((220, 140), (420, 380), size=(frames, 478, 2)).astype(np.int16)
+    return [processing.main(frame) for frame in landmarks]
+
+
+def per_emotion_scores(recognition: EmotionRecognition, features: dict) -> dict:
+    """Ruta anterior: cada emoción vuelve a evaluar los cuatro checks."""
+    scores = {}
+    for emotion_score_obj in recognition.emotions.values():
+        scores.update(emotion_score_obj.calculate_score(features))
+    return scores
+
+
+def time_per_frame(fn, frames: list, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for features in frames:
+            fn(features)
+        best = min(best, (time.perf_counter() - start) / len(frames))
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    recognition = EmotionRecognition()
+    frames = random_features(args.frames)
+
+    for features in frames:
+        assert recognition.recognize_emotion(features) == per_emotion_scores(recognition, features)
+
+    legacy = time_per_frame(lambda f: per_emotion_scores(recognition, f), frames, args.repeat)
+    staged = time_per_frame(recognition.recognize_emotion, frames, args.repeat)
+    print(f"frames: {args.frames}")
+    print(f"checks por emoción (28 checks): {legacy:8.2f} us/frame")
+    print(f"checks por frame   (4 checks):  {staged:8.2f} us/frame  ({legacy / staged:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Latencia por frame de los perfiles de landmarks 'accurate' (refinamiento de iris) y 'fast' (sin refinamiento),
+y deriva de los scores de emoción del perfil 'fast' respecto al 'accurate' sobre los mismos frames.
+
+    python -m benchmarks.bench_landmark_profiles video.mp4 --frames 300
+    python -m benchmarks.bench_landmark_profiles --camera 0 --frames 300
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from emotion_processor.face_mesh.face_mesh_processor import FaceMeshProcessor
+from emotion_processor.data_processing.main import PointsProcessing
+from emotion_processor.emotions_recognition.main import EmotionRecognition
+from emotion_normalizer import EmotionNormalizer
+
+PROFILES = ('accurate', 'fast')
+
+
+def read_frames(source, frames: int) -> list:
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise SystemExit(f"No se pudo abrir la fuente de video: {source}")
+    images = []
+    while len(images) < frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        images.append(frame)
+    cap.release()
+    return images
+
+
+def run_profile(profile: str, images: list):
+    """Retorna (latencias en ms por frame, landmarks por frame o None si no hubo cara)."""
+    processor = FaceMeshProcessor(landmarks_format='array', landmarks_dtype=np.int16, landmark_profile=profile)
+    latencies, landmarks = [], []
+    for image in images:
+        start = time.perf_counter()
+        points, success, _ = processor.process(image, draw=False)
+        latencies.append((time.perf_counter() - start) * 1e3)
+        landmarks.append(points if success else None)
+    return np.array(latencies), landmarks
+
+
+def emotion_scores(landmarks: np.ndarray, processing: PointsProcessing, recognition: EmotionRecognition,
+                   normalizer: EmotionNormalizer) -> np.ndarray:
+    raw = recognition.recognize_batch(processing.feature_matrix(landmarks))
+    return normalizer.normalize_batch(raw, recognition.emotion_names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('video', nargs='?', help="archivo de video con un rostro")
+    parser.add_argument('--camera', type=int, default=None, help="índice de cámara si no se indica video")
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=10, help="frames iniciales excluidos de la latencia")
+    args = parser.parse_args()
+
+    source = args.video if args.video is not None else (args.camera if args.camera is not None else 0)
+    images = read_frames(source, args.frames)
+    if not images:
+        raise SystemExit("La fuente no entregó frames")
+
+    results = {profile: run_profile(profile, images) for profile in PROFILES}
+
+    print(f"frames: {len(images)}  ({images[0].shape[1]}x{images[0].shape[0]})")
+    for profile in PROFILES:
+        latencies = results[profile][0][args.warmup:]
+        detected = sum(points is not None for points in results[profile][1])
+        print(f"{profile:9s} media {latencies.mean():7.2f} ms  p50 {np.percentile(latencies, 50):7.2f} ms  "
+              f"p95 {np.percentile(latencies, 95):7.2f} ms  caras {detected}/{len(images)}")
+
+    both = [i for i, (a, b) in enumerate(zip(results['accurate'][1], results['fast'][1]))
+            if a is not None and b is not None]
+    if not both:
+        print("Sin frames con cara en ambos perfiles: no se puede medir la deriva")
+        return
+
+    accurate = np.stack([results['accurate'][1][i] for i in both])
+    fast = np.stack([results['fast'][1][i] for i in both])
+    processing, recognition, normalizer = PointsProcessing(), EmotionRecognition(), EmotionNormalizer()
+    accurate_scores = emotion_scores(accurate, processing, recognition, normalizer)
+    fast_scores = emotion_scores(fast, processing, recognition, normalizer)
+
+    iris_offset = np.linalg.norm(accurate[:, [468, 473]].astype(float) - fast[:, [468, 473]], axis=-1)
+    drift = np.abs(accurate_scores - fast_scores)
+    agreement = np.mean(accurate_scores.argmax(axis=1) == fast_scores.argmax(axis=1))
+    print(f"\ndesplazamiento iris vs. centro de párpados: media {iris_offset.mean():.2f} px, "
+          f"máx {iris_offset.max():.2f} px")
+    print(f"deriva de scores ('fast' - 'accurate') en {len(both)} frames:")
+    for column, emotion in enumerate(recognition.emotion_names):
+        print(f"  {emotion:10s} media {drift[:, column].mean():6.2f}  máx {drift[:, column].max():6.2f}")
+    print(f"emoción dominante coincidente: {agreement:.1%}")
+
+
+if __name__ == "__main__":
+    main()
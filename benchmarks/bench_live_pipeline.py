@@ -0,0 +1,91 @@
+"""
+Reproduce un clip de referencia por el pipeline en vivo (FrameHub + EmotionRecognitionSystem) y mide
+fps sostenidos, latencia captura-resultado y latencia por etapa, sin necesidad de cámara.
+
+    python -m benchmarks.bench_live_pipeline clip.avi --mode fast
+    python -m benchmarks.bench_live_pipeline clip.avi --mode realtime --analysis-hz 10
+"""
+import argparse
+import time
+from collections import defaultdict
+import numpy as np
+from emotion_processor.main import EmotionRecognitionSystem
+from examples.replay import ReplaySource
+from frame_hub import FrameHub
+
+
+class StageTimer:
+    """Envuelve métodos de objetos del pipeline y acumula su duración por etapa."""
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def wrap(self, owner, method_name: str, stage: str):
+        method = getattr(owner, method_name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.samples[stage].append((time.perf_counter() - start) * 1e3)
+
+        setattr(owner, method_name, timed)
+
+    def report(self):
+        for stage, samples in self.samples.items():
+            samples = np.array(samples)
+            print(f"  {stage:18s} n={len(samples):6d}  media {samples.mean():7.2f} ms  "
+                  f"p50 {np.percentile(samples, 50):7.2f} ms  p95 {np.percentile(samples, 95):7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('video', help="clip de referencia")
+    parser.add_argument('--mode', choices=['realtime', 'fast'], default='fast')
+    parser.add_argument('--analysis-hz', type=float, default=None)
+    parser.add_argument('--profile', choices=['accurate', 'fast'], default='accurate')
+    args = parser.parse_args()
+
+    source = ReplaySource(args.video, realtime=args.mode == 'realtime', preload=True)
+    system = EmotionRecognitionSystem(analysis_hz=args.analysis_hz, landmark_profile=args.profile)
+
+    timer = StageTimer()
+    timer.wrap(source, 'read', 'captura')
+    timer.wrap(system.face_mesh, 'process', 'face_mesh')
+    timer.wrap(system.data_processing, 'main', 'features')
+    timer.wrap(system.emotions_recognition, 'recognize_emotion', 'scoring')
+    timer.wrap(system.emotion_normalizer, 'normalize', 'normalización')
+    timer.wrap(system, 'frame_processing', 'frame_processing')
+
+    hub = FrameHub(source, system.frame_processing)
+    lags = []
+    frames = 0
+    start = last_publish = time.perf_counter()
+    hub.start()
+    last_seq = 0
+    while True:
+        seq, _ = hub.wait_for_frame(last_seq, timeout=1.0)
+        if seq > last_seq:
+            frames += seq - last_seq
+            last_seq = seq
+            last_publish = time.perf_counter()
+            if hub.glass_to_result_lag is not None:
+                lags.append(hub.glass_to_result_lag * 1e3)
+        elif source.finished:
+            break
+    elapsed = last_publish - start
+    hub.stop()
+    source.release()
+
+    print(f"frames publicados: {frames} en {elapsed:.2f}s  ->  {frames / elapsed:.1f} fps sostenidos "
+          f"(modo {args.mode}, clip a {source.fps:.1f} fps)")
+    if lags:
+        lags = np.array(lags)
+        print(f"latencia captura-resultado: media {lags.mean():.2f} ms  p95 {np.percentile(lags, 95):.2f} ms")
+    print("latencia por etapa:")
+    timer.report()
+    print(f"análisis: {system.get_analysis_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Landmarks faciales sintéticos para benchmarks: una plantilla de rostro frontal de 478 puntos con los
+puntos que usa data_processing colocados en posiciones anatómicas, y presets de expresión que mueven
+cejas, párpados y boca. No requiere MediaPipe.
+
+Cada preset (salvo 'neutral') debe tener como score crudo más alto el de su emoción de PRESET_EMOTIONS, y
+superar en ella al rostro neutral; face_template lo verifica la primera vez que construye cada preset.
+
+    from benchmarks.fixtures import landmark_frames, face_points
+    frames = landmark_frames(1000, preset='mixed')   # (1000, 478, 2) int16
+    points = face_points(frames[0])                  # dict anidado como FaceMeshProcessor('dict')
+"""
+from typing import Dict, List, Set, Tuple
+import numpy as np
+from emotion_processor.face_mesh.landmark_indices import NUM_LANDMARKS, FEATURE_INDEX_TABLE, FEATURE_SLICES
+from emotion_processor.data_processing.main import PointsProcessing
+from emotion_processor.emotions_recognition.main import EmotionRecognition
+
+EMOTION_NAMES = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'anxiety']
+
+# Coordenadas en unidades de medio ancho de cara: x a la derecha de la imagen, y hacia abajo,
+# origen entre los ojos. El lado derecho del paciente queda a la izquierda de la imagen.
+_ANCHORS: Dict[int, Tuple[float, float]] = {
+    # ceja derecha (exterior -> interior) y ceja izquierda (interior -> exterior)
+    143: (-0.60, -0.22), 156: (-0.55, -0.28), 70: (-0.50, -0.32), 63: (-0.42, -0.35),
+    105: (-0.33, -0.36), 66: (-0.25, -0.35), 107: (-0.15, -0.32),
+    336: (0.15, -0.32), 296: (0.25, -0.35), 334: (0.33, -0.36), 293: (0.42, -0.35),
+    300: (0.50, -0.32), 383: (0.55, -0.28), 372: (0.60, -0.22),
+    65: (-0.30, -0.34), 295: (0.30, -0.34), 55: (-0.16, -0.30), 8: (0.0, -0.26),
+    69: (-0.30, -0.62), 299: (0.30, -0.62), 21: (-0.66, -0.52),
+    # párpados superiores, inferiores e iris
+    33: (-0.50, -0.10), 246: (-0.48, -0.12), 161: (-0.45, -0.14), 160: (-0.40, -0.155),
+    159: (-0.35, -0.16), 158: (-0.30, -0.155), 157: (-0.26, -0.14), 173: (-0.22, -0.12), 133: (-0.20, -0.10),
+    263: (0.50, -0.10), 398: (0.22, -0.12), 384: (0.27, -0.15), 385: (0.32, -0.16), 386: (0.35, -0.16),
+    387: (0.40, -0.155), 388: (0.45, -0.14), 466: (0.48, -0.12),
+    145: (-0.35, -0.04), 230: (-0.35, 0.27), 374: (0.35, -0.04), 450: (0.35, 0.27),
+    468: (-0.35, -0.10), 473: (0.35, -0.10),
+    # nariz y boca
+    2: (0.0, 0.40), 164: (0.0, 0.46), 0: (0.0, 0.53), 17: (0.0, 0.74), 200: (0.0, 0.86),
+    61: (-0.32, 0.62), 291: (0.32, 0.62), 186: (-0.30, 0.50), 410: (0.30, 0.50),
+}
+_UPPER_LIP = [78, 191, 80, 81, 82, 13, 312, 311, 310, 415, 308]
+_LOWER_LIP = [78, 95, 88, 178, 87, 14, 317, 402, 318, 324, 308]
+_RIGHT_BROW = [143, 156, 70, 63, 105, 66, 107, 65, 55, 69, 21]
+_LEFT_BROW = [336, 296, 334, 293, 300, 383, 372, 295, 299]
+_UPPER_LIDS = [246, 161, 160, 159, 158, 157, 173, 398, 384, 385, 386, 387, 388, 466]
+_LIP_HALF_WIDTH = 0.28
+_LIP_GAP = 0.03
+
+PRESETS = ('neutral', 'smile', 'frown', 'raised_brows', 'surprise', 'sad')
+
+# Emoción dominante esperada de cada preset con las reglas actuales. La nariz no distingue presets
+# (PointsProcessing no mide su ancho, así que 'flared' vale 1 siempre) y 'angry' no puede dominar:
+# sus checks principales (lowered, tightness, wrinkle, press) no los produce FrameChecks.
+# El ceño fruncido (cejas juntas y bajas, comisuras abajo, ojos entrecerrados) espera 'sad': SadScore
+# es la regla que puntúa las cejas juntas (AU4) y las comisuras caídas. Disgust queda cerca en todos
+# los rostros (unos 54 puntos) porque 40 vienen de la nariz siempre 'flared', no de la expresión.
+PRESET_EMOTIONS = {
+    'smile': 'happy',
+    'frown': 'sad',
+    'raised_brows': 'surprise',
+    'surprise': 'surprise',
+    'sad': 'sad',
+}
+_verified_presets: Set[str] = set()
+
+
+def _template(smile: float = 0.0, mouth_open: float = 0.0, brow_raise: float = 0.0,
+              brow_inner: float = 0.0, eye_open: float = 0.0) -> np.ndarray:
+    """
+    Plantilla normalizada (478, 2). smile > 0 sube las comisuras (< 0 las baja), mouth_open separa los
+    labios, brow_raise sube las cejas, brow_inner acerca y baja la parte interior de las cejas,
+    eye_open abre (> 0) o entrecierra (< 0) los párpados.
+    """
+    # puntos que data_processing no usa: repartidos en el óvalo de la cara, siempre los mismos
+    rng = np.random.default_rng(478)
+    angle = rng.uniform(0, 2 * np.pi, NUM_LANDMARKS)
+    radius = np.sqrt(rng.uniform(0, 1, NUM_LANDMARKS))
+    points = np.column_stack([0.8 * radius * np.cos(angle), 0.1 + 1.0 * radius * np.sin(angle)])
+
+    for index, (x, y) in _ANCHORS.items():
+        points[index] = (x, y)
+
+    # labios: arcos con comisuras desplazadas según la expresión
+    xs = np.linspace(-_LIP_HALF_WIDTH, _LIP_HALF_WIDTH, len(_UPPER_LIP)) * (1.0 + 0.15 * max(smile, 0.0))
+    shape = 1.0 - (xs / xs[-1]) ** 2
+    corner_lift = -0.08 * smile * (1.0 - shape)
+    upper = 0.62 - _LIP_GAP * shape + corner_lift
+    lower = 0.62 + (_LIP_GAP + mouth_open) * shape + corner_lift
+    points[_UPPER_LIP] = np.column_stack([xs, upper])
+    points[_LOWER_LIP] = np.column_stack([xs, lower])
+    points[[61, 291], 1] += -0.08 * smile
+    points[[61, 291], 0] *= 1.0 + 0.15 * max(smile, 0.0)
+    points[[17, 200], 1] += mouth_open
+
+    # cejas
+    for brow in (_RIGHT_BROW, _LEFT_BROW):
+        inner = np.clip(1.0 - np.abs(points[brow, 0]) / 0.6, 0.0, 1.0)
+        points[brow, 1] -= brow_raise
+        points[brow, 1] += brow_inner * 0.08 * inner
+        points[brow, 0] -= np.sign(points[brow, 0]) * brow_inner * 0.10 * inner
+
+    # párpados superiores
+    lid_shape = np.clip(1.0 - np.abs(np.abs(points[_UPPER_LIDS, 0]) - 0.35) / 0.15, 0.0, 1.0)
+    points[_UPPER_LIDS, 1] -= eye_open * 0.10 * lid_shape
+    points[[145, 374], 1] += eye_open * 0.01
+    return points
+
+
+_PRESET_PARAMS = {
+    'neutral': {},
+    'smile': {'smile': 1.0, 'mouth_open': 0.02, 'eye_open': -0.2},
+    'frown': {'smile': -0.6, 'brow_inner': 1.0, 'brow_raise': -0.03, 'eye_open': -0.8},
+    'raised_brows': {'brow_raise': 0.1, 'eye_open': 0.5},
+    'surprise': {'brow_raise': 0.12, 'eye_open': 0.8, 'mouth_open': 0.18},
+    'sad': {'smile': -0.8, 'brow_inner': 0.8, 'eye_open': -0.9},
+}
+
+
+def face_template(preset: str = 'neutral', center: Tuple[float, float] = (320.0, 240.0),
+                  scale: float = 100.0) -> np.ndarray:
+    """Landmarks (478, 2) float64 en píxeles de un rostro frontal con la expresión `preset`."""
+    if preset not in _PRESET_PARAMS:
+        raise ValueError(f"Unknown preset: {preset}")
+    if preset not in _verified_presets:
+        _verify_preset(preset)
+    return _template(**_PRESET_PARAMS[preset]) * scale + np.asarray(center)
+
+
+def preset_scores(preset: str) -> Dict[str, float]:
+    """Scores crudos de EmotionRecognition (antes de normalizar) del rostro `preset` sin ruido."""
+    landmarks = (_template(**_PRESET_PARAMS[preset]) * 100.0 + (320.0, 240.0)).astype(np.int16)
+    return EmotionRecognition().recognize_emotion(PointsProcessing().main(landmarks))
+
+
+def _verify_preset(preset: str):
+    expected = PRESET_EMOTIONS.get(preset)
+    if expected is not None:
+        scores = preset_scores(preset)
+        dominant = max(scores, key=scores.get)
+        if dominant != expected:
+            raise AssertionError(f"Preset '{preset}' scores as '{dominant}', expected '{expected}': {scores}")
+        neutral = preset_scores('neutral')[expected]
+        if scores[expected] <= neutral:
+            raise AssertionError(f"Preset '{preset}' scores {scores[expected]:.1f} for '{expected}', "
+                                 f"no more than neutral ({neutral:.1f})")
+    _verified_presets.add(preset)
+
+
+def landmark_frames(frames: int, preset: str = 'mixed', seed: int = 0, jitter: float = 0.7,
+                    segment: int = 30, dtype=np.int16) -> np.ndarray:
+    """
+    Secuencia (frames, 478, 2) de landmarks: la expresión `preset` (o, con 'mixed', un preset distinto
+    cada `segment` frames) con un leve movimiento de cabeza y ruido de `jitter` píxeles por punto.
+    """
+    rng = np.random.default_rng(seed)
+    templates = {name: face_template(name, center=(0.0, 0.0)) for name in PRESETS}
+    if preset == 'mixed':
+        order = rng.integers(0, len(PRESETS), size=frames // segment + 1)
+        names = [PRESETS[order[i // segment]] for i in range(frames)]
+    else:
+        names = [preset] * frames
+    base = np.stack([templates[name] for name in names])
+
+    t = np.arange(frames)[:, None]
+    center = np.column_stack([320.0 + 8.0 * np.sin(t[:, 0] / 45.0), 240.0 + 5.0 * np.sin(t[:, 0] / 70.0)])
+    scale = 1.0 + 0.03 * np.sin(t / 90.0)
+    landmarks = base * scale[:, :, None] + center[:, None, :] + rng.normal(0.0, jitter, base.shape)
+    return landmarks.astype(dtype)
+
+
+def face_points(landmarks: np.ndarray) -> Dict[str, Dict[str, List[List[int]]]]:
+    """Dict anidado de puntos por característica, con la forma que produce FaceMeshProcessor('dict')."""
+    feature_points = np.asarray(landmarks)[FEATURE_INDEX_TABLE].tolist()
+    return {
+        feature: {sub_feature: feature_points[sub_slice] for sub_feature, sub_slice in sub_slices.items()}
+        for feature, sub_slices in FEATURE_SLICES.items()
+    }
+
+
+def emotion_frames(frames: int, seed: int = 0) -> np.ndarray:
+    """Scores (frames, 7) suaves en el tiempo, en el rango 0-100, columnas según EMOTION_NAMES."""
+    rng = np.random.default_rng(seed)
+    drift = np.cumsum(rng.normal(0.0, 2.0, (frames, len(EMOTION_NAMES))), axis=0)
+    return np.clip(30.0 + drift % 60.0 + rng.normal(0.0, 3.0, drift.shape), 0.0, 100.0)
+
+
+def emotion_dicts(frames: int, seed: int = 0) -> List[Dict[str, float]]:
+    return [dict(zip(EMOTION_NAMES, row)) for row in emotion_frames(frames, seed).tolist()]
+
+
+def text_emotions(seed: int = 0) -> Dict[str, float]:
+    """Salida típica de TextEmotionClassifier.classify()['emotions'] (etiquetas en español)."""
+    rng = np.random.default_rng(seed)
+    labels = ['alegre', 'triste', 'enojado', 'miedo', 'sorprendido', 'repugnante', 'ansiedad']
+    probabilities = rng.dirichlet(np.ones(len(labels)))
+    return {label: float(p) for label, p in zip(labels, probabilities)}
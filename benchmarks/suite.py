@@ -0,0 +1,191 @@
+"""
+Suite de benchmarks del pipeline de emociones sobre landmarks sintéticos (benchmarks/fixtures.py).
+
+Mide el costo por operación de PointsProcessing.main, EmotionRecognition.recognize_emotion,
+EmotionNormalizer.normalize, EmotionHistory (add_frame y get_summary con 1k/10k/100k frames) y
+EmotionFusion.fuse, y registra los scores de cada preset de expresión. Los resultados se guardan
+como baseline JSON; --compare marca regresiones de tiempo y cualquier cambio en los scores.
+
+Los tiempos solo se pueden comparar en la misma máquina, así que el baseline es local (está en
+.gitignore): se guarda antes de un cambio y se compara después.
+
+    python -m benchmarks.suite --save       # escribe benchmarks/baselines/baseline.json
+    python -m benchmarks.suite --compare    # compara contra el baseline (código de salida 1 si empeora)
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict
+import numpy as np
+from benchmarks import fixtures
+from emotion_processor.data_processing.main import PointsProcessing
+from emotion_processor.emotions_recognition.main import EmotionRecognition
+from emotion_normalizer import EmotionNormalizer
+from emotion_history import EmotionHistory
+from emotion_fusion import EmotionFusion
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'baseline.json')
+HISTORY_SIZES = (1_000, 10_000, 100_000)
+
+
+def best_time(fn: Callable[[], int], repeat: int) -> float:
+    """Mejor tiempo por operación (microsegundos); fn retorna cuántas operaciones ejecutó."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operations = fn()
+        best = min(best, (time.perf_counter() - start) / operations)
+    return best * 1e6
+
+
+def _quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _filled_history(scores: np.ndarray) -> EmotionHistory:
+    history = EmotionHistory()
+    with _quiet():
+        history.start_recording()
+    for frame_number, row in enumerate(scores.tolist(), 1):
+        history.add_frame(dict(zip(fixtures.EMOTION_NAMES, row)), frame_number, elapsed_seconds=frame_number / 30.0)
+    return history
+
+
+def run_timings(frames: int, repeat: int, history_sizes) -> Dict[str, float]:
+    processing = PointsProcessing()
+    recognition = EmotionRecognition()
+    normalizer = EmotionNormalizer()
+    with _quiet():
+        fusion = EmotionFusion()
+
+    landmarks = fixtures.landmark_frames(frames, preset='mixed')
+    points = [fixtures.face_points(frame) for frame in landmarks]
+    features = [processing.main(frame) for frame in landmarks]
+    raw_scores = [recognition.recognize_emotion(frame) for frame in features]
+    face_emotions = fixtures.emotion_dicts(frames)
+    text_emotions = [fixtures.text_emotions(seed) for seed in range(64)]
+
+    def each(fn, items):
+        def run():
+            for item in items:
+                fn(item)
+            return len(items)
+        return run
+
+    timings = {
+        'points_processing_main_dict': best_time(each(processing.main, points), repeat),
+        'points_processing_main_array': best_time(each(processing.main, landmarks), repeat),
+        'points_processing_feature_matrix': best_time(lambda: processing.feature_matrix(landmarks) is not None and frames,
+                                                      repeat),
+        'recognize_emotion': best_time(each(recognition.recognize_emotion, features), repeat),
+        'normalize': best_time(each(normalizer.normalize, raw_scores), repeat),
+        'emotion_fusion_fuse': best_time(
+            lambda: sum(1 for i, face in enumerate(face_emotions)
+                        if fusion.fuse(text_emotions[i % len(text_emotions)], face) is not None), repeat),
+    }
+
+    for size in history_sizes:
+        scores = fixtures.emotion_frames(size)
+        timings[f'history_add_frame_{size // 1000}k'] = best_time(lambda: _filled_history(scores) is not None and size,
+                                                                  max(1, repeat // 2))
+        history = _filled_history(scores)
+        timings[f'history_get_summary_{size // 1000}k'] = best_time(lambda: history.get_summary() is not None and 1,
+                                                                    repeat)
+    return timings
+
+
+def run_outputs() -> Dict:
+    """Salidas deterministas: cambian solo si se modifica una regla de scoring o la normalización."""
+    processing = PointsProcessing()
+    recognition = EmotionRecognition()
+    normalizer = EmotionNormalizer()
+
+    presets = {}
+    for preset in fixtures.PRESETS:
+        landmarks = fixtures.face_template(preset).astype(np.int16)
+        normalized = normalizer.normalize(recognition.recognize_emotion(processing.main(landmarks)))
+        presets[preset] = {emotion: round(float(score), 4) for emotion, score in sorted(normalized.items())}
+
+    sequence = fixtures.landmark_frames(1_000, preset='mixed')
+    raw = recognition.recognize_batch(processing.feature_matrix(sequence))
+    normalized = normalizer.normalize_batch(raw, recognition.emotion_names)
+    history = _filled_history(normalized)
+    statistics = history.get_summary()['emotion_statistics']
+    return {'presets': presets, 'mixed_1k_statistics': statistics}
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> bool:
+    ok = True
+    print(f"\n{'benchmark':36s} {'baseline':>12s} {'actual':>12s} {'cambio':>9s}")
+    for name, value in current['timings'].items():
+        reference = baseline['timings'].get(name)
+        if reference is None:
+            print(f"{name:36s} {'-':>12s} {value:10.2f}us {'nuevo':>9s}")
+            continue
+        change = value / reference - 1.0
+        flag = ''
+        if change > tolerance:
+            flag = '  <-- regresión'
+            ok = False
+        print(f"{name:36s} {reference:10.2f}us {value:10.2f}us {change:+8.1%}{flag}")
+
+    for preset, scores in current['outputs']['presets'].items():
+        reference = baseline['outputs']['presets'].get(preset)
+        if reference != scores:
+            ok = False
+            print(f"\n⚠️ scores del preset '{preset}' cambiaron:\n  baseline {reference}\n  actual   {scores}")
+    if current['outputs']['mixed_1k_statistics'] != baseline['outputs']['mixed_1k_statistics']:
+        ok = False
+        print("\n⚠️ las estadísticas del historial sintético (1k frames) cambiaron")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=2000, help="frames para las mediciones por frame")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--quick', action='store_true', help="omite el historial de 100k frames")
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="guardar los resultados como baseline")
+    parser.add_argument('--compare', action='store_true', help="comparar contra el baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="empeoramiento de tiempo tolerado")
+    args = parser.parse_args()
+    if args.compare and not os.path.exists(args.baseline):
+        print(f"❌ No hay baseline en {args.baseline}: genéralo en esta máquina con --save")
+        sys.exit(2)
+
+    history_sizes = HISTORY_SIZES[:-1] if args.quick else HISTORY_SIZES
+    results = {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                    'processor': platform.processor() or platform.machine()},
+        'timings': run_timings(args.frames, args.repeat, history_sizes),
+        'outputs': run_outputs(),
+    }
+
+    if not args.compare:
+        for name, value in results['timings'].items():
+            print(f"{name:36s} {value:10.2f} us/op")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"💾 Baseline guardado en: {args.baseline}")
+
+    if args.compare:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+        print("\n✅ Sin regresiones respecto al baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import tempfile
 import time
 from threading import Thread
 from TTS.api import TTS
+from metrics import timed
 
 class NaturalSpanishTTS:
     def __init__(self):
@@ -78,7 +79,8 @@ class NaturalSpanishTTS:
             if "xtts" in self.model_name:
                 kwargs["language"] = "es"
 
-            self.tts.tts_to_file(**kwargs)
+            with timed('tts_synthesis'):
+                self.tts.tts_to_file(**kwargs)
 
             pygame.mixer.music.load(audio_file)
             pygame.mixer.music.play()
@@ -1,24 +1,90 @@
 import json
-from datetime import datetime
-from typing import Dict, List
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 
 class EmotionHistory:
     """
     Gestiona el historial de emociones durante la grabación.
+    
+    Almacenamiento columnar: una matriz float32 (frames, emociones) preasignada que crece
+    por duplicación, más columnas float64 de tiempo transcurrido e int32 de número de frame.
+    
+    Las estadísticas se mantienen de forma incremental en add_frame (Welford para media/varianza,
+    mín/máx, contadores de dominancia, detector de transiciones en línea y sumas acumuladas para el
+    timeline), de modo que get_summary cuesta lo mismo al minuto 1 que al minuto 60.
+    
+    Los enunciados transcritos se guardan con inicio y fin en segundos desde el inicio de la
+    grabación (el mismo eje que los frames); las emociones faciales de cada enunciado se obtienen
+    con búsqueda binaria sobre los tiempos y diferencias de sumas acumuladas, sin recorrer frames.
     """
     
-    def __init__(self):
+    TRANSITION_THRESHOLD = 20.0  # Cambio mínimo para considerar transición
+    
+    def __init__(self, initial_capacity: int = 1024):
         self.recording = False
-        self.history: List[Dict] = []
+        self.initial_capacity = initial_capacity
+        self.emotion_names: List[str] = []
         self.start_time = None
         self.end_time = None
+        self._start_clock = None
+        self._reset_storage()
+        
+    def _reset_storage(self):
+        self._size = 0
+        self._scores = np.empty((0, 0), dtype=np.float32)
+        self._elapsed = np.empty(0, dtype=np.float64)
+        self._frames = np.empty(0, dtype=np.int32)
+        self._cumulative = np.zeros((1, 0), dtype=np.float64)
+        
+        # Acumuladores incrementales
+        self._mean = np.zeros(0, dtype=np.float64)
+        self._m2 = np.zeros(0, dtype=np.float64)
+        self._min = np.zeros(0, dtype=np.float64)
+        self._max = np.zeros(0, dtype=np.float64)
+        self._dominant_counts = np.zeros(0, dtype=np.int64)
+        self._transitions: List[Dict] = []
+        self._previous_dominant = None
+        self._utterances: List[Dict] = []
+        
+    def _allocate(self, emotion_names: List[str]):
+        self.emotion_names = list(emotion_names)
+        # Al menos una fila: add_frame solo crece cuando el almacenamiento está lleno
+        capacity = max(1, self.initial_capacity)
+        self._scores = np.empty((capacity, len(self.emotion_names)), dtype=np.float32)
+        self._elapsed = np.empty(capacity, dtype=np.float64)
+        self._frames = np.empty(capacity, dtype=np.int32)
+        # Fila i = suma de los primeros i frames (la fila 0 queda en ceros)
+        self._cumulative = np.zeros((capacity + 1, len(self.emotion_names)), dtype=np.float64)
+        
+        n_emotions = len(self.emotion_names)
+        self._mean = np.zeros(n_emotions, dtype=np.float64)
+        self._m2 = np.zeros(n_emotions, dtype=np.float64)
+        self._min = np.full(n_emotions, np.inf)
+        self._max = np.full(n_emotions, -np.inf)
+        self._dominant_counts = np.zeros(n_emotions, dtype=np.int64)
+        
+    def _grow(self):
+        capacity = max(1, 2 * len(self._elapsed))
+        scores = np.empty((capacity, self._scores.shape[1]), dtype=np.float32)
+        scores[:self._size] = self._scores[:self._size]
+        elapsed = np.empty(capacity, dtype=np.float64)
+        elapsed[:self._size] = self._elapsed[:self._size]
+        frames = np.empty(capacity, dtype=np.int32)
+        frames[:self._size] = self._frames[:self._size]
+        cumulative = np.zeros((capacity + 1, scores.shape[1]), dtype=np.float64)
+        cumulative[:self._size + 1] = self._cumulative[:self._size + 1]
+        self._scores, self._elapsed, self._frames, self._cumulative = scores, elapsed, frames, cumulative
         
     def start_recording(self):
         """Inicia la grabación del historial."""
         self.recording = True
-        self.history = []
+        self.emotion_names = []
+        self._reset_storage()
         self.start_time = datetime.now()
+        self.end_time = None
+        self._start_clock = time.perf_counter()
         print(f"📹 Historial de emociones iniciado: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
     def stop_recording(self):
@@ -27,26 +93,148 @@ class EmotionHistory:
         self.end_time = datetime.now()
         print(f"⏹️ Historial de emociones detenido: {self.end_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
-    def add_frame(self, emotions: Dict[str, float], frame_number: int):
+    def add_frame(self, emotions: Dict[str, float], frame_number: int, elapsed_seconds: float = None):
         """
         Agrega un frame al historial si está grabando.
         
         Args:
             emotions: Diccionario con scores de emociones
             frame_number: Número de frame actual
+            elapsed_seconds: Segundos desde el inicio de la grabación (por defecto, el reloj actual;
+                             útil al reconstruir un historial a partir de un video grabado)
         """
         if not self.recording:
             return
         
-        timestamp = datetime.now()
-        elapsed_seconds = (timestamp - self.start_time).total_seconds()
+        if not self.emotion_names:
+            self._allocate(list(emotions.keys()))
+        elif self._size == len(self._elapsed):
+            self._grow()
+        
+        row = self._size
+        self._scores[row] = [emotions.get(emotion, 0.0) for emotion in self.emotion_names]
+        self._elapsed[row] = (time.perf_counter() - self._start_clock) if elapsed_seconds is None else elapsed_seconds
+        self._frames[row] = frame_number
+        # Suma acumulada antes de publicar la fila: window_statistics puede leer desde otro hilo
+        self._cumulative[row + 1] = self._cumulative[row] + self._scores[row]
+        self._size += 1
+        self._update_statistics(row)
+    
+    def _update_statistics(self, row: int):
+        """Actualiza los acumuladores con el frame recién agregado (O(emociones))."""
+        values = self._scores[row].astype(np.float64)
+        
+        # Welford: media y suma de cuadrados de las desviaciones
+        delta = values - self._mean
+        self._mean += delta / self._size
+        self._m2 += delta * (values - self._mean)
+        np.minimum(self._min, values, out=self._min)
+        np.maximum(self._max, values, out=self._max)
+        
+        dominant = int(values.argmax())
+        self._dominant_counts[dominant] += 1
+        
+        # Transiciones: solo los frames con confianza suficiente actualizan la emoción previa
+        score = float(values[dominant])
+        if score > self.TRANSITION_THRESHOLD:
+            if self._previous_dominant is not None and dominant != self._previous_dominant:
+                self._transitions.append({
+                    'frame': int(self._frames[row]),
+                    'time': round(float(self._elapsed[row]), 2),
+                    'from': self.emotion_names[self._previous_dominant],
+                    'to': self.emotion_names[dominant],
+                    'confidence': round(score, 2)
+                })
+            self._previous_dominant = dominant
+    
+    @property
+    def start_clock(self):
+        """time.perf_counter() al iniciar la grabación (origen de elapsed_seconds)."""
+        return self._start_clock
+    
+    def elapsed_at(self, clock_time: float) -> float:
+        """Convierte un instante de time.perf_counter() a segundos desde el inicio de la grabación."""
+        return clock_time - self._start_clock
+    
+    def add_utterance(self, text: str, start_seconds: float, end_seconds: float,
+                      words: Optional[Sequence[Tuple[str, float, float]]] = None):
+        """
+        Registra un enunciado transcrito.
         
-        self.history.append({
-            'frame': frame_number,
-            'timestamp': timestamp.isoformat(),
-            'elapsed_seconds': round(elapsed_seconds, 2),
-            'emotions': emotions.copy()
-        })
+        Args:
+            text: Texto del enunciado
+            start_seconds, end_seconds: Inicio y fin en segundos desde el inicio de la grabación
+            words: Opcional, (palabra, inicio, fin) en la misma escala de tiempo
+        """
+        utterance = {
+            'text': text,
+            'start_time': round(float(start_seconds), 3),
+            'end_time': round(float(end_seconds), 3),
+        }
+        if words is not None:
+            utterance['words'] = [
+                {'word': word, 'start': round(float(start), 3), 'end': round(float(end), 3)}
+                for word, start, end in words
+            ]
+        self._utterances.append(utterance)
+    
+    def window_statistics(self, start_seconds: float, end_seconds: float) -> Dict:
+        """
+        Emociones faciales promedio de los frames con tiempo en [start_seconds, end_seconds].
+        O(log frames + emociones): búsqueda binaria en los tiempos y sumas acumuladas.
+        """
+        elapsed = self._elapsed[:self._size]
+        first = int(np.searchsorted(elapsed, start_seconds, side='left'))
+        last = int(np.searchsorted(elapsed, end_seconds, side='right'))
+        frames = last - first
+        if frames <= 0:
+            return {'frames': 0, 'mean': {}, 'dominant_emotion': None, 'confidence': 0.0}
+        
+        means = (self._cumulative[last] - self._cumulative[first]) / frames
+        dominant = int(means.argmax())
+        return {
+            'frames': frames,
+            'mean': {emotion: round(float(value), 2) for emotion, value in zip(self.emotion_names, means)},
+            'dominant_emotion': self.emotion_names[dominant],
+            'confidence': round(float(means[dominant]), 2)
+        }
+    
+    def get_utterance_emotions(self) -> List[Dict]:
+        """Vista conjunta: cada enunciado con las estadísticas faciales de su ventana de tiempo."""
+        return [
+            dict(utterance, face_emotions=self.window_statistics(utterance['start_time'], utterance['end_time']))
+            for utterance in self._utterances
+        ]
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @property
+    def scores(self) -> np.ndarray:
+        """Vista (frames, emociones) de los scores registrados."""
+        return self._scores[:self._size]
+    
+    @property
+    def elapsed_seconds(self) -> np.ndarray:
+        return self._elapsed[:self._size]
+    
+    @property
+    def frame_numbers(self) -> np.ndarray:
+        return self._frames[:self._size]
+    
+    @property
+    def history(self) -> List[Dict]:
+        """Vista de compatibilidad: un dict por frame como en el formato anterior."""
+        start = self.start_time
+        return [
+            {
+                'frame': int(frame),
+                'timestamp': (start + timedelta(seconds=float(elapsed))).isoformat(),
+                'elapsed_seconds': round(float(elapsed), 2),
+                'emotions': dict(zip(self.emotion_names, map(float, scores)))
+            }
+            for frame, elapsed, scores in zip(self.frame_numbers, self.elapsed_seconds, self.scores)
+        ]
     
     def get_summary(self) -> Dict:
         """
@@ -55,7 +243,7 @@ class EmotionHistory:
         Returns:
             Diccionario con análisis completo del historial
         """
-        if not self.history:
+        if not self._size:
             return {
                 'status': 'no_data',
                 'message': 'No hay datos de emociones registrados'
@@ -70,133 +258,104 @@ class EmotionHistory:
         # Generar timeline
         timeline = self._generate_timeline()
         
-        # Calcular duración
-        duration = (self.end_time - self.start_time).total_seconds() if self.end_time else 0
+        # Emociones faciales por enunciado
+        utterances = self.get_utterance_emotions()
+        
+        # Calcular duración (en vivo si la grabación sigue activa)
+        duration = self._duration_seconds()
         
         summary = {
             'recording_info': {
                 'start_time': self.start_time.strftime('%Y-%m-%d %H:%M:%S') if self.start_time else None,
                 'end_time': self.end_time.strftime('%Y-%m-%d %H:%M:%S') if self.end_time else None,
                 'duration_seconds': round(duration, 2),
-                'total_frames': len(self.history)
+                'total_frames': self._size
             },
             'emotion_statistics': emotions_stats,
             'emotion_transitions': emotion_transitions,
             'timeline': timeline,
-            'llm_summary': self._generate_llm_prompt()
+            'utterances': utterances,
+            'llm_summary': self._generate_llm_prompt(emotions_stats, emotion_transitions, timeline, duration,
+                                                     utterances)
         }
         
         return summary
     
+    def _duration_seconds(self) -> float:
+        if self.end_time:
+            return (self.end_time - self.start_time).total_seconds()
+        if self._start_clock is not None:
+            return time.perf_counter() - self._start_clock
+        return 0.0
+    
     def _calculate_emotion_statistics(self) -> Dict:
-        """Calcula estadísticas agregadas por emoción."""
-        if not self.history:
+        """Estadísticas agregadas por emoción a partir de los acumuladores."""
+        if not self._size:
             return {}
         
-        emotion_names = list(self.history[0]['emotions'].keys())
-        stats = {}
+        stds = np.sqrt(self._m2 / self._size)
+        dominance = self._calculate_dominance()
         
-        for emotion in emotion_names:
-            values = [frame['emotions'][emotion] for frame in self.history]
+        stats = {}
+        for j, emotion in enumerate(self.emotion_names):
             stats[emotion] = {
-                'mean': round(np.mean(values), 2),
-                'max': round(np.max(values), 2),
-                'min': round(np.min(values), 2),
-                'std': round(np.std(values), 2),
-                'dominant_percentage': self._calculate_dominance(emotion)
+                'mean': round(float(self._mean[j]), 2),
+                'max': round(float(self._max[j]), 2),
+                'min': round(float(self._min[j]), 2),
+                'std': round(float(stds[j]), 2),
+                'dominant_percentage': round(float(dominance[j]), 2)
             }
         
         return stats
     
-    def _calculate_dominance(self, emotion: str) -> float:
-        """Calcula el porcentaje de frames donde esta emoción fue dominante."""
-        if not self.history:
-            return 0.0
-        
-        dominant_count = 0
-        for frame in self.history:
-            dominant = max(frame['emotions'], key=frame['emotions'].get)
-            if dominant == emotion:
-                dominant_count += 1
-        
-        return round((dominant_count / len(self.history)) * 100, 2)
+    def _calculate_dominance(self) -> np.ndarray:
+        """Porcentaje de frames donde cada emoción fue dominante."""
+        return self._dominant_counts / self._size * 100
     
     def _detect_transitions(self) -> List[Dict]:
-        """Detecta cambios significativos de emoción."""
-        if len(self.history) < 2:
+        """Transiciones significativas detectadas en línea por add_frame."""
+        if self._size < 2:
             return []
-        
-        transitions = []
-        previous_dominant = None
-        transition_threshold = 20.0  # Cambio mínimo para considerar transición
-        
-        for i, frame in enumerate(self.history):
-            current_dominant = max(frame['emotions'], key=frame['emotions'].get)
-            current_score = frame['emotions'][current_dominant]
-            
-            if previous_dominant and current_dominant != previous_dominant:
-                if current_score > transition_threshold:
-                    transitions.append({
-                        'frame': frame['frame'],
-                        'time': frame['elapsed_seconds'],
-                        'from': previous_dominant,
-                        'to': current_dominant,
-                        'confidence': round(current_score, 2)
-                    })
-            
-            if current_score > transition_threshold:
-                previous_dominant = current_dominant
-        
-        return transitions
+        return list(self._transitions)
     
     def _generate_timeline(self, segments: int = 10) -> List[Dict]:
         """Genera un timeline segmentado del historial."""
-        if not self.history:
+        if not self._size:
             return []
         
-        segment_size = max(1, len(self.history) // segments)
-        timeline = []
+        segment_size = max(1, self._size // segments)
+        starts = np.arange(0, self._size, segment_size)
+        ends = np.minimum(starts + segment_size, self._size)
+        
+        # Suma por segmento a partir de las sumas acumuladas: O(segmentos)
+        sums = self._cumulative[ends] - self._cumulative[starts]
+        dominant = sums.argmax(axis=1)
         
-        for i in range(0, len(self.history), segment_size):
-            segment = self.history[i:i + segment_size]
-            if not segment:
-                continue
-            
-            # Calcular emoción dominante en el segmento
-            emotion_sums = {}
-            for frame in segment:
-                for emotion, score in frame['emotions'].items():
-                    emotion_sums[emotion] = emotion_sums.get(emotion, 0) + score
-            
-            dominant = max(emotion_sums, key=emotion_sums.get)
-            avg_score = emotion_sums[dominant] / len(segment)
-            
+        timeline = []
+        for i, (start, end) in enumerate(zip(starts, ends)):
             timeline.append({
-                'segment': i // segment_size + 1,
-                'start_time': segment[0]['elapsed_seconds'],
-                'end_time': segment[-1]['elapsed_seconds'],
-                'dominant_emotion': dominant,
-                'confidence': round(avg_score, 2)
+                'segment': i + 1,
+                'start_time': round(float(self._elapsed[start]), 2),
+                'end_time': round(float(self._elapsed[end - 1]), 2),
+                'dominant_emotion': self.emotion_names[dominant[i]],
+                'confidence': round(float(sums[i, dominant[i]] / (end - start)), 2)
             })
         
         return timeline
     
-    def _generate_llm_prompt(self) -> str:
-        """Genera un prompt optimizado para análisis por LLM."""
-        if not self.history:
+    def _generate_llm_prompt(self, stats: Dict, transitions: List[Dict], timeline: List[Dict],
+                             duration: float, utterances: Optional[List[Dict]] = None) -> str:
+        """Genera un prompt optimizado para análisis por LLM a partir del resumen ya calculado."""
+        if not self._size:
             return "No hay datos para analizar."
         
-        stats = self._calculate_emotion_statistics()
-        transitions = self._detect_transitions()
-        timeline = self._generate_timeline()
-        
         # Encontrar emoción dominante general
         dominant_emotion = max(stats.items(), key=lambda x: x[1]['mean'])
         
         prompt = f"""Análisis de Emociones Faciales:
 
-Duración: {(self.end_time - self.start_time).total_seconds():.1f} segundos
-Frames analizados: {len(self.history)}
+Duración: {duration:.1f} segundos
+Frames analizados: {self._size}
 
 EMOCIÓN DOMINANTE: {dominant_emotion[0].upper()} ({dominant_emotion[1]['mean']:.1f}% promedio)
 
@@ -214,6 +373,13 @@ ESTADÍSTICAS POR EMOCIÓN:
         for seg in timeline:
             prompt += f"- Seg {seg['segment']} ({seg['start_time']:.1f}s-{seg['end_time']:.1f}s): {seg['dominant_emotion']} ({seg['confidence']:.1f}%)\n"
         
+        if utterances:
+            prompt += "\nEMOCIÓN FACIAL AL HABLAR:\n"
+            for utterance in utterances:
+                face = utterance['face_emotions']
+                expression = f"{face['dominant_emotion']} ({face['confidence']:.1f}%)" if face['frames'] else "sin rostro"
+                prompt += f"- {utterance['start_time']:.1f}s-{utterance['end_time']:.1f}s \"{utterance['text']}\": {expression}\n"
+        
         return prompt
     
     def save_to_file(self, filename: str = None):
@@ -1,5 +1,5 @@
 import numpy as np
-from typing import Dict
+from typing import Dict, List
 
 class EmotionNormalizer:
     """
@@ -86,6 +86,57 @@ class EmotionNormalizer:
         
         return emotions
     
+    def normalize_batch(self, scores: np.ndarray, emotion_names: List[str]) -> np.ndarray:
+        """
+        Versión vectorizada de normalize para una matriz de scores.
+        
+        Args:
+            scores: Matriz (T, n_emociones) con scores crudos (0-100)
+            emotion_names: Nombre de cada columna, en el mismo orden
+            
+        Returns:
+            Matriz (T, n_emociones) con scores normalizados
+        """
+        normalized = np.array(scores, dtype=np.float64)
+        column = {emotion: j for j, emotion in enumerate(emotion_names)}
+        
+        # Paso 1: Penalizaciones por emociones opuestas
+        for emotion1, emotion2 in self.opposite_pairs:
+            if emotion1 in column and emotion2 in column:
+                score1 = normalized[:, column[emotion1]].copy()
+                score2 = normalized[:, column[emotion2]].copy()
+                both_high = (score1 > 30) & (score2 > 30)
+                factor = 1 - np.minimum(score1, score2) / 100.0 * 0.7
+                first_wins = score1 > score2
+                normalized[:, column[emotion2]] = np.where(both_high & first_wins, score2 * factor, score2)
+                normalized[:, column[emotion1]] = np.where(both_high & ~first_wins, score1 * factor, score1)
+        
+        # Paso 2: Refuerzo de emociones similares
+        frames = normalized.shape[0]
+        for group in self.similar_groups:
+            group_scores = [normalized[:, column[e]].copy() if e in column else np.zeros(frames) for e in group]
+            group_sum = 0.0
+            for group_score in group_scores:
+                group_sum = group_sum + group_score
+            avg_score = group_sum / len(group)
+            reinforce = np.maximum.reduce(group_scores) > 50
+            for emotion in group:
+                if emotion in column:
+                    current = normalized[:, column[emotion]]
+                    normalized[:, column[emotion]] = np.where(reinforce & (current > 20),
+                                                              current + (avg_score - current) * 0.2, current)
+        
+        # Paso 3: Competencia suave (misma suma secuencial que _soft_competition)
+        total = 0.0
+        for j in range(normalized.shape[1]):
+            total = total + normalized[:, j]
+        too_high = np.broadcast_to(total > 120.0 * 1.5, (frames,))
+        factor = 120.0 / np.where(too_high, total, 1.0)
+        normalized = np.where(too_high[:, None], normalized * factor[:, None], normalized)
+        
+        # Paso 4: Rango [0, 100]
+        return np.maximum(0.0, np.minimum(100.0, normalized))
+    
     def get_dominant_emotion(self, emotions: Dict[str, float]) -> tuple:
         """
         Retorna la emoción dominante y su confianza.
@@ -0,0 +1,155 @@
+import numpy as np
+from typing import Any, Dict, List, Tuple
+from emotion_processor.face_mesh.landmark_indices import NUM_LANDMARKS, FEATURE_INDEX_TABLE, FEATURE_SLICES
+
+
+# (feature, output name, sub-feature, position of the first point, position of the second point)
+DISTANCE_PAIRS: List[Tuple[str, str, str, int, int]] = [
+    ('eyebrows', 'eye_right_distance', 'distances', 0, 1),
+    ('eyebrows', 'eye_left_distance', 'distances', 2, 3),
+    ('eyebrows', 'forehead_right_distance', 'distances', 4, 5),
+    ('eyebrows', 'forehead_left_distance', 'distances', 6, 7),
+    ('eyebrows', 'eyebrows_distance', 'distances', 8, 9),
+    ('eyebrows', 'eyebrow_distance_forehead', 'distances', 10, 11),
+    ('eyes', 'right_upper_eyelid_distance', 'distances', 0, 1),
+    ('eyes', 'left_upper_eyelid_distance', 'distances', 2, 3),
+    ('eyes', 'right_lower_eyelid_distance', 'distances', 4, 5),
+    ('eyes', 'left_lower_eyelid_distance', 'distances', 6, 7),
+    ('nose', 'mouth_upper_distance', 'distances', 0, 1),
+    ('nose', 'nose_lower_distance', 'distances', 2, 3),
+    ('mouth', 'mouth_upper_distance', 'distances', 0, 1),
+    ('mouth', 'mouth_lower_distance', 'distances', 2, 3),
+    ('mouth', 'right_smile_distance', 'distances', 4, 5),
+    ('mouth', 'right_lip_distance', 'distances', 6, 7),
+    ('mouth', 'left_smile_distance', 'distances', 8, 9),
+    ('mouth', 'left_lip_distance', 'distances', 10, 11),
+]
+
+# (feature, output name, sub-feature): quadratic coefficient of the arch through the sub-feature points
+ARCHES: List[Tuple[str, str, str]] = [
+    ('eyebrows', 'arch_right', 'right arch'),
+    ('eyebrows', 'arch_left', 'left arch'),
+    ('eyes', 'arch_right', 'right arch'),
+    ('eyes', 'arch_left', 'left arch'),
+    ('mouth', 'upper_arch', 'upper arch'),
+    ('mouth', 'lower_arch', 'lower arch'),
+]
+
+# face width: distance between the outer eye corners (first point of each eye arch)
+FACE_WIDTH_PAIR: Tuple[str, str, int, str, int] = ('eyes', 'right arch', 0, 'left arch', 0)
+
+# Output layout of each feature dict (key order of the former per-feature processors' dicts).
+FEATURE_LAYOUT: Dict[str, List[str]] = {
+    'eyebrows': ['arch_right', 'arch_left', 'eye_right_distance', 'eye_left_distance', 'forehead_right_distance',
+                 'forehead_left_distance', 'eyebrows_distance', 'eyebrow_distance_forehead'],
+    'eyes': ['arch_right', 'arch_left', 'right_upper_eyelid_distance', 'left_upper_eyelid_distance',
+             'right_lower_eyelid_distance', 'left_lower_eyelid_distance', 'face_width'],
+    'nose': ['mouth_upper_distance', 'nose_lower_distance'],
+    'mouth': ['upper_arch', 'lower_arch', 'mouth_upper_distance', 'mouth_lower_distance', 'right_smile_distance',
+              'right_lip_distance', 'left_smile_distance', 'left_lip_distance'],
+}
+
+# Flat feature vector layout: one column per (feature, name)
+FEATURE_NAMES: List[Tuple[str, str]] = [(feature, name) for feature, names in FEATURE_LAYOUT.items() for name in names]
+
+
+class FeatureGeometry:
+    """
+    Computes every named feature of PointsProcessing from the gathered feature points with one batched
+    norm over a static pair-index table and one batched least-squares solve for all the arch quadratics.
+    Accepts the legacy nested dict, a (478, 2) landmark array or a (..., 478, 2) stack of them.
+    """
+    def __init__(self):
+        def position(feature: str, sub_feature: str, offset: int) -> int:
+            return FEATURE_SLICES[feature][sub_feature].start + offset
+
+        pairs = [(position(f, sub, a), position(f, sub, b)) for f, _, sub, a, b in DISTANCE_PAIRS]
+        feature, right, right_offset, left, left_offset = FACE_WIDTH_PAIR
+        pairs.append((position(feature, right, right_offset), position(feature, left, left_offset)))
+        self.pair_a = np.array([a for a, _ in pairs], dtype=np.intp)
+        self.pair_b = np.array([b for _, b in pairs], dtype=np.intp)
+
+        # arches have different point counts: pad every row to the longest one and mask the padding out
+        arch_slices = [FEATURE_SLICES[f][sub] for f, _, sub in ARCHES]
+        max_points = max(s.stop - s.start for s in arch_slices)
+        self.arch_index = np.zeros((len(ARCHES), max_points), dtype=np.intp)
+        self.arch_mask = np.zeros((len(ARCHES), max_points), dtype=np.float64)
+        for row, s in enumerate(arch_slices):
+            count = s.stop - s.start
+            self.arch_index[row, :count] = np.arange(s.start, s.stop)
+            self.arch_index[row, count:] = s.start
+            self.arch_mask[row, :count] = 1.0
+        self.arch_count = self.arch_mask.sum(axis=1)
+
+        # column of each (feature, name) in the flat vector [distances..., face_width, arches...]
+        sources = [(f, name) for f, name, _, _, _ in DISTANCE_PAIRS] + [(FACE_WIDTH_PAIR[0], 'face_width')]
+        sources += [(f, name) for f, name, _ in ARCHES]
+        source_column = {key: column for column, key in enumerate(sources)}
+        self.layout = np.array([source_column[key] for key in FEATURE_NAMES], dtype=np.intp)
+
+    @staticmethod
+    def feature_array(points: Any) -> np.ndarray:
+        """Returns the gathered feature points (..., len(FEATURE_INDEX_TABLE), 2) as float64."""
+        if isinstance(points, np.ndarray):
+            if points.shape[-2] == NUM_LANDMARKS:
+                points = points[..., FEATURE_INDEX_TABLE, :]
+            return points.astype(np.float64, copy=False)
+        return np.array([point for feature, sub_slices in FEATURE_SLICES.items()
+                         for sub_feature in sub_slices
+                         for point in points[feature][sub_feature]], dtype=np.float64)
+
+    def distances(self, feature_points: np.ndarray) -> np.ndarray:
+        diff = feature_points[..., self.pair_a, :] - feature_points[..., self.pair_b, :]
+        return np.linalg.norm(diff, axis=-1)
+
+    def arches(self, feature_points: np.ndarray) -> np.ndarray:
+        """Quadratic coefficient of y = a*x^2 + b*x + c for every arch, like np.polyfit(x, y, 2)[0]."""
+        arch_points = feature_points[..., self.arch_index, :]
+        x, y = arch_points[..., 0], arch_points[..., 1]
+        # center and scale x so the normal matrix stays well conditioned on pixel coordinates
+        center = (x * self.arch_mask).sum(axis=-1, keepdims=True) / self.arch_count[:, None]
+        spread = np.abs(x - center).max(axis=-1, keepdims=True)
+        spread[spread == 0] = 1.0
+        xs = (x - center) / spread
+        design = np.stack([xs * xs, xs, np.ones_like(xs)], axis=-1) * self.arch_mask[..., None]
+        target = (y * self.arch_mask)[..., None]
+        normal = np.swapaxes(design, -1, -2) @ design
+        rhs = np.swapaxes(design, -1, -2) @ target
+        try:
+            coefficients = np.linalg.solve(normal, rhs)
+        except np.linalg.LinAlgError:
+            coefficients = self._solve_each(design, target, normal, rhs)
+        return coefficients[..., 0, 0] / (spread[..., 0] ** 2)
+
+    @staticmethod
+    def _solve_each(design: np.ndarray, target: np.ndarray, normal: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        """
+        Arch-by-arch solve once the batched one hit a singular system: only the degenerate arches (e.g. all
+        points share one x) take the minimum-norm solution, as lstsq would give; the rest keep the exact solve.
+        """
+        flat_normal, flat_rhs = normal.reshape(-1, 3, 3), rhs.reshape(-1, 3, 1)
+        flat_design, flat_target = design.reshape(-1, design.shape[-2], 3), target.reshape(-1, target.shape[-2], 1)
+        coefficients = np.empty_like(flat_rhs)
+        for i in range(len(flat_normal)):
+            try:
+                coefficients[i] = np.linalg.solve(flat_normal[i], flat_rhs[i])
+            except np.linalg.LinAlgError:
+                coefficients[i] = np.linalg.pinv(flat_design[i]) @ flat_target[i]
+        return coefficients.reshape(rhs.shape)
+
+    def vector(self, points: Any) -> np.ndarray:
+        """Flat (..., len(FEATURE_NAMES)) feature vector, columns ordered as FEATURE_NAMES."""
+        feature_points = self.feature_array(points)
+        values = np.concatenate([self.distances(feature_points), self.arches(feature_points)], axis=-1)
+        return values[..., self.layout]
+
+    @staticmethod
+    def to_features(vector: np.ndarray) -> Dict[str, Dict[str, float]]:
+        """Nested {feature: {name: value}} dict from one flat feature vector."""
+        features: Dict[str, Dict[str, float]] = {feature: {} for feature in FEATURE_LAYOUT}
+        for (feature, name), value in zip(FEATURE_NAMES, vector):
+            features[feature][name] = value
+        return features
+
+    def compute(self, points: Any) -> Dict[str, Dict[str, float]]:
+        return self.to_features(self.vector(points))
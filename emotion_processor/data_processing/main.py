@@ -1,23 +1,23 @@
-from emotion_processor.data_processing.feature_processor import FeatureProcessor
-from emotion_processor.data_processing.eyebrows.eyebrows_processor import EyeBrowsProcessor
-from emotion_processor.data_processing.eyes.eyes_processor import EyesProcessor
-from emotion_processor.data_processing.nose.nose_processor import NoseProcessor
-from emotion_processor.data_processing.mouth.mouth_processor import MouthProcessor
+import numpy as np
+from emotion_processor.data_processing.geometry import FeatureGeometry
+
 
 class PointsProcessing:
     def __init__(self):
-        self.processors: dict[str, FeatureProcessor] = {
-            'eyebrows': EyeBrowsProcessor(),
-            'eyes': EyesProcessor(),
-            'nose': NoseProcessor(),
-            'mouth': MouthProcessor()
-        }
+        # one batched geometry kernel computes the eyebrows, eyes, nose and mouth features
+        self.geometry = FeatureGeometry()
         self.processed_points: dict = {}
 
-    def main(self, points: dict):
-        self.processed_points = {}
-        for feature, processor in self.processors.items():
-            feature_points = points.get(feature, {})
-            self.processed_points[feature] = processor.process(feature_points)
+    def main(self, points):
+        """
+        points: the nested feature dict from FaceMeshProcessor or a (478, 2) landmark array.
+        """
+        self.processed_points = self.geometry.compute(points)
         return self.processed_points
 
+    def feature_matrix(self, landmarks: np.ndarray) -> np.ndarray:
+        """
+        landmarks: (T, 478, 2) stack of landmark arrays.
+        Returns the (T, len(FEATURE_NAMES)) feature matrix consumed by EmotionRecognition.recognize_batch.
+        """
+        return self.geometry.vector(landmarks)
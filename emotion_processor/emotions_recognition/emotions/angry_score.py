@@ -1,3 +1,4 @@
+import numpy as np
 from emotion_processor.emotions_recognition.features.weights_emotion_score import WeightedEmotionScore
 
 class AngryScore(WeightedEmotionScore):
@@ -60,3 +61,40 @@ class AngryScore(WeightedEmotionScore):
         ) * 100.0
 
         return min(100.0, score)
+
+    # --------------------------
+    # Versiones vectorizadas (T,)
+    # --------------------------
+    def calculate_eyebrows_score_batch(self, eyebrows_result: dict) -> np.ndarray:
+        lowered = eyebrows_result.get('lowered', 0.0)
+        together = eyebrows_result.get('together', 0.0)
+        score = (0.65 * lowered + 0.35 * together) * 100.0
+        return np.minimum(100.0, score)
+
+    def calculate_eyes_score_batch(self, eyes_result: dict) -> np.ndarray:
+        tightness = eyes_result.get('tightness', 0.0)
+        openness = eyes_result.get('openness', 0.0)
+
+        score = 0.0
+        score = score + tightness * 100.0 * 0.7
+        score = score + np.where(openness < 0.45, (0.45 - openness) / 0.45 * 100.0 * 0.3, 0.0)
+        return np.minimum(100.0, score)
+
+    def calculate_nose_score_batch(self, nose_result: dict) -> np.ndarray:
+        wrinkle = nose_result.get('wrinkle', 0.0)
+        flare = nose_result.get('flare', 0.0)
+        score = wrinkle * 100.0 * 0.8 + flare * 100.0 * 0.2
+        return np.minimum(100.0, score)
+
+    def calculate_mouth_score_batch(self, mouth_result: dict) -> np.ndarray:
+        press = mouth_result.get('press', 0.0)
+        tighten = mouth_result.get('tighten', 0.0)
+        chin_raise = mouth_result.get('chin_raise', 0.0)
+
+        score = (
+            0.5 * press +
+            0.35 * tighten +
+            0.15 * chin_raise
+        ) * 100.0
+
+        return np.minimum(100.0, score)
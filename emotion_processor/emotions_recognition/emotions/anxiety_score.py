@@ -1,3 +1,4 @@
+import numpy as np
 from emotion_processor.emotions_recognition.features.weights_emotion_score import WeightedEmotionScore
 
 class AnxietyScore(WeightedEmotionScore):
@@ -31,3 +32,25 @@ class AnxietyScore(WeightedEmotionScore):
         score += 50 * no_smile
         return min(100.0, score)
 
+    def calculate_eyebrows_score_batch(self, eyebrows_result: dict) -> np.ndarray:
+        score = 0.0
+        score = score + 50 * eyebrows_result.get('together', 0.0)
+        score = score + 25 * eyebrows_result.get('right_raised', 0.0)
+        score = score + 25 * eyebrows_result.get('left_raised', 0.0)
+        return np.minimum(100.0, score)
+
+    def calculate_eyes_score_batch(self, eyes_result: dict) -> np.ndarray:
+        openness = eyes_result.get('openness', 0.0)
+        return np.where(openness > 0.6, 70 + 30 * (openness - 0.6) / 0.4, 0.0)
+
+    def calculate_nose_score_batch(self, nose_result: dict) -> np.ndarray:
+        flared = nose_result.get('flared', 0.0)
+        return np.where(flared > 0.1, 100 * np.minimum(1.0, flared / 0.3), 0.0)
+
+    def calculate_mouth_score_batch(self, mouth_result: dict) -> np.ndarray:
+        score = 0.0
+        tension = mouth_result.get('tension', 0.0)
+        no_smile = mouth_result.get('no_smile', 0.0)
+        score = score + 50 * tension
+        score = score + 50 * no_smile
+        return np.minimum(100.0, score)
@@ -1,3 +1,4 @@
+import numpy as np
 from emotion_processor.emotions_recognition.features.weights_emotion_score import WeightedEmotionScore
 
 
@@ -88,4 +89,47 @@ class DisgustScore(WeightedEmotionScore):
         if no_smile > 0.9:  # Casi sin sonrisa
             score += 40 * ((no_smile - 0.9) / 0.1)
         
-        return min(100.0, score)
\ No newline at end of file
+        return min(100.0, score)
+
+    def calculate_eyebrows_score_batch(self, eyebrows_result: dict) -> np.ndarray:
+        """Versión vectorizada de calculate_eyebrows_score."""
+        score = 0.0
+        together = eyebrows_result.get('together', 0.0)
+        right_raised = eyebrows_result.get('right_raised', 0.0)
+        left_raised = eyebrows_result.get('left_raised', 0.0)
+
+        score = score + np.where(together > 0.7, 50 * ((together - 0.7) / 0.3), 0.0)
+
+        lowered = (right_raised < 0.2) & (left_raised < 0.2)
+        score = score + np.where(lowered, 25 * (1.0 - right_raised), 0.0)
+        score = score + np.where(lowered, 25 * (1.0 - left_raised), 0.0)
+
+        return np.minimum(100.0, score)
+
+    def calculate_eyes_score_batch(self, eyes_result: dict) -> np.ndarray:
+        """Versión vectorizada de calculate_eyes_score."""
+        openness = eyes_result.get('openness', 0.0)
+        tension = eyes_result.get('tension', 0.0)
+        score = 0.0
+
+        score = score + np.where(openness < 0.15, 60 * (0.15 - openness) / 0.15, 0.0)
+        score = score + np.where(tension > 0.7, 40 * ((tension - 0.7) / 0.3), 0.0)
+
+        return np.minimum(100.0, score)
+
+    def calculate_nose_score_batch(self, nose_result: dict) -> np.ndarray:
+        """Versión vectorizada de calculate_nose_score."""
+        flared = nose_result.get('flared', 0.0)
+        normalized = np.maximum((flared - 0.5) / 0.5, 0.0)
+        return np.where(flared > 0.5, 100 * np.minimum(1.0, normalized ** 0.7), 0.0)
+
+    def calculate_mouth_score_batch(self, mouth_result: dict) -> np.ndarray:
+        """Versión vectorizada de calculate_mouth_score."""
+        score = 0.0
+        tension = mouth_result.get('tension', 0.0)
+        no_smile = mouth_result.get('no_smile', 0.0)
+
+        score = score + np.where(tension > 0.8, 60 * ((tension - 0.8) / 0.2), 0.0)
+        score = score + np.where(no_smile > 0.9, 40 * ((no_smile - 0.9) / 0.1), 0.0)
+
+        return np.minimum(100.0, score)
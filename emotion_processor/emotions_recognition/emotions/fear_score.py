@@ -1,3 +1,4 @@
+import numpy as np
 from emotion_processor.emotions_recognition.features.weights_emotion_score import WeightedEmotionScore
 
 
@@ -31,4 +32,31 @@ class FearScore(WeightedEmotionScore):
         no_smile = mouth_result.get('no_smile', 0.0)
         score += 50 * (1.0 - tension)  # Boca abierta (baja tensión, AU25/26)
         score += 50 * no_smile  # Sin sonrisa
-        return min(100.0, score)
\ No newline at end of file
+        return min(100.0, score)
+
+    def calculate_eyebrows_score_batch(self, eyebrows_result: dict) -> np.ndarray:
+        score = 0.0
+        score = score + 20 * eyebrows_result.get('together', 0.0)
+        score = score + 40 * eyebrows_result.get('right_raised', 0.0)
+        score = score + 40 * eyebrows_result.get('left_raised', 0.0)
+        return np.minimum(100.0, score)
+
+    def calculate_eyes_score_batch(self, eyes_result: dict) -> np.ndarray:
+        openness = eyes_result.get('openness', 0.0)
+        tension = eyes_result.get('tension', 0.0)
+        score = 0.0
+        score = score + np.where(openness > 0.6, 70 + 30 * (openness - 0.6) / 0.4, 0.0)
+        score = score + 30 * tension
+        return np.minimum(100.0, score)
+
+    def calculate_nose_score_batch(self, nose_result: dict) -> np.ndarray:
+        flared = nose_result.get('flared', 0.0)
+        return np.where(flared < 0.1, 100 * (1.0 - flared), 0.0)
+
+    def calculate_mouth_score_batch(self, mouth_result: dict) -> np.ndarray:
+        score = 0.0
+        tension = mouth_result.get('tension', 0.0)
+        no_smile = mouth_result.get('no_smile', 0.0)
+        score = score + 50 * (1.0 - tension)
+        score = score + 50 * no_smile
+        return np.minimum(100.0, score)
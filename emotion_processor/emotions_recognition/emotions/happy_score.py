@@ -1,3 +1,4 @@
+import numpy as np
 from emotion_processor.emotions_recognition.features.weights_emotion_score import WeightedEmotionScore
 
 
@@ -114,3 +115,58 @@ class HappyScore(WeightedEmotionScore):
                 score += 10  # Bonus 3 - sonrisa muy clara
         
         return min(100.0, score)
+
+    def calculate_eyebrows_score_batch(self, eyebrows_result: dict) -> np.ndarray:
+        """Versión vectorizada de calculate_eyebrows_score."""
+        score = 0.0
+        together = eyebrows_result.get('together', 0.0)
+        right_raised = eyebrows_result.get('right_raised', 0.0)
+        left_raised = eyebrows_result.get('left_raised', 0.0)
+
+        score = score + np.where(together < 0.3, 60 * (1.0 - together), 0.0)
+
+        not_raised = (right_raised < 0.4) & (left_raised < 0.4)
+        score = score + np.where(not_raised, 20 * (1.0 - right_raised), 0.0)
+        score = score + np.where(not_raised, 20 * (1.0 - left_raised), 0.0)
+
+        return np.minimum(100.0, score)
+
+    def calculate_eyes_score_batch(self, eyes_result: dict) -> np.ndarray:
+        """Versión vectorizada de calculate_eyes_score."""
+        openness = eyes_result.get('openness', 0.0)
+
+        distance_from_optimal = np.abs(openness - 0.5)
+        in_curve = (0.15 <= openness) & (openness <= 0.85) & (distance_from_optimal <= 0.35)
+        score = 100 * (1.0 - (distance_from_optimal / 0.35) ** 0.5)
+        ideal = (0.3 <= openness) & (openness <= 0.7)
+        score = np.where(ideal, np.minimum(100.0, score * 1.2), score)
+        curve_score = np.maximum(0.0, np.minimum(100.0, score))
+
+        return np.where(in_curve, curve_score,
+                        np.where((0.1 <= openness) & (openness < 0.15), 40.0,
+                                 np.where((0.85 < openness) & (openness <= 0.95), 50.0, 0.0)))
+
+    def calculate_nose_score_batch(self, nose_result: dict) -> np.ndarray:
+        """Versión vectorizada de calculate_nose_score."""
+        flared = nose_result.get('flared', 0.0)
+        return np.where(flared < 0.2, 100 * (1.0 - flared / 0.2), 0.0)
+
+    def calculate_mouth_score_batch(self, mouth_result: dict) -> np.ndarray:
+        """Versión vectorizada de calculate_mouth_score."""
+        score = 0.0
+        tension = mouth_result.get('tension', 0.0)
+        no_smile = mouth_result.get('no_smile', 0.0)
+
+        smile_score = 1.0 - no_smile
+
+        relaxed = tension < 0.7
+        score = score + np.where(relaxed, 40 * (1.0 - tension), 0.0)
+        score = score + np.where(relaxed & (tension < 0.4), 10, 0.0)
+
+        smiling = smile_score > 0.2
+        score = score + np.where(smiling, 70 * (np.maximum(smile_score, 0.0) ** 0.7), 0.0)
+        score = score + np.where(smiling & (smile_score > 0.4), 10, 0.0)
+        score = score + np.where(smiling & (smile_score > 0.6), 10, 0.0)
+        score = score + np.where(smiling & (smile_score > 0.8), 10, 0.0)
+
+        return np.minimum(100.0, score)
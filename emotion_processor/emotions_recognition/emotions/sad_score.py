@@ -1,3 +1,4 @@
+import numpy as np
 from emotion_processor.emotions_recognition.features.weights_emotion_score import WeightedEmotionScore
 
 
@@ -28,4 +29,27 @@ class SadScore(WeightedEmotionScore):
         no_smile = mouth_result.get('no_smile', 0.0)
         score += 30 * tension  # Boca cerrada/tensa (AU17)
         score += 70 * no_smile  # Sin sonrisa (AU15)
-        return min(100.0, score)
\ No newline at end of file
+        return min(100.0, score)
+
+    def calculate_eyebrows_score_batch(self, eyebrows_result: dict) -> np.ndarray:
+        score = 0.0
+        score = score + 60 * eyebrows_result.get('together', 0.0)
+        score = score + 20 * (1.0 - eyebrows_result.get('right_raised', 0.0))
+        score = score + 20 * (1.0 - eyebrows_result.get('left_raised', 0.0))
+        return np.minimum(100.0, score)
+
+    def calculate_eyes_score_batch(self, eyes_result: dict) -> np.ndarray:
+        openness = eyes_result.get('openness', 0.0)
+        return np.where(openness < 0.4, 100 * np.minimum(1.0, (0.4 - openness) / 0.4), 0.0)
+
+    def calculate_nose_score_batch(self, nose_result: dict) -> np.ndarray:
+        flared = nose_result.get('flared', 0.0)
+        return np.where(flared < 0.1, 100 * (1.0 - flared), 0.0)
+
+    def calculate_mouth_score_batch(self, mouth_result: dict) -> np.ndarray:
+        score = 0.0
+        tension = mouth_result.get('tension', 0.0)
+        no_smile = mouth_result.get('no_smile', 0.0)
+        score = score + 30 * tension
+        score = score + 70 * no_smile
+        return np.minimum(100.0, score)
@@ -1,3 +1,4 @@
+import numpy as np
 from emotion_processor.emotions_recognition.features.weights_emotion_score import WeightedEmotionScore
 
 
@@ -52,3 +53,23 @@ class SurpriseScore(WeightedEmotionScore):
             return 0.0
 
         return min(100.0, openness * 100.0)
+
+    # --------------------------
+    # Versiones vectorizadas (T,)
+    # --------------------------
+    def calculate_eyebrows_score_batch(self, eyebrows_result: dict) -> np.ndarray:
+        raised_left = eyebrows_result.get('left_raised', 0.0)
+        raised_right = eyebrows_result.get('right_raised', 0.0)
+        score = (raised_left + raised_right) / 2.0 * 100.0
+        return np.minimum(100.0, score)
+
+    def calculate_eyes_score_batch(self, eyes_result: dict) -> np.ndarray:
+        openness = eyes_result.get('openness', 0.0)
+        return np.where(openness < 0.3, 0.0, np.minimum(openness, 1.0) * 100.0)
+
+    def calculate_nose_score_batch(self, nose_result: dict) -> np.ndarray:
+        return 0.0
+
+    def calculate_mouth_score_batch(self, mouth_result: dict) -> np.ndarray:
+        openness = mouth_result.get('openness', 0.0)
+        return np.where(openness < 0.2, 0.0, np.minimum(100.0, openness * 100.0))
@@ -6,20 +6,36 @@ class EyebrowsCheck(ABC):
     def check_eyebrows(self, eyebrows: dict) -> str:
         pass
 
+    @abstractmethod
+    def check_eyebrows_batch(self, eyebrows: dict) -> dict:
+        pass
+
 
 class EyesCheck(ABC):
     @abstractmethod
     def check_eyes(self, eyes: dict) -> str:
         pass
 
+    @abstractmethod
+    def check_eyes_batch(self, eyes: dict) -> dict:
+        pass
+
 
 class NoseCheck(ABC):
     @abstractmethod
     def check_nose(self, nose: dict) -> str:
         pass
 
+    @abstractmethod
+    def check_nose_batch(self, nose: dict) -> dict:
+        pass
+
 
 class MouthCheck(ABC):
     @abstractmethod
     def check_mouth(self, mouth: dict) -> str:
         pass
+
+    @abstractmethod
+    def check_mouth_batch(self, mouth: dict) -> dict:
+        pass
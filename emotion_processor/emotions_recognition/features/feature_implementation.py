@@ -35,6 +35,27 @@ class BasicEyebrowsCheck(EyebrowsCheck):
             'left_raised': left_raised_score    # 0-1, grado de elevación izquierda
         }
 
+    def check_eyebrows_batch(self, eyebrows: dict) -> dict:
+        # Mismas reglas que check_eyebrows sobre columnas (T,)
+        face_width = eyebrows.get('face_width', 100.0)
+        norm_eyebrows_dist = eyebrows['eyebrows_distance'] / face_width
+        norm_eye_right = eyebrows['eye_right_distance'] / face_width
+        norm_forehead_right = eyebrows['forehead_right_distance'] / face_width
+        norm_eye_left = eyebrows['eye_left_distance'] / face_width
+        norm_forehead_left = eyebrows['forehead_left_distance'] / face_width
+
+        together_score = np.where(norm_eyebrows_dist < 0.2, np.maximum(0.0, 1.0 - (norm_eyebrows_dist / 0.2)), 0.0)
+        right_raised_score = np.where(norm_eye_right > norm_forehead_right,
+                                      np.minimum(1.0, (norm_eye_right - norm_forehead_right) / 0.1), 0.0)
+        left_raised_score = np.where(norm_eye_left > norm_forehead_left,
+                                     np.minimum(1.0, (norm_eye_left - norm_forehead_left) / 0.1), 0.0)
+
+        return {
+            'together': together_score,
+            'right_raised': right_raised_score,
+            'left_raised': left_raised_score
+        }
+
 class BasicEyesCheck(EyesCheck):
     def check_eyes(self, eyes: dict) -> dict:
         # Tu código actual está bien, pero ajusta umbrales basados en búsquedas: openness >0.15 para moderado
@@ -63,6 +84,26 @@ class BasicEyesCheck(EyesCheck):
             'tension': tension_score
         }
 
+    def check_eyes_batch(self, eyes: dict) -> dict:
+        face_width = eyes.get('face_width', 100.0)
+        norm_right_upper = eyes['right_upper_eyelid_distance'] / face_width
+        norm_left_upper = eyes['left_upper_eyelid_distance'] / face_width
+        norm_right_lower = eyes['right_lower_eyelid_distance'] / face_width
+        norm_left_lower = eyes['left_lower_eyelid_distance'] / face_width
+        right_arch = eyes['arch_right']
+        left_arch = eyes['arch_left']
+
+        openness = ((norm_right_upper + norm_right_lower) + (norm_left_upper + norm_left_lower)) / 4.0
+        openness_score = np.where(openness > 0.15, np.minimum(1.0, (openness - 0.15) / (0.3 - 0.15)), 0.0)
+
+        tension = np.abs(right_arch - left_arch) / np.maximum(np.maximum(np.abs(right_arch), np.abs(left_arch)), 1e-6)
+        tension_score = np.where(tension > 0.05, np.minimum(1.0, tension / 0.1), 0.0)
+
+        return {
+            'openness': openness_score,
+            'tension': tension_score
+        }
+
 class BasicNoseCheck(NoseCheck):
     def check_nose(self, nose: dict) -> dict:
         mouth_upper = nose['mouth_upper_distance']
@@ -86,6 +127,20 @@ class BasicNoseCheck(NoseCheck):
             'flared': flared_score  # 0-1, alto si dilatada/arrugada
         }
 
+    def check_nose_batch(self, nose: dict) -> dict:
+        nose_width = nose.get('nose_width', 50.0)
+        face_width = nose.get('face_width', 100.0)
+        norm_nose_width = nose_width / face_width
+        norm_mouth_upper = nose['mouth_upper_distance'] / face_width
+        norm_nose_lower = nose['nose_lower_distance'] / face_width
+
+        flared_score = np.where(norm_nose_width > 0.15, np.minimum(1.0, (norm_nose_width - 0.15) / (0.25 - 0.15)), 0.0)
+        wrinkled = np.where(norm_mouth_upper > norm_nose_lower, 1.0, 0.0)
+
+        return {
+            'flared': np.maximum(flared_score, wrinkled)
+        }
+
 class BasicMouthCheck(MouthCheck):
     def check_mouth(self, mouth: dict) -> dict:
         lips_upper = mouth['mouth_upper_distance']
@@ -116,4 +171,24 @@ class BasicMouthCheck(MouthCheck):
         return {
             'tension': tension_score,  # 0-1, alto si tenso
             'no_smile': no_smile_score  # 0-1, alto si sin sonrisa
-        }
\ No newline at end of file
+        }
+
+    def check_mouth_batch(self, mouth: dict) -> dict:
+        face_width = mouth.get('face_width', 100.0)
+        norm_lips_upper = mouth['mouth_upper_distance'] / face_width
+        norm_lips_lower = mouth['mouth_lower_distance'] / face_width
+        norm_right_smile = mouth['right_smile_distance'] / face_width
+        norm_right_lip = mouth['right_lip_distance'] / face_width
+        norm_left_smile = mouth['left_smile_distance'] / face_width
+        norm_left_lip = mouth['left_lip_distance'] / face_width
+
+        open_dist = (norm_lips_upper + norm_lips_lower) / 2.0
+        tension_score = np.where((0.01 < open_dist) & (open_dist < 0.1), np.minimum(1.0, 1.0 - (open_dist / 0.1)), 0.0)
+
+        right_no_smile = np.where(norm_right_lip <= norm_right_smile, 1.0, 0.0)
+        left_no_smile = np.where(norm_left_lip <= norm_left_smile, 1.0, 0.0)
+
+        return {
+            'tension': tension_score,
+            'no_smile': (right_no_smile + left_no_smile) / 2.0
+        }
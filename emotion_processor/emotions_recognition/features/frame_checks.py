@@ -0,0 +1,36 @@
+import numpy as np
+from emotion_processor.data_processing.geometry import FEATURE_NAMES
+from emotion_processor.emotions_recognition.features.feature_implementation import (BasicEyebrowsCheck, BasicEyesCheck,
+                                                                                    BasicNoseCheck, BasicMouthCheck)
+
+
+class FrameChecks:
+    """
+    Stage one of emotion scoring: evaluates the four feature checks once per frame into a shared record
+    that every emotion scorer then consumes.
+    """
+    def __init__(self):
+        self.eyebrows_check = BasicEyebrowsCheck()
+        self.eyes_check = BasicEyesCheck()
+        self.nose_check = BasicNoseCheck()
+        self.mouth_check = BasicMouthCheck()
+
+    def evaluate(self, features: dict) -> dict:
+        return {
+            'eyebrows': self.eyebrows_check.check_eyebrows(features['eyebrows']),
+            'eyes': self.eyes_check.check_eyes(features['eyes']),
+            'nose': self.nose_check.check_nose(features['nose']),
+            'mouth': self.mouth_check.check_mouth(features['mouth'])
+        }
+
+    def evaluate_batch(self, feature_matrix: np.ndarray) -> dict:
+        """Same record for a (T, len(FEATURE_NAMES)) feature matrix: every check value is a (T,) column."""
+        features: dict = {}
+        for column, (feature, name) in enumerate(FEATURE_NAMES):
+            features.setdefault(feature, {})[name] = feature_matrix[:, column]
+        return {
+            'eyebrows': self.eyebrows_check.check_eyebrows_batch(features['eyebrows']),
+            'eyes': self.eyes_check.check_eyes_batch(features['eyes']),
+            'nose': self.nose_check.check_nose_batch(features['nose']),
+            'mouth': self.mouth_check.check_mouth_batch(features['mouth'])
+        }
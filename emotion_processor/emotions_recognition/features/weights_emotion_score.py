@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
+import numpy as np
 from emotion_processor.emotions_recognition.features.emotion_score import EmotionScore
-from emotion_processor.emotions_recognition.features.feature_implementation import (BasicEyebrowsCheck, BasicEyesCheck,
-                                                                                    BasicNoseCheck, BasicMouthCheck)
+from emotion_processor.emotions_recognition.features.frame_checks import FrameChecks
 
 
 class WeightedEmotionScore(EmotionScore, ABC):
@@ -10,27 +10,38 @@ class WeightedEmotionScore(EmotionScore, ABC):
         self.eyes_weight = eyes_weight
         self.nose_weight = nose_weight
         self.mouth_weight = mouth_weight
-        self.eyebrows_check = BasicEyebrowsCheck()
-        self.eyes_check = BasicEyesCheck()
-        self.nose_check = BasicNoseCheck()
-        self.mouth_check = BasicMouthCheck()
+        self.name = self.__class__.__name__.replace("Score", "").lower()
+        self.checks = FrameChecks()
 
     def calculate_score(self, features: dict) -> dict:
-        eyebrows_result = self.eyebrows_check.check_eyebrows(features['eyebrows'])
-        eyes_result = self.eyes_check.check_eyes(features['eyes'])
-        nose_result = self.nose_check.check_nose(features['nose'])
-        mouth_result = self.mouth_check.check_mouth(features['mouth'])
+        return self.score_checks(self.checks.evaluate(features))
 
-        eyebrows_score = self.calculate_eyebrows_score(eyebrows_result)
-        eyes_score = self.calculate_eyes_score(eyes_result)
-        nose_score = self.calculate_nose_score(nose_result)
-        mouth_score = self.calculate_mouth_score(mouth_result)
+    def score_checks(self, checks: dict) -> dict:
+        """Stage two: scores an already evaluated FrameChecks record."""
+        eyebrows_score = self.calculate_eyebrows_score(checks['eyebrows'])
+        eyes_score = self.calculate_eyes_score(checks['eyes'])
+        nose_score = self.calculate_nose_score(checks['nose'])
+        mouth_score = self.calculate_mouth_score(checks['mouth'])
 
         total_score = (eyebrows_score * self.eyebrows_weight +
                        eyes_score * self.eyes_weight +
                        nose_score * self.nose_weight +
                        mouth_score * self.mouth_weight)
-        return {self.__class__.__name__.replace("Score", "").lower(): total_score}
+        return {self.name: total_score}
+
+    def score_checks_batch(self, checks: dict) -> np.ndarray:
+        """Vectorized score_checks over a FrameChecks.evaluate_batch record; returns a (T,) column."""
+        frames = np.shape(checks['eyes']['openness'])
+        eyebrows_score = self.calculate_eyebrows_score_batch(checks['eyebrows'])
+        eyes_score = self.calculate_eyes_score_batch(checks['eyes'])
+        nose_score = self.calculate_nose_score_batch(checks['nose'])
+        mouth_score = self.calculate_mouth_score_batch(checks['mouth'])
+
+        total_score = (eyebrows_score * self.eyebrows_weight +
+                       eyes_score * self.eyes_weight +
+                       nose_score * self.nose_weight +
+                       mouth_score * self.mouth_weight)
+        return np.broadcast_to(total_score, frames).astype(np.float64)
 
     @abstractmethod
     def calculate_eyebrows_score(self, eyebrows_result: str) -> float:
@@ -47,3 +58,19 @@ class WeightedEmotionScore(EmotionScore, ABC):
     @abstractmethod
     def calculate_mouth_score(self, mouth_result: str) -> float:
         pass
+
+    @abstractmethod
+    def calculate_eyebrows_score_batch(self, eyebrows_result: dict) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def calculate_eyes_score_batch(self, eyes_result: dict) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def calculate_nose_score_batch(self, nose_result: dict) -> np.ndarray:
+        pass
+
+    @abstractmethod
+    def calculate_mouth_score_batch(self, mouth_result: dict) -> np.ndarray:
+        pass
@@ -1,5 +1,7 @@
-from typing import Dict
-from emotion_processor.emotions_recognition.features.emotion_score import EmotionScore
+from typing import Dict, List
+import numpy as np
+from emotion_processor.emotions_recognition.features.weights_emotion_score import WeightedEmotionScore
+from emotion_processor.emotions_recognition.features.frame_checks import FrameChecks
 from .emotions.suprise_score import SurpriseScore
 from .emotions.angry_score import AngryScore
 from .emotions.disgust_score import DisgustScore
@@ -11,7 +13,7 @@ from .emotions.anxiety_score import AnxietyScore
 
 class EmotionRecognition:
     def __init__(self):
-        self.emotions: Dict[str, EmotionScore] = {
+        self.emotions: Dict[str, WeightedEmotionScore] = {
             'surprise': SurpriseScore(),
             'angry': AngryScore(),
             'disgust': DisgustScore(),
@@ -21,8 +23,25 @@ class EmotionRecognition:
             'anxiety': AnxietyScore()
         }
 
+        self.frame_checks = FrameChecks()
+
     def recognize_emotion(self, processed_features: dict) -> dict:
+        # stage one: feature checks once per frame; stage two: every scorer reads the shared record
+        checks = self.frame_checks.evaluate(processed_features)
         scores = {}
         for emotion_name, emotion_score_obj in self.emotions.items():
-            scores.update(emotion_score_obj.calculate_score(processed_features))
+            scores.update(emotion_score_obj.score_checks(checks))
         return scores
+
+    @property
+    def emotion_names(self) -> List[str]:
+        return list(self.emotions.keys())
+
+    def recognize_batch(self, feature_matrix: np.ndarray) -> np.ndarray:
+        """
+        Scores a (T, len(FEATURE_NAMES)) feature matrix (see PointsProcessing.feature_matrix) in one pass.
+        Returns a (T, 7) score matrix whose columns follow `emotion_names`.
+        """
+        checks = self.frame_checks.evaluate_batch(np.asarray(feature_matrix, dtype=np.float64))
+        return np.stack([emotion_score_obj.score_checks_batch(checks)
+                         for emotion_score_obj in self.emotions.values()], axis=1)
@@ -1,22 +1,38 @@
 import numpy as np
 import cv2
 import mediapipe as mp
-from typing import Any, Tuple, List, Dict
+from typing import Any, Tuple, List, Dict, Optional
+from metrics import timed
+from emotion_processor.face_mesh.landmark_indices import (FEATURE_INDICES, FEATURE_INDEX_TABLE, FEATURE_SLICES,
+                                                         IRIS_PROXIES, LANDMARK_PROFILES, NUM_LANDMARKS)
 
 
 class FaceMeshInference:
-    def __init__(self, min_detection_confidence=0.6, min_tracking_confidence=0.6):
+    def __init__(self, min_detection_confidence=0.6, min_tracking_confidence=0.6, refine_landmarks=True):
         self.face_mesh = mp.solutions.face_mesh.FaceMesh(
             static_image_mode=False,
             max_num_faces=1,
-            refine_landmarks=True,
+            refine_landmarks=refine_landmarks,
             min_detection_confidence=min_detection_confidence,
             min_tracking_confidence=min_tracking_confidence
         )
 
-    def process(self, image: np.ndarray) -> Tuple[bool, Any]:
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        face_mesh = self.face_mesh.process(rgb_image)
+    def process(self, image: np.ndarray, roi: Optional[Tuple[int, int, int, int]] = None,
+                inference_size: Optional[int] = None) -> Tuple[bool, Any]:
+        """
+        roi: (x0, y0, x1, y1) region of the image to run on; the landmarks stay normalized to that region.
+        inference_size: if given, the region is resized to inference_size x inference_size before inference.
+        """
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            image = image[y0:y1, x0:x1]
+        if inference_size is not None and image.shape[:2] != (inference_size, inference_size):
+            with timed('roi_resize'):
+                image = cv2.resize(image, (inference_size, inference_size), interpolation=cv2.INTER_AREA)
+        with timed('cvt_color'):
+            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        with timed('mediapipe_face_mesh'):
+            face_mesh = self.face_mesh.process(rgb_image)
         return bool(face_mesh.multi_face_landmarks), face_mesh
 
 
@@ -29,60 +45,90 @@ class FaceMeshExtractor:
             'mouth': {'upper arch': [], 'lower arch': [], 'distances': []}
         }
 
-    def extract_points(self, face_image: np.ndarray, face_mesh_info: Any) -> List[List[int]]:
-        h, w, _ = face_image.shape
+    @staticmethod
+    def _region(face_image: np.ndarray, roi: Optional[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+        """(x offset, y offset, width, height) the normalized landmarks refer to."""
+        if roi is None:
+            h, w = face_image.shape[:2]
+            return 0, 0, w, h
+        x0, y0, x1, y1 = roi
+        return x0, y0, x1 - x0, y1 - y0
+
+    def extract_points(self, face_image: np.ndarray, face_mesh_info: Any,
+                       roi: Optional[Tuple[int, int, int, int]] = None) -> List[List[int]]:
+        x0, y0, w, h = self._region(face_image, roi)
         mesh_points = [
-            [i, int(pt.x * w), int(pt.y * h)]
+            [i, x0 + int(pt.x * w), y0 + int(pt.y * h)]
             for face in face_mesh_info.multi_face_landmarks
             for i, pt in enumerate(face.landmark)
         ]
+        # without iris refinement, append the eyelid-midpoint proxies so indices 468-477 stay valid
+        for i in range(len(mesh_points), NUM_LANDMARKS):
+            upper, lower = IRIS_PROXIES[i]
+            mesh_points.append([i, (mesh_points[upper][1] + mesh_points[lower][1]) // 2,
+                                (mesh_points[upper][2] + mesh_points[lower][2]) // 2])
         return mesh_points
 
+    def extract_points_array(self, face_image: np.ndarray, face_mesh_info: Any, dtype: Any = np.int16,
+                             roi: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """
+        Returns the landmarks of the first face as one contiguous (478, 2) array in pixel coordinates.
+        With an integer dtype the coordinates are truncated exactly like `extract_points` does.
+        If the inference ran on a crop, `roi` maps them back to full-frame coordinates.
+        """
+        x0, y0, w, h = self._region(face_image, roi)
+        landmarks = face_mesh_info.multi_face_landmarks[0].landmark
+        coords = np.fromiter((c for pt in landmarks for c in (pt.x, pt.y)), dtype=np.float64,
+                             count=2 * len(landmarks)).reshape(-1, 2)
+        coords *= (w, h)
+        if np.issubdtype(dtype, np.integer):
+            # truncate before the offset, like int(pt.x * w) in extract_points
+            np.trunc(coords, out=coords)
+        coords += (x0, y0)
+        return self.complete_iris(coords).astype(dtype)
+
+    @staticmethod
+    def complete_iris(coords: np.ndarray) -> np.ndarray:
+        """Pads a (468, 2) non-refined landmark array to (478, 2) with the IRIS_PROXIES eyelid midpoints."""
+        if len(coords) >= NUM_LANDMARKS:
+            return coords
+        missing = np.arange(len(coords), NUM_LANDMARKS)
+        pairs = np.array([IRIS_PROXIES[index] for index in missing])
+        return np.concatenate([coords, (coords[pairs[:, 0]] + coords[pairs[:, 1]]) / 2.0])
+
+    @staticmethod
+    def extract_feature_array(landmarks: np.ndarray) -> np.ndarray:
+        """Gathers every feature subset in one fancy-indexing call, laid out as FEATURE_SLICES."""
+        return landmarks[FEATURE_INDEX_TABLE]
+
+    @staticmethod
+    def points_view(landmarks: np.ndarray) -> Dict[str, Dict[str, List[List[int]]]]:
+        """Compatibility view: the nested dict-of-lists shape returned by the get_*_points methods."""
+        feature_points = landmarks[FEATURE_INDEX_TABLE].tolist()
+        return {
+            feature: {sub_feature: feature_points[sub_slice] for sub_feature, sub_slice in sub_slices.items()}
+            for feature, sub_slices in FEATURE_SLICES.items()
+        }
+
     def extract_feature_points(self, face_points: List[List[int]], feature_indices: dict):
         for feature, indices in feature_indices.items():
             for sub_feature, sub_indices in indices.items():
                 self.points[feature][sub_feature] = [face_points[i][1:] for i in sub_indices]
 
     def get_eyebrows_points(self, face_points: List[List[int]]) -> Dict[str, List[List[int]]]:
-        feature_indices = {
-            'eyebrows': {
-                'right arch': [143, 156, 70, 63, 105, 66, 107],
-                'left arch': [336, 296, 334, 293, 300, 383, 372],
-                'distances': [65, 468, 295, 473, 69, 66, 299, 296, 55, 8, 70, 21]
-            }
-        }
-        self.extract_feature_points(face_points, feature_indices)
+        self.extract_feature_points(face_points, {'eyebrows': FEATURE_INDICES['eyebrows']})
         return self.points['eyebrows']
 
     def get_eyes_points(self, face_points: List[List[int]]) -> Dict[str, List[List[int]]]:
-        feature_indices = {
-            'eyes': {
-                'right arch': [33, 246, 161, 160, 159, 158, 157, 173, 133],
-                'left arch': [263, 398, 384, 385, 386, 387, 388, 466, 263],
-                'distances': [159, 145, 385, 374, 145, 230, 374, 450],
-            }
-        }
-        self.extract_feature_points(face_points, feature_indices)
+        self.extract_feature_points(face_points, {'eyes': FEATURE_INDICES['eyes']})
         return self.points['eyes']
 
     def get_nose_points(self, face_points: List[List[int]]) -> Dict[str, List[List[int]]]:
-        feature_indices = {
-            'nose': {
-                'distances': [0, 13, 2, 164],
-            }
-        }
-        self.extract_feature_points(face_points, feature_indices)
+        self.extract_feature_points(face_points, {'nose': FEATURE_INDICES['nose']})
         return self.points['nose']
 
     def get_mouth_points(self, face_points: List[List[int]]) -> Dict[str, List[List[int]]]:
-        feature_indices = {
-            'mouth': {
-                'upper arch': [78, 191, 80, 81, 82, 13, 312, 311, 310, 415, 308],
-                'lower arch': [78, 95, 88, 178, 87, 14, 317, 402, 318, 324, 308],
-                'distances': [13, 14, 17, 200, 78, 186, 61, 95, 308, 410, 291, 324]
-            }
-        }
-        self.extract_feature_points(face_points, feature_indices)
+        self.extract_feature_points(face_points, {'mouth': FEATURE_INDICES['mouth']})
         return self.points['mouth']
 
 
@@ -98,27 +144,97 @@ class FaceMeshDrawer:
 
 
 class FaceMeshProcessor:
-    def __init__(self):
-        self.inference = FaceMeshInference()
+    def __init__(self, landmarks_format: str = 'dict', landmarks_dtype: Any = np.int16, roi_tracking: bool = False,
+                 roi_padding: float = 0.3, inference_size: Optional[int] = None, min_roi_size: int = 64,
+                 landmark_profile: str = 'accurate'):
+        """
+        landmarks_format: 'dict' returns the nested feature dict-of-lists (legacy shape);
+                          'array' returns the (478, 2) landmark array in pixel coordinates.
+        landmarks_dtype: dtype of the landmark array in 'array' mode (np.int16 or np.float32).
+        roi_tracking: run the face mesh only on a square crop around the previous frame's landmarks,
+                      falling back to the full frame when tracking is lost.
+        roi_padding: margin added around the previous landmark bounding box, as a fraction of its size.
+        inference_size: if given, the crop is resized to inference_size x inference_size before inference.
+        min_roi_size: smallest crop side in pixels.
+        landmark_profile: 'accurate' (iris refinement) or 'fast' (no refinement; iris points are replaced
+                          by eyelid midpoints, see IRIS_PROXIES).
+        """
+        if landmarks_format not in ('dict', 'array'):
+            raise ValueError(f"Unknown landmarks format: {landmarks_format}")
+        if landmark_profile not in LANDMARK_PROFILES:
+            raise ValueError(f"Unknown landmark profile: {landmark_profile}")
+        self.landmarks_format = landmarks_format
+        self.landmarks_dtype = landmarks_dtype
+        self.roi_tracking = roi_tracking
+        self.roi_padding = roi_padding
+        self.inference_size = inference_size
+        self.min_roi_size = min_roi_size
+        self.face_bbox: Optional[Tuple[int, int, int, int]] = None
+        self.roi: Optional[Tuple[int, int, int, int]] = None
+        self.landmark_profile = landmark_profile
+        self.inference = FaceMeshInference(refine_landmarks=LANDMARK_PROFILES[landmark_profile])
         self.extractor = FaceMeshExtractor()
         self.drawer = FaceMeshDrawer()
 
-    def process(self, face_image: np.ndarray, draw: bool = True) -> Tuple[dict, bool, np.ndarray]:
-        original_image = face_image.copy()
+    def next_roi(self, image_shape: Tuple[int, ...]) -> Optional[Tuple[int, int, int, int]]:
+        """Padded square crop around the last face bounding box, shifted to stay inside the frame."""
+        if self.face_bbox is None:
+            return None
+        h, w = image_shape[:2]
+        x0, y0, x1, y1 = self.face_bbox
+        side = int(max(x1 - x0, y1 - y0) * (1.0 + 2.0 * self.roi_padding))
+        side = min(max(side, self.min_roi_size), w, h)
+        cx, cy = (x0 + x1) // 2, (y0 + y1) // 2
+        left = min(max(cx - side // 2, 0), w - side)
+        top = min(max(cy - side // 2, 0), h - side)
+        return left, top, left + side, top + side
+
+    @staticmethod
+    def _bbox(points: np.ndarray, image_shape: Tuple[int, ...]) -> Optional[Tuple[int, int, int, int]]:
+        h, w = image_shape[:2]
+        x0, y0 = np.maximum(points.min(axis=0), 0)
+        x1, y1 = np.minimum(points.max(axis=0), (w, h))
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return int(x0), int(y0), int(x1), int(y1)
+
+    def _infer(self, face_image: np.ndarray) -> Tuple[bool, Any, Optional[Tuple[int, int, int, int]]]:
+        roi = self.next_roi(face_image.shape) if self.roi_tracking else None
+        if roi is not None:
+            success, face_mesh_info = self.inference.process(face_image, roi, self.inference_size)
+            if success:
+                return True, face_mesh_info, roi
+            # tracking lost: search the whole frame again
+            self.face_bbox = None
         success, face_mesh_info = self.inference.process(face_image)
+        return success, face_mesh_info, None
+
+    def process(self, face_image: np.ndarray, draw: bool = True) -> Tuple[Any, bool, np.ndarray]:
+        original_image = face_image.copy()
+        success, face_mesh_info, roi = self._infer(face_image)
+        self.roi = roi
         if not success:
+            self.face_bbox = None
             return {}, False, original_image
 
-        face_points = self.extractor.extract_points(face_image, face_mesh_info)
-        points = {
-            'eyebrows': self.extractor.get_eyebrows_points(face_points),
-            'eyes': self.extractor.get_eyes_points(face_points),
-            'nose': self.extractor.get_nose_points(face_points),
-            'mouth': self.extractor.get_mouth_points(face_points)
-        }
+        if self.landmarks_format == 'array':
+            points = self.extractor.extract_points_array(face_image, face_mesh_info, self.landmarks_dtype, roi)
+            landmarks = points
+        else:
+            face_points = self.extractor.extract_points(face_image, face_mesh_info, roi)
+            points = {
+                'eyebrows': self.extractor.get_eyebrows_points(face_points),
+                'eyes': self.extractor.get_eyes_points(face_points),
+                'nose': self.extractor.get_nose_points(face_points),
+                'mouth': self.extractor.get_mouth_points(face_points)
+            }
+            landmarks = np.array([point[1:] for point in face_points])
+        self.face_bbox = self._bbox(landmarks, face_image.shape)
 
         if draw:
-            self.drawer.draw(face_image, face_mesh_info)
+            # the landmarks are normalized to the crop: draw on the crop view of the frame
+            canvas = face_image if roi is None else face_image[roi[1]:roi[3], roi[0]:roi[2]]
+            self.drawer.draw(canvas, face_mesh_info)
             return points, True, face_image
 
         return points, True, original_image
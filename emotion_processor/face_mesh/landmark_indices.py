@@ -0,0 +1,55 @@
+import numpy as np
+from typing import Dict, List, Tuple
+
+
+NUM_LANDMARKS = 478
+# landmarks produced without the iris refinement model (refine_landmarks=False)
+NUM_MESH_LANDMARKS = 468
+
+# Landmark profiles: 'accurate' runs the attention/iris refinement, 'fast' skips it
+LANDMARK_PROFILES: Dict[str, bool] = {'accurate': True, 'fast': False}
+
+# In the 'fast' profile the iris landmarks do not exist; each iris point (468-472 right, 473-477 left) is
+# replaced by the midpoint of the upper and lower eyelid landmarks at the eye centre.
+IRIS_PROXIES: Dict[int, Tuple[int, int]] = {
+    **{index: (159, 145) for index in range(468, 473)},
+    **{index: (386, 374) for index in range(473, 478)},
+}
+
+FEATURE_INDICES: Dict[str, Dict[str, List[int]]] = {
+    'eyebrows': {
+        'right arch': [143, 156, 70, 63, 105, 66, 107],
+        'left arch': [336, 296, 334, 293, 300, 383, 372],
+        'distances': [65, 468, 295, 473, 69, 66, 299, 296, 55, 8, 70, 21]
+    },
+    'eyes': {
+        'right arch': [33, 246, 161, 160, 159, 158, 157, 173, 133],
+        'left arch': [263, 398, 384, 385, 386, 387, 388, 466, 263],
+        'distances': [159, 145, 385, 374, 145, 230, 374, 450],
+    },
+    'nose': {
+        'distances': [0, 13, 2, 164],
+    },
+    'mouth': {
+        'upper arch': [78, 191, 80, 81, 82, 13, 312, 311, 310, 415, 308],
+        'lower arch': [78, 95, 88, 178, 87, 14, 317, 402, 318, 324, 308],
+        'distances': [13, 14, 17, 200, 78, 186, 61, 95, 308, 410, 291, 324]
+    }
+}
+
+
+def _build_index_table(feature_indices: Dict[str, Dict[str, List[int]]]):
+    table = []
+    slices: Dict[str, Dict[str, slice]] = {}
+    for feature, sub_features in feature_indices.items():
+        slices[feature] = {}
+        for sub_feature, indices in sub_features.items():
+            slices[feature][sub_feature] = slice(len(table), len(table) + len(indices))
+            table.extend(indices)
+    return np.asarray(table, dtype=np.intp), slices
+
+
+# Every feature subset lives in one flat table, so `landmarks[FEATURE_INDEX_TABLE]` gathers all the
+# points used by the data_processing stage with a single fancy-indexing call. FEATURE_SLICES tells
+# where each sub-feature sits inside that gathered block.
+FEATURE_INDEX_TABLE, FEATURE_SLICES = _build_index_table(FEATURE_INDICES)
@@ -0,0 +1,93 @@
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+import numpy as np
+
+
+class EmotionWindow:
+    """
+    Bounded window of the most recent per-frame emotion dicts: the last `max_frames` frames and,
+    optionally, only those from the last `max_seconds`. The per-emotion average is kept incrementally.
+    Behaves like a read-only list (len, indexing, iteration) so `window[-1]` still works.
+    """
+    def __init__(self, max_frames: int = 900, max_seconds: Optional[float] = None):
+        self.max_frames = max_frames
+        self.max_seconds = max_seconds
+        self._frames: deque = deque()
+        self._timestamps: deque = deque()
+        self._sums: Dict[str, float] = {}
+        self._evictions = 0
+
+    def append(self, emotions: Dict[str, float], timestamp: Optional[float] = None):
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        self._frames.append(emotions)
+        self._timestamps.append(timestamp)
+        for emotion, score in emotions.items():
+            self._sums[emotion] = self._sums.get(emotion, 0.0) + score
+
+        while len(self._frames) > self.max_frames:
+            self._evict()
+        if self.max_seconds is not None:
+            while len(self._frames) > 1 and timestamp - self._timestamps[0] > self.max_seconds:
+                self._evict()
+
+    def _evict(self):
+        emotions = self._frames.popleft()
+        self._timestamps.popleft()
+        for emotion, score in emotions.items():
+            self._sums[emotion] -= score
+        # re-sum from scratch once per window length to stop floating-point drift (amortized O(1))
+        self._evictions += 1
+        if self._evictions >= len(self._frames):
+            self._evictions = 0
+            self._sums = {}
+            for frame in self._frames:
+                for emotion, score in frame.items():
+                    self._sums[emotion] = self._sums.get(emotion, 0.0) + score
+
+    def mean(self) -> Dict[str, float]:
+        if not self._frames:
+            return {}
+        count = len(self._frames)
+        return {emotion: self._sums[emotion] / count for emotion in self._frames[0]}
+
+    def clear(self):
+        self._frames.clear()
+        self._timestamps.clear()
+        self._sums = {}
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __getitem__(self, index: int) -> Dict[str, float]:
+        return self._frames[index]
+
+    def __iter__(self):
+        return iter(self._frames)
+
+
+class LandmarkRing:
+    """Preallocated ring of the last `capacity` landmark arrays, stored compactly as int16."""
+    def __init__(self, capacity: int = 30, shape: Tuple[int, int] = (478, 2), dtype=np.int16):
+        self.capacity = capacity
+        self._buffer = np.zeros((capacity,) + tuple(shape), dtype=dtype)
+        self._next = 0
+        self._count = 0
+
+    def append(self, landmarks: np.ndarray):
+        self._buffer[self._next] = landmarks
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def latest(self) -> Optional[np.ndarray]:
+        if not self._count:
+            return None
+        return self._buffer[self._next - 1]
+
+    def ordered(self) -> np.ndarray:
+        """Copy of the stored landmarks, oldest first: (len, 478, 2)."""
+        return np.roll(self._buffer, -self._next, axis=0)[self.capacity - self._count:]
+
+    def __len__(self) -> int:
+        return self._count
@@ -1,13 +1,42 @@
+import os
+import time
 import numpy as np
+from typing import Dict, Optional
 from emotion_processor.face_mesh.face_mesh_processor import FaceMeshProcessor
 from emotion_processor.data_processing.main import PointsProcessing
 from emotion_processor.emotions_recognition.main import EmotionRecognition
+from emotion_processor.frame_buffers import EmotionWindow, LandmarkRing
+from emotion_processor.scheduler import AnalysisScheduler
+from emotion_processor.motion_gate import MotionGate
 from emotion_normalizer import EmotionNormalizer
 from emotion_history import EmotionHistory
+from metrics import timed
 
 class EmotionRecognitionSystem:
-    def __init__(self):
-        self.face_mesh = FaceMeshProcessor()
+    def __init__(self, history_max_frames: int = 900, history_max_seconds: Optional[float] = None,
+                 landmarks_max_frames: int = 30, analysis_hz: Optional[float] = None,
+                 analyze_every_n_frames: int = 1, adaptive_rate: bool = True, frame_budget: float = 1.0 / 30.0,
+                 roi_tracking: bool = False, inference_size: Optional[int] = None, motion_gating: bool = False,
+                 motion_threshold: float = 2.0, max_static_frames: int = 30, landmark_profile: str = 'accurate'):
+        """
+        history_max_frames / history_max_seconds: límite de la ventana reciente de emociones
+            (últimos N frames y, opcionalmente, últimos N segundos) usada por summarize_emotions.
+        landmarks_max_frames: cuántos arrays de landmarks (int16) recientes se conservan.
+        analysis_hz / analyze_every_n_frames: frecuencia objetivo de análisis (p. ej. 10 Hz) o
+            analizar uno de cada k frames. Los frames omitidos reutilizan el último resultado.
+        adaptive_rate / frame_budget: si el análisis tarda más que frame_budget (segundos), se
+            reduce la frecuencia automáticamente y se recupera cuando vuelve a haber margen.
+        roi_tracking / inference_size: ejecutar el face mesh solo sobre un recorte alrededor de la cara
+            del frame anterior (opcionalmente redimensionado a inference_size x inference_size).
+        motion_gating / motion_threshold / max_static_frames: si la región de la cara casi no cambió
+            respecto al último frame analizado (diferencia media en niveles de gris < motion_threshold),
+            se reutilizan los landmarks y emociones anteriores, como máximo max_static_frames seguidos.
+        landmark_profile: 'accurate' (con refinamiento de iris) o 'fast' (sin refinamiento, más liviano
+            para equipos de bajo consumo; las distancias ceja-ojo usan el centro de los párpados).
+        """
+        self.face_mesh = FaceMeshProcessor(landmarks_format='array', landmarks_dtype=np.int16,
+                                           roi_tracking=roi_tracking, inference_size=inference_size,
+                                           landmark_profile=landmark_profile)
         self.data_processing = PointsProcessing()
         self.emotions_recognition = EmotionRecognition()
         
@@ -15,46 +44,94 @@ class EmotionRecognitionSystem:
         self.emotion_normalizer = EmotionNormalizer()
         self.emotion_history = EmotionHistory()
         
-        self.emotion_history_list = []
-        self.landmarks_history = []
+        # Buffers acotados: la memoria no crece con el tiempo de funcionamiento
+        self.emotion_history_list = EmotionWindow(history_max_frames, history_max_seconds)
+        self.landmarks_history = LandmarkRing(landmarks_max_frames)
         self.frame_count = 0
 
+        # Frecuencia de análisis desacoplada de la de captura/visualización
+        self.scheduler = AnalysisScheduler(analysis_hz, analyze_every_n_frames, adaptive_rate, frame_budget)
+        self.skipped_frames = 0
+        self.motion_gate = MotionGate(motion_threshold, max_static_frames=max_static_frames) if motion_gating else None
+
     def frame_processing(self, face_image: np.ndarray):
+        # Frames fuera de la frecuencia de análisis: se reutiliza el último resultado
+        if not self.scheduler.should_analyze():
+            self.skipped_frames += 1
+            return face_image
+
+        start = time.perf_counter()
+        try:
+            with timed('frame_analysis'):
+                return self._analyze_frame(face_image)
+        finally:
+            self.scheduler.record(time.perf_counter() - start)
+
+    def _analyze_frame(self, face_image: np.ndarray):
+        # Cara estática respecto al último frame analizado: se reutiliza el resultado sin inferencia
+        if self.motion_gate is not None and self.emotion_history_list and self.motion_gate.is_static(face_image):
+            self._record_emotions(self.emotion_history_list[-1], self.landmarks_history.latest())
+            return face_image
+
         # Procesar sin dibujar (draw=False)
         face_points, control_process, original_image = self.face_mesh.process(face_image, draw=False)
-        
+
+        if self.motion_gate is not None:
+            if control_process:
+                self.motion_gate.update(face_image, self.face_mesh.face_bbox)
+            else:
+                self.motion_gate.reset()
+
         if control_process:
             # Procesar características faciales
-            processed_features = self.data_processing.main(face_points)
+            with timed('points_processing'):
+                processed_features = self.data_processing.main(face_points)
             
             # Reconocer emociones (scores crudos)
-            raw_emotions = self.emotions_recognition.recognize_emotion(processed_features)
+            with timed('recognize_emotion'):
+                raw_emotions = self.emotions_recognition.recognize_emotion(processed_features)
             
             # Normalizar emociones para evitar conflictos
-            normalized_emotions = self.emotion_normalizer.normalize(raw_emotions)
-            
-            # Agregar al historial
-            self.emotion_history_list.append(normalized_emotions)
-            self.landmarks_history.append(face_points)
-            self.frame_count += 1
-            
-            # Registrar en historial de grabación si está activo
-            self.emotion_history.add_frame(normalized_emotions, self.frame_count)
+            with timed('normalize'):
+                normalized_emotions = self.emotion_normalizer.normalize(raw_emotions)
             
+            self._record_emotions(normalized_emotions, face_points)
+
             # Devolver la imagen original sin visualización de emociones
             return original_image
         else:
             return face_image
 
+    def _record_emotions(self, emotions, face_points):
+        # Agregar al historial
+        self.emotion_history_list.append(emotions)
+        self.landmarks_history.append(face_points)
+        self.frame_count += 1
+
+        # Registrar en historial de grabación si está activo
+        self.emotion_history.add_frame(emotions, self.frame_count)
+
     def start_recording(self):
         """Inicia la grabación del historial de emociones."""
         self.emotion_history.start_recording()
+        # Las métricas de omisión por movimiento se cuentan por sesión
+        if self.motion_gate is not None:
+            self.motion_gate.reset_metrics()
         
     def stop_recording(self):
         """Detiene la grabación y retorna el resumen."""
         self.emotion_history.stop_recording()
         return self.emotion_history.get_summary()
     
+    def add_utterance(self, text: str, start_clock: float, end_clock: float, words=None):
+        """Registra un enunciado transcrito; los tiempos (y los de `words`) son de time.perf_counter()."""
+        history = self.emotion_history
+        if history.start_time is None:
+            return
+        if words is not None:
+            words = [(word, history.elapsed_at(start), history.elapsed_at(end)) for word, start, end in words]
+        history.add_utterance(text, history.elapsed_at(start_clock), history.elapsed_at(end_clock), words)
+    
     def save_history(self, filename: str = None):
         """Guarda el historial en un archivo."""
         return self.emotion_history.save_to_file(filename)
@@ -63,6 +140,18 @@ class EmotionRecognitionSystem:
         """Obtiene un resumen del estado actual."""
         return self.emotion_history.get_summary()
 
+    def get_analysis_stats(self):
+        """Estadísticas del planificador de análisis (frames analizados, backoff, duración media)."""
+        stats = self.scheduler.get_stats()
+        stats['skipped_frames'] = self.skipped_frames
+        if self.motion_gate is not None:
+            motion = self.motion_gate.get_metrics()
+            stats['motion_frames_checked'] = motion['frames_checked']
+            stats['motion_skipped_frames'] = motion['frames_skipped']
+            stats['motion_skip_ratio'] = motion['skip_ratio']
+            stats['motion_energy'] = motion['last_energy']
+        return stats
+
     def get_current_emotions(self):
         """Obtiene las emociones actuales sin mostrarlas visualmente."""
         if not self.emotion_history_list:
@@ -70,7 +159,7 @@ class EmotionRecognitionSystem:
         return self.emotion_history_list[-1]
 
     def summarize_emotions(self):
-        """Resumen de emociones (método existente, ahora con normalización)."""
+        """Resumen de las emociones de la ventana reciente (promedio mantenido incrementalmente)."""
         if not self.emotion_history_list:
             return {
                 "facial_emotions": {
@@ -81,11 +170,8 @@ class EmotionRecognitionSystem:
                 }
             }
 
-        # Calcular promedio de emociones normalizadas
-        emotions_avg = {}
-        for emotion in self.emotion_history_list[0].keys():
-            scores = [frame[emotion] for frame in self.emotion_history_list]
-            emotions_avg[emotion] = sum(scores) / len(scores)
+        # Promedio de emociones normalizadas en la ventana
+        emotions_avg = self.emotion_history_list.mean()
 
         # Emoción dominante
         dominant_emotion, confidence = self.emotion_normalizer.get_dominant_emotion(emotions_avg)
@@ -93,8 +179,9 @@ class EmotionRecognitionSystem:
         # Top 2 emociones
         top_emotions = sorted(emotions_avg, key=emotions_avg.get, reverse=True)[:2]
 
-        # Últimos landmarks
-        landmarks = self.landmarks_history[-1] if self.landmarks_history else {}
+        # Últimos landmarks (vista dict de compatibilidad)
+        latest_landmarks = self.landmarks_history.latest()
+        landmarks = self.face_mesh.extractor.points_view(latest_landmarks) if latest_landmarks is not None else {}
 
         return {
             "facial_emotions": {
@@ -104,6 +191,29 @@ class EmotionRecognitionSystem:
                 "landmarks": landmarks
             }
         }
+
+
+def options_from_env() -> Dict:
+    """
+    Argumentos de EmotionRecognitionSystem para las apps, tomados del entorno.
+    Sin variables se usan los valores por defecto del constructor (se analiza cada frame).
+    FACESENSE_ANALYSIS_HZ: frecuencia de análisis (p. ej. 10); el historial de la sesión registra
+        solo los frames analizados, así que total_frames y las transiciones cambian.
+    FACESENSE_ROI_TRACKING=1: face mesh sobre el recorte de la cara, reducido a
+        FACESENSE_INFERENCE_SIZE píxeles (256 por defecto).
+    FACESENSE_MOTION_GATING=1: con la cara quieta se reutiliza el último resultado; esos frames
+        quedan en el historial como copia de la fila anterior.
+    """
+    options = {}
+    analysis_hz = os.environ.get('FACESENSE_ANALYSIS_HZ')
+    if analysis_hz:
+        options['analysis_hz'] = float(analysis_hz)
+    if os.environ.get('FACESENSE_ROI_TRACKING', '0') == '1':
+        options['roi_tracking'] = True
+        options['inference_size'] = int(os.environ.get('FACESENSE_INFERENCE_SIZE', '256'))
+    if os.environ.get('FACESENSE_MOTION_GATING', '0') == '1':
+        options['motion_gating'] = True
+    return options
         
         
         
@@ -0,0 +1,66 @@
+from typing import Dict, Optional, Tuple
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Cheap pre-check before the face mesh: the face ROI of the last analyzed frame is kept as a small
+    grayscale thumbnail, and a new frame is considered static when the mean absolute difference of its
+    thumbnail over the same ROI stays below `threshold` (gray levels). After `max_static_frames`
+    consecutive skips a full analysis is forced so slow drifts are still picked up.
+    """
+    def __init__(self, threshold: float = 2.0, sample_size: int = 32, max_static_frames: int = 30):
+        self.threshold = threshold
+        self.sample_size = sample_size
+        self.max_static_frames = max_static_frames
+        self._reference: Optional[np.ndarray] = None
+        self._roi: Optional[Tuple[int, int, int, int]] = None
+        self._static_run = 0
+        self.last_energy: Optional[float] = None
+        self.reset_metrics()
+
+    def _thumbnail(self, image: np.ndarray, roi: Optional[Tuple[int, int, int, int]]) -> np.ndarray:
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            image = image[y0:y1, x0:x1]
+        small = cv2.resize(image, (self.sample_size, self.sample_size), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+
+    def is_static(self, image: np.ndarray) -> bool:
+        """True when the frame barely differs from the last analyzed one and its results can be reused."""
+        self.frames_checked += 1
+        if self._reference is None or self._static_run >= self.max_static_frames:
+            return False
+        self.last_energy = float(cv2.absdiff(self._thumbnail(image, self._roi), self._reference).mean())
+        if self.last_energy >= self.threshold:
+            return False
+        self._static_run += 1
+        self.frames_skipped += 1
+        return True
+
+    def update(self, image: np.ndarray, roi: Optional[Tuple[int, int, int, int]]):
+        """Stores the frame that was just analyzed (and its face ROI) as the new reference."""
+        if roi is not None and (roi[2] <= roi[0] or roi[3] <= roi[1]):
+            roi = None
+        self._roi = roi
+        self._reference = self._thumbnail(image, roi)
+        self._static_run = 0
+
+    def reset(self):
+        """Drops the reference, e.g. when the face is lost."""
+        self._reference = None
+        self._roi = None
+        self._static_run = 0
+
+    def reset_metrics(self):
+        self.frames_checked = 0
+        self.frames_skipped = 0
+
+    def get_metrics(self) -> Dict[str, Optional[float]]:
+        return {
+            'frames_checked': self.frames_checked,
+            'frames_skipped': self.frames_skipped,
+            'skip_ratio': self.frames_skipped / self.frames_checked if self.frames_checked else 0.0,
+            'last_energy': self.last_energy,
+        }
@@ -0,0 +1,95 @@
+import time
+from typing import Dict, Optional
+
+
+class AnalysisScheduler:
+    """
+    Decides which captured frames go through the full analysis pipeline. The base rate is either a target
+    frequency (`target_hz`) or every k-th frame (`every_n_frames`); on top of it a backoff multiplier grows
+    while the smoothed analysis time exceeds `frame_budget` and shrinks again once it is well below it.
+    """
+    def __init__(self, target_hz: Optional[float] = None, every_n_frames: int = 1, adaptive: bool = True,
+                 frame_budget: float = 1.0 / 30.0, max_backoff: int = 8, smoothing: float = 0.2,
+                 recover_ratio: float = 0.5, jitter_tolerance: float = 0.05):
+        if target_hz is not None and target_hz <= 0:
+            raise ValueError("target_hz must be positive")
+        if every_n_frames < 1:
+            raise ValueError("every_n_frames must be >= 1")
+        self.target_hz = target_hz
+        self.every_n_frames = every_n_frames
+        self.adaptive = adaptive
+        self.frame_budget = frame_budget
+        self.max_backoff = max_backoff
+        self.smoothing = smoothing
+        self.recover_ratio = recover_ratio
+        self.jitter_tolerance = jitter_tolerance
+
+        self.backoff = 1
+        self.average_duration: Optional[float] = None
+        self.frames_seen = 0
+        self.frames_analyzed = 0
+        self._frames_since_analysis = 0
+        self._last_analysis: Optional[float] = None
+
+    @property
+    def interval(self) -> Optional[float]:
+        """Current minimum time between analyses, or None in every-k-th-frame mode."""
+        if self.target_hz is None:
+            return None
+        return self.backoff / self.target_hz
+
+    @property
+    def stride(self) -> int:
+        """Current number of frames per analysis in every-k-th-frame mode."""
+        return self.every_n_frames * self.backoff
+
+    def should_analyze(self, timestamp: Optional[float] = None) -> bool:
+        """Call once per captured frame; True when this frame must be analyzed."""
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        self.frames_seen += 1
+        self._frames_since_analysis += 1
+
+        if self._last_analysis is None:
+            due = True
+        elif self.target_hz is not None:
+            # small tolerance so capture jitter does not push the analysis one whole frame later
+            due = timestamp - self._last_analysis >= self.interval * (1.0 - self.jitter_tolerance)
+        else:
+            due = self._frames_since_analysis >= self.stride
+
+        if due:
+            self._last_analysis = timestamp
+            self._frames_since_analysis = 0
+            self.frames_analyzed += 1
+        return due
+
+    def record(self, duration: float):
+        """Reports how long the last analysis took and adapts the backoff multiplier."""
+        if self.average_duration is None:
+            self.average_duration = duration
+        else:
+            self.average_duration += self.smoothing * (duration - self.average_duration)
+
+        if not self.adaptive:
+            return
+        if self.average_duration > self.frame_budget and self.backoff < self.max_backoff:
+            self.backoff += 1
+        elif self.average_duration < self.frame_budget * self.recover_ratio and self.backoff > 1:
+            self.backoff -= 1
+
+    def reset(self):
+        self.backoff = 1
+        self.average_duration = None
+        self._frames_since_analysis = 0
+        self._last_analysis = None
+
+    def get_stats(self) -> Dict[str, Optional[float]]:
+        return {
+            'frames_seen': self.frames_seen,
+            'frames_analyzed': self.frames_analyzed,
+            'analysis_ratio': self.frames_analyzed / self.frames_seen if self.frames_seen else 0.0,
+            'average_duration': self.average_duration,
+            'backoff': self.backoff,
+            'interval': self.interval,
+            'stride': self.stride,
+        }
@@ -1,7 +1,14 @@
+import time
+from threading import Thread, Condition
 import cv2
+import numpy as np
 
 class Camera:
-    def __init__(self, index: int, width: int, height: int):
+    def __init__(self, index: int, width: int, height: int, threaded: bool = False):
+        """
+        threaded: si es True, un hilo de fondo lee la cámara continuamente y solo conserva el
+                  frame más reciente (con su timestamp de captura) en un buffer preasignado.
+        """
         self.cap = None
         backends = [
             (cv2.CAP_V4L2, "V4L2"),
@@ -24,16 +31,98 @@ class Camera:
         self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
         self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
 
-    def read(self):
-        if self.cap is None or not self.cap.isOpened():
-            print("Error: Camera not accessible")
-            return False, None
+        self.threaded = False
+        self.frame_seq = 0                 # frames capturados por el hilo de fondo
+        self.frame_timestamp = None        # time.monotonic() de captura del frame más reciente
+        self.last_read_timestamp = None    # timestamp de captura del último frame entregado por read()
+        self._read_seq = 0
+        self._grabbing = False
+        self._grabber = None
+        self._condition = Condition()
+        self._front = None
+        self._back = None
+        if threaded:
+            self.start_grabber()
+
+    def start_grabber(self):
+        """Inicia el hilo que mantiene solo el frame más reciente."""
+        if self._grabbing:
+            return
         ret, frame = self.cap.read()
         if not ret:
-            print("Error: Cannot read frame from camera")
-        return ret, frame
+            raise Exception("Cannot read first frame from camera")
+        self._front = frame
+        self._back = np.empty_like(frame)
+        self.frame_timestamp = time.monotonic()
+        self.frame_seq = 1
+        self._grabbing = True
+        self.threaded = True
+        self._grabber = Thread(target=self._grab_loop, daemon=True)
+        self._grabber.start()
+
+    def _grab_loop(self):
+        while self._grabbing:
+            ret, frame = self.cap.read(self._back)
+            timestamp = time.monotonic()
+            if not ret:
+                time.sleep(0.005)
+                continue
+            with self._condition:
+                # read() puede reasignar si cambia el tamaño; el buffer anterior se reutiliza como back
+                self._front, self._back = frame, self._front
+                self.frame_timestamp = timestamp
+                self.frame_seq += 1
+                self._condition.notify_all()
+
+    def read(self, block: bool = True, timeout: float = 1.0):
+        """
+        Sin hilo: lectura síncrona como antes.
+        Con hilo: entrega una copia del frame más reciente. Con block=True solo espera si el
+        consumidor ya recibió ese frame (va más rápido que la cámara); con block=False nunca espera.
+        Si no llegó un frame nuevo (timeout o block=False) retorna (False, None): el frame ya
+        entregado no se repite como si fuera nuevo.
+        """
+        if not self.threaded:
+            if self.cap is None or not self.cap.isOpened():
+                print("Error: Camera not accessible")
+                return False, None
+            ret, frame = self.cap.read()
+            if not ret:
+                print("Error: Cannot read frame from camera")
+            else:
+                self.last_read_timestamp = time.monotonic()
+            return ret, frame
+
+        with self._condition:
+            if block:
+                self._condition.wait_for(lambda: self.frame_seq > self._read_seq or not self._grabbing,
+                                         timeout=timeout)
+            if not self._grabbing or self._front is None or self.frame_seq == self._read_seq:
+                return False, None
+            self._read_seq = self.frame_seq
+            self.last_read_timestamp = self.frame_timestamp
+            return True, self._front.copy()
+
+    def read_with_timestamp(self, block: bool = True, timeout: float = 1.0):
+        """Como read(), pero también retorna el timestamp (time.monotonic) de captura del frame."""
+        ret, frame = self.read(block, timeout)
+        return ret, frame, self.last_read_timestamp
+
+    def frame_age(self, timestamp: float = None) -> float:
+        """Segundos transcurridos desde la captura (por defecto, del último frame entregado)."""
+        timestamp = self.last_read_timestamp if timestamp is None else timestamp
+        return time.monotonic() - timestamp if timestamp is not None else 0.0
+
+    def stop_grabber(self):
+        if self._grabbing:
+            with self._condition:
+                self._grabbing = False
+                self._condition.notify_all()
+            self._grabber.join(timeout=1.0)
+        self.threaded = False
 
     def release(self):
+        self.stop_grabber()
         if self.cap is not None and self.cap.isOpened():
             self.cap.release()
-            print("Camera released")
\ No newline at end of file
+            print("Camera released")
@@ -0,0 +1,130 @@
+import os
+import time
+from typing import Optional, Sequence, Union
+import cv2
+import numpy as np
+from examples.camera import Camera
+
+
+class ArrayCapture:
+    """Minimal cv2.VideoCapture look-alike over a sequence of frames already in memory."""
+    def __init__(self, frames: Union[np.ndarray, Sequence[np.ndarray]], fps: float = 30.0):
+        self.frames = frames
+        self.fps = fps
+        self.position = 0
+        self.opened = len(frames) > 0
+
+    def isOpened(self) -> bool:
+        return self.opened
+
+    def read(self, image: Optional[np.ndarray] = None):
+        if not self.opened or self.position >= len(self.frames):
+            return False, None
+        frame = self.frames[self.position]
+        self.position += 1
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+        return True, frame.copy()
+
+    def get(self, prop: int) -> float:
+        if not len(self.frames):
+            return 0.0
+        height, width = self.frames[0].shape[:2]
+        return {
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_FRAME_WIDTH: width,
+            cv2.CAP_PROP_FRAME_HEIGHT: height,
+            cv2.CAP_PROP_FRAME_COUNT: len(self.frames),
+            cv2.CAP_PROP_POS_FRAMES: self.position,
+        }.get(prop, 0.0)
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            self.position = int(value)
+            return True
+        return False
+
+    def release(self):
+        self.opened = False
+
+
+class ReplaySource:
+    def __init__(self, source: Union[str, np.ndarray, Sequence[np.ndarray]], realtime: bool = True,
+                 loop: bool = False, fps: Optional[float] = None, preload: bool = False):
+        """
+        Fuente de video determinista con la misma interfaz que Camera (read, release, cap.get).
+        source: ruta de un video o secuencia/array (N, H, W, 3) de frames BGR.
+        realtime: True entrega los frames al ritmo del fps del clip; False, tan rápido como se pidan.
+        loop: volver al inicio al terminar el clip.
+        fps: fps de reproducción (por defecto el del archivo, o 30 para arrays).
+        preload: decodificar todo el archivo a memoria para excluir la decodificación de las mediciones.
+        """
+        if isinstance(source, str):
+            self.cap = cv2.VideoCapture(source)
+            if not self.cap.isOpened():
+                raise Exception(f"Cannot open replay source: {source}")
+            if preload:
+                frames = []
+                while True:
+                    ret, frame = self.cap.read()
+                    if not ret:
+                        break
+                    frames.append(frame)
+                clip_fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+                self.cap.release()
+                self.cap = ArrayCapture(frames, clip_fps)
+        else:
+            self.cap = ArrayCapture(source, fps or 30.0)
+        self.fps = fps or self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.realtime = realtime
+        self.loop = loop
+        self.frames_read = 0
+        self.last_read_timestamp = None
+        self._start = None
+
+    def read(self):
+        if self.realtime:
+            now = time.monotonic()
+            if self._start is None:
+                self._start = now
+            delay = self._start + self.frames_read / self.fps - now
+            if delay > 0:
+                time.sleep(delay)
+
+        ret, frame = self.cap.read()
+        if not ret and self.loop and self.frames_read:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            return False, None
+        self.frames_read += 1
+        self.last_read_timestamp = time.monotonic()
+        return True, frame
+
+    @property
+    def finished(self) -> bool:
+        """True cuando el clip terminó y no se repite."""
+        return not self.loop and self.cap.get(cv2.CAP_PROP_POS_FRAMES) >= self.cap.get(cv2.CAP_PROP_FRAME_COUNT)
+
+    def frame_age(self, timestamp: float = None) -> float:
+        timestamp = self.last_read_timestamp if timestamp is None else timestamp
+        return time.monotonic() - timestamp if timestamp is not None else 0.0
+
+    def release(self):
+        self.cap.release()
+        print("Replay source released")
+
+
+def open_video_source(index: int, width: int, height: int, threaded: bool = False):
+    """
+    Cámara en vivo o, si FACESENSE_VIDEO_SOURCE apunta a un video, su reproducción.
+    FACESENSE_REPLAY_MODE: 'realtime' (por defecto) o 'fast'; FACESENSE_REPLAY_LOOP=1 repite el clip.
+    """
+    source = os.environ.get('FACESENSE_VIDEO_SOURCE')
+    if not source:
+        return Camera(index, width, height, threaded=threaded)
+    realtime = os.environ.get('FACESENSE_REPLAY_MODE', 'realtime') != 'fast'
+    loop = os.environ.get('FACESENSE_REPLAY_LOOP', '0') == '1'
+    print(f"Replaying {source} ({'realtime' if realtime else 'fast'}{', loop' if loop else ''})")
+    return ReplaySource(source, realtime=realtime, loop=loop)
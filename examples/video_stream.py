@@ -1,9 +1,17 @@
+"""
+Demo en ventana: reconocimiento de emociones sobre la cámara (o FACESENSE_VIDEO_SOURCE).
+Sin flags usa los valores por defecto de EmotionRecognitionSystem (face mesh sobre el frame completo).
+
+    python examples/video_stream.py --roi-tracking --inference-size 256
+"""
+import argparse
 import os
 import sys
 import cv2
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from emotion_processor.main import EmotionRecognitionSystem
-from camera import Camera
+from examples.camera import Camera
+from examples.replay import open_video_source
 
 
 class VideoStream:
@@ -28,8 +36,15 @@ class VideoStream:
 
 
 if __name__ == "__main__":
-    camera = Camera(0, 1280, 720)
-    emotion_recognition_system = EmotionRecognitionSystem()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--roi-tracking', action='store_true', help="face mesh solo sobre el recorte de la cara")
+    parser.add_argument('--inference-size', type=int, default=None,
+                        help="lado en píxeles al que se reduce el recorte (requiere --roi-tracking)")
+    args = parser.parse_args()
+
+    camera = open_video_source(0, 1280, 720)
+    emotion_recognition_system = EmotionRecognitionSystem(roi_tracking=args.roi_tracking,
+                                                          inference_size=args.inference_size)
     video_stream = VideoStream(camera, emotion_recognition_system)
     video_stream.run()
 
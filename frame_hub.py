@@ -0,0 +1,130 @@
+"""
+Hub de frames de un solo productor para /video_feed
+"""
+import time
+from threading import Event, Thread, Condition
+from typing import Callable, Optional, Tuple
+import cv2
+import numpy as np
+from metrics import timed
+
+
+class FrameHub:
+    """
+    Un único hilo lee la cámara, ejecuta el pipeline de análisis y publica el último frame
+    procesado junto con sus bytes JPEG. Cualquier número de clientes MJPEG se suscribe y
+    recibe el mismo frame sin volver a calcular nada.
+
+    El productor arranca con el primer suscriptor y se detiene cuando sale el último: sin clientes
+    no se captura ni se analiza nada.
+    """
+
+    def __init__(self, camera, process_frame: Callable[[np.ndarray], np.ndarray]):
+        """
+        Args:
+            camera: Fuente con read() -> (ret, frame), como examples.camera.Camera
+            process_frame: Función que recibe el frame BGR y retorna el frame a publicar
+        """
+        self.camera = camera
+        self.process_frame = process_frame
+        self.running = False
+        self._thread: Optional[Thread] = None
+        self._stop_event = Event()
+        self._condition = Condition()
+        self._seq = 0
+        self._frame: Optional[np.ndarray] = None
+        self._jpeg: Optional[bytes] = None
+        self.subscribers = 0
+        # Segundos entre la captura del frame y la publicación de su resultado
+        self.glass_to_result_lag: Optional[float] = None
+
+    def start(self):
+        """Inicia el hilo productor (idempotente)."""
+        with self._condition:
+            if self.running:
+                return
+            self.running = True
+            # Cada productor tiene su propia señal de parada; el nuevo espera a que el anterior termine
+            previous = self._thread
+            self._stop_event = Event()
+            self._thread = Thread(target=self._run, args=(self._stop_event, previous), daemon=True)
+            self._thread.start()
+        print("📡 FrameHub iniciado")
+
+    def stop(self):
+        """Detiene el hilo productor y despierta a los suscriptores."""
+        with self._condition:
+            self._halt()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+    def _halt(self):
+        # Llamar con self._condition tomado
+        if self.running:
+            print("📡 FrameHub detenido")
+        self.running = False
+        self._stop_event.set()
+        self._condition.notify_all()
+
+    def _run(self, stop_event: Event, previous: Optional[Thread]):
+        if previous is not None:
+            previous.join()
+        while not stop_event.is_set():
+            ret, frame = self.camera.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+
+            capture_timestamp = getattr(self.camera, 'last_read_timestamp', None)
+            try:
+                processed_frame = self.process_frame(frame)
+                with timed('imencode'):
+                    ret, buffer = cv2.imencode('.jpg', processed_frame)
+                if not ret:
+                    continue
+                self._publish(processed_frame, buffer.tobytes())
+                if capture_timestamp is not None:
+                    self.glass_to_result_lag = time.monotonic() - capture_timestamp
+            except Exception as e:
+                print(f"❌ Error en frame: {e}")
+                continue
+
+    def _publish(self, frame: np.ndarray, jpeg: bytes):
+        with self._condition:
+            self._frame = frame
+            self._jpeg = jpeg
+            self._seq += 1
+            self._condition.notify_all()
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray], Optional[bytes]]:
+        """Retorna (secuencia, frame procesado, JPEG) del último frame publicado."""
+        with self._condition:
+            return self._seq, self._frame, self._jpeg
+
+    def wait_for_frame(self, last_seq: int, timeout: float = 1.0) -> Tuple[int, Optional[bytes]]:
+        """Bloquea hasta que haya un frame más nuevo que last_seq (o timeout)."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._seq > last_seq or not self.running, timeout=timeout)
+            return self._seq, self._jpeg
+
+    def subscribe(self):
+        """Generador MJPEG: entrega cada frame nuevo publicado por el productor."""
+        with self._condition:
+            self.subscribers += 1
+        self.start()
+        last_seq = 0
+        try:
+            while self.running:
+                seq, jpeg = self.wait_for_frame(last_seq)
+                if seq == last_seq or jpeg is None:
+                    continue
+                last_seq = seq
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+        finally:
+            with self._condition:
+                self.subscribers -= 1
+                if self.subscribers == 0:
+                    # Sin clientes: el productor termina tras el frame en curso
+                    self._halt()
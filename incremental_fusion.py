@@ -0,0 +1,141 @@
+"""
+Fusión incremental de texto y rostro por enunciado
+"""
+import time
+from queue import Queue
+from threading import Thread
+from typing import Dict, List, Optional
+from metrics import timed, observe
+
+
+class IncrementalFusion:
+    """
+    Clasifica cada enunciado en cuanto se transcribe y lo fusiona con las emociones faciales de su
+    misma ventana de tiempo (EmotionHistory.window_statistics). Un hilo propio hace el trabajo, así
+    la transcripción no espera al clasificador.
+
+    El resultado de la sesión se mantiene al día: promedios de texto y rostro ponderados por la
+    duración de cada enunciado y su fusión. `finalize` solo espera a los enunciados pendientes.
+    """
+
+    def __init__(self, text_classifier, fusion_engine, face_system):
+        """
+        Args:
+            text_classifier: TextEmotionClassifier (classify(text) -> {'emotions': ...})
+            fusion_engine: EmotionFusion
+            face_system: EmotionRecognitionSystem cuyo historial da las emociones de cada ventana
+        """
+        self.text_classifier = text_classifier
+        self.fusion_engine = fusion_engine
+        self.face_system = face_system
+        self._queue = Queue()
+        self._thread: Optional[Thread] = None
+        self._reset()
+
+    def _reset(self):
+        self.utterances: List[Dict] = []
+        self.latest: Optional[Dict] = None   # fusión acumulada de la sesión
+        self._text_sums: Dict[str, float] = {}
+        self._text_weight = 0.0
+        self._face_sums: Dict[str, float] = {}
+        self._face_weight = 0.0
+
+    def start(self):
+        """Inicia una sesión nueva y el hilo de fusión."""
+        if self._thread is not None:
+            self.finalize()
+        self._reset()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, utterance):
+        """Encola un enunciado (speech_recognizer.Utterance); pensado como SpeechRecognizer.on_utterance."""
+        if self._thread is not None:
+            self._queue.put(utterance)
+
+    def finalize(self) -> Dict:
+        """
+        Espera los enunciados pendientes, detiene el hilo y retorna el resultado de la sesión:
+        text_result (mismo formato que TextEmotionClassifier.classify), face_emotions,
+        fusion_result (mismo formato que EmotionFusion.fuse) y la lista de enunciados fusionados.
+        El estado se limpia al terminar: sin una sesión iniciada con `start`, el resultado está vacío.
+        """
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        result = self.get_result()
+        self._reset()
+        return result
+
+    def get_result(self) -> Dict:
+        text_emotions = self._means(self._text_sums, self._text_weight)
+        if text_emotions:
+            primary = max(text_emotions, key=text_emotions.get)
+            text_result = {"emotions": text_emotions, "primary_emotion": primary,
+                           "confidence": text_emotions[primary]}
+        else:
+            text_result = {"emotions": {}, "primary_emotion": "neutral", "confidence": 0.0}
+        return {
+            "text_result": text_result,
+            "face_emotions": self._means(self._face_sums, self._face_weight),
+            "fusion_result": self.latest,
+            "utterances": list(self.utterances),
+        }
+
+    def _run(self):
+        while True:
+            utterance = self._queue.get()
+            if utterance is None:
+                return
+            try:
+                self._process(utterance)
+            except Exception as e:
+                print(f"❌ Error en fusión del enunciado: {e}")
+
+    def _process(self, utterance):
+        start = time.perf_counter()
+        with timed('text_classification'):
+            text_result = self.text_classifier.classify(utterance.text)
+
+        # Ventana facial del enunciado, en el eje de tiempo del historial
+        history = self.face_system.emotion_history
+        self.face_system.add_utterance(utterance.text, utterance.start, utterance.end, utterance.words)
+        window = history.window_statistics(history.elapsed_at(utterance.start), history.elapsed_at(utterance.end))
+        face_emotions = window['mean'] if window['frames'] else {"neutral": 50.0}
+
+        fusion_result = self.fusion_engine.fuse(text_result['emotions'], face_emotions)
+
+        # Acumulados de la sesión, ponderados por duración
+        weight = max(utterance.end - utterance.start, 1e-3)
+        self._accumulate(self._text_sums, text_result['emotions'], weight)
+        self._text_weight += weight
+        if window['frames']:
+            self._accumulate(self._face_sums, window['mean'], weight)
+            self._face_weight += weight
+        self.latest = self.fusion_engine.fuse(
+            self._means(self._text_sums, self._text_weight),
+            self._means(self._face_sums, self._face_weight) or {"neutral": 50.0}
+        )
+
+        self.utterances.append({
+            "text": utterance.text,
+            "start_time": round(history.elapsed_at(utterance.start), 3),
+            "end_time": round(history.elapsed_at(utterance.end), 3),
+            "text_result": text_result,
+            "face_window": window,
+            "fusion_result": fusion_result,
+        })
+        observe('utterance_fusion', time.perf_counter() - start)
+        print(f"🔀 Enunciado fusionado: {fusion_result['primary_emotion']} ({utterance.text[:40]})")
+
+    @staticmethod
+    def _accumulate(sums: Dict[str, float], values: Dict[str, float], weight: float):
+        for emotion, value in values.items():
+            sums[emotion] = sums.get(emotion, 0.0) + weight * float(value)
+
+    @staticmethod
+    def _means(sums: Dict[str, float], weight: float) -> Dict[str, float]:
+        if weight <= 0:
+            return {}
+        return {emotion: value / weight for emotion, value in sums.items()}
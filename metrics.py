@@ -0,0 +1,162 @@
+"""
+Histogramas de latencia por etapa y exposición en formato de texto de Prometheus.
+
+    from metrics import timed
+    with timed('face_mesh'):
+        ...
+
+Con las métricas desactivadas (FACESENSE_METRICS=0 o set_enabled(False)) `timed` retorna un
+context manager vacío compartido: el costo por llamada es una comparación y una llamada a función.
+"""
+import os
+import time
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+
+# Límites (segundos) de los buckets: desde 0.1 ms (etapas por frame) hasta 30 s (LLM, Whisper)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Histograma acumulativo de duraciones con buckets fijos (seguro entre hilos)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # el último es +Inf
+        self.total = 0.0
+        self.count = 0
+        self._lock = Lock()
+
+    def observe(self, seconds: float):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts, total, count = list(self.counts), self.total, self.count
+        cumulative, running = [], 0
+        for bucket_count in counts:
+            running += bucket_count
+            cumulative.append(running)
+        return {'buckets': self.buckets, 'cumulative': cumulative, 'sum': total, 'count': count}
+
+
+class _Timer:
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry: 'MetricsRegistry', stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """Conjunto de histogramas por etapa, creados al observar la etapa por primera vez."""
+
+    def __init__(self, enabled: bool = True, buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 namespace: str = 'facesense'):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = Lock()
+
+    def timed(self, stage: str):
+        """Context manager que registra la duración del bloque en el histograma de `stage`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage: str, seconds: float):
+        if not self.enabled:
+            return
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, Histogram(self.buckets))
+        histogram.observe(seconds)
+
+    def stages(self) -> List[str]:
+        return sorted(self._histograms)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Conteo y latencia media (ms) por etapa."""
+        result = {}
+        for stage in self.stages():
+            snapshot = self._histograms[stage].snapshot()
+            count = snapshot['count']
+            result[stage] = {
+                'count': count,
+                'mean_ms': round(snapshot['sum'] / count * 1e3, 3) if count else 0.0,
+            }
+        return result
+
+    def render_prometheus(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        """Texto de exposición de Prometheus (histograma por etapa y gauges opcionales)."""
+        name = f"{self.namespace}_stage_latency_seconds"
+        lines = [f"# HELP {name} Latencia por etapa del pipeline.", f"# TYPE {name} histogram"]
+        for stage in self.stages():
+            snapshot = self._histograms[stage].snapshot()
+            for bound, cumulative in zip(snapshot['buckets'], snapshot['cumulative']):
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {snapshot["cumulative"][-1]}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {snapshot["sum"]:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {snapshot["count"]}')
+        for gauge, value in (gauges or {}).items():
+            if value is None:
+                continue
+            gauge_name = f"{self.namespace}_{gauge}"
+            lines.append(f"# TYPE {gauge_name} gauge")
+            lines.append(f"{gauge_name} {float(value):g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+
+# Registro global usado por el pipeline y las apps Flask
+REGISTRY = MetricsRegistry(enabled=os.environ.get('FACESENSE_METRICS', '1') != '0')
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def timed(stage: str):
+    return REGISTRY.timed(stage)
+
+
+def observe(stage: str, seconds: float):
+    REGISTRY.observe(stage, seconds)
+
+
+def set_enabled(enabled: bool):
+    REGISTRY.enabled = enabled
+
+
+def render_prometheus(gauges: Optional[Dict[str, float]] = None) -> str:
+    return REGISTRY.render_prometheus(gauges)
@@ -0,0 +1,229 @@
+"""
+Re-análisis offline de sesiones grabadas (session_videos/*.avi) en paralelo.
+
+El video se divide en rangos de frames que se reparten en un pool de procesos; cada proceso tiene su
+propio FaceMeshProcessor y motor de emociones, decodifica solo su rango y puntúa todos sus frames en
+lote. Los resultados se reensamblan en orden en un EmotionHistory, así que el resumen tiene el mismo
+formato que el de una sesión en vivo.
+
+    python offline_analysis.py session_videos/*.avi --workers 8 --output-dir analisis/
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import cv2
+import numpy as np
+from emotion_history import EmotionHistory
+
+# Estado de cada proceso del pool (se crea una sola vez por proceso en _init_worker)
+_worker = None
+
+
+@dataclass
+class VideoAnalysis:
+    """Resultado del análisis de un video: scores normalizados por frame con cara detectada."""
+    video_path: str
+    fps: float
+    total_frames: int
+    emotion_names: List[str]
+    frame_numbers: np.ndarray  # (N,) índice del frame en el video
+    scores: np.ndarray         # (N, emociones) scores normalizados
+    history: EmotionHistory = field(repr=False)
+
+    def get_summary(self) -> Dict:
+        summary = self.history.get_summary()
+        summary['offline_analysis'] = {
+            'video_path': self.video_path,
+            'fps': self.fps,
+            'total_frames': self.total_frames,
+            'frames_with_face': int(len(self.frame_numbers)),
+        }
+        return summary
+
+
+def _init_worker(landmark_profile: str):
+    """Crea el pipeline facial del proceso (MediaPipe no se comparte entre procesos)."""
+    global _worker
+    from emotion_processor.face_mesh.face_mesh_processor import FaceMeshProcessor
+    from emotion_processor.data_processing.main import PointsProcessing
+    from emotion_processor.emotions_recognition.main import EmotionRecognition
+    from emotion_normalizer import EmotionNormalizer
+
+    recognition = EmotionRecognition()
+    _worker = {
+        'face_mesh': FaceMeshProcessor(landmarks_format='array', landmarks_dtype=np.int16,
+                                       landmark_profile=landmark_profile),
+        'data_processing': PointsProcessing(),
+        'recognition': recognition,
+        'normalizer': EmotionNormalizer(),
+        'emotion_names': recognition.emotion_names,
+    }
+
+
+def _analyze_range(task: Tuple[str, int, int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Analiza los frames [start, stop) del video, uno de cada `stride`.
+    Retorna (números de frame con cara, scores normalizados).
+    """
+    video_path, start, stop, stride = task
+    face_mesh = _worker['face_mesh']
+    face_mesh.face_bbox = None
+
+    cap = cv2.VideoCapture(video_path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    if position != start:
+        # el backend no permite posicionarse: avanzar sin decodificar
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        for _ in range(start):
+            cap.grab()
+
+    frame_numbers, landmarks = [], []
+    for frame_number in range(start, stop):
+        if (frame_number - start) % stride:
+            if not cap.grab():
+                break
+            continue
+        ret, frame = cap.read()
+        if not ret:
+            break
+        points, success, _ = face_mesh.process(frame, draw=False)
+        if success:
+            frame_numbers.append(frame_number)
+            landmarks.append(points)
+    cap.release()
+
+    n_emotions = len(_worker['emotion_names'])
+    if not landmarks:
+        return np.empty(0, dtype=np.int32), np.empty((0, n_emotions), dtype=np.float32)
+
+    features = _worker['data_processing'].feature_matrix(np.stack(landmarks))
+    raw_scores = _worker['recognition'].recognize_batch(features)
+    scores = _worker['normalizer'].normalize_batch(raw_scores, _worker['emotion_names'])
+    return np.asarray(frame_numbers, dtype=np.int32), scores.astype(np.float32)
+
+
+def _video_info(video_path: str) -> Tuple[float, int]:
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"No se pudo abrir el video: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 20.0
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if total_frames <= 0:
+        # contenedor sin conteo de frames: contarlos sin decodificar
+        total_frames = 0
+        while cap.grab():
+            total_frames += 1
+    cap.release()
+    return fps, total_frames
+
+
+def _split(video_path: str, total_frames: int, chunk_size: int, stride: int) -> List[Tuple[str, int, int, int]]:
+    # los rangos empiezan en múltiplos de stride para muestrear los mismos frames que un solo proceso
+    chunk_size = max(stride, chunk_size - chunk_size % stride)
+    return [(video_path, start, min(start + chunk_size, total_frames), stride)
+            for start in range(0, total_frames, chunk_size)]
+
+
+def build_history(frame_numbers: np.ndarray, scores: np.ndarray, emotion_names: List[str],
+                  fps: float, total_frames: int) -> EmotionHistory:
+    """EmotionHistory con el tiempo de cada frame tomado del video (frame / fps)."""
+    history = EmotionHistory(initial_capacity=len(frame_numbers))
+    history.start_recording()
+    for frame_number, row in zip(frame_numbers.tolist(), scores.tolist()):
+        history.add_frame(dict(zip(emotion_names, row)), frame_number, elapsed_seconds=frame_number / fps)
+    history.stop_recording()
+    history.end_time = history.start_time + timedelta(seconds=total_frames / fps)
+    return history
+
+
+def analyze_videos(video_paths: Iterable[str], workers: Optional[int] = None, chunk_size: int = 300,
+                   stride: int = 1, landmark_profile: str = 'accurate') -> List[VideoAnalysis]:
+    """
+    Analiza varios videos compartiendo un único pool: los rangos de todos los videos se reparten
+    entre los procesos, de modo que los núcleos no quedan ociosos al terminar un video corto.
+
+    Args:
+        video_paths: Rutas de los videos
+        workers: Número de procesos (por defecto, os.cpu_count())
+        chunk_size: Frames por tarea
+        stride: Analizar uno de cada `stride` frames
+        landmark_profile: 'accurate' o 'fast' (ver FaceMeshProcessor)
+    """
+    from emotion_processor.emotions_recognition.main import EmotionRecognition
+
+    emotion_names = EmotionRecognition().emotion_names
+    videos = []
+    tasks = []
+    for video_path in video_paths:
+        fps, total_frames = _video_info(video_path)
+        video_tasks = _split(video_path, total_frames, chunk_size, stride)
+        videos.append((video_path, fps, total_frames, len(video_tasks)))
+        tasks.extend(video_tasks)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(landmark_profile,)) as executor:
+        # map conserva el orden de las tareas: los rangos se reensamblan tal cual
+        results = list(executor.map(_analyze_range, tasks))
+
+    analyses = []
+    offset = 0
+    for video_path, fps, total_frames, n_tasks in videos:
+        video_results = results[offset:offset + n_tasks]
+        offset += n_tasks
+        frame_numbers = np.concatenate([r[0] for r in video_results]) if video_results else np.empty(0, np.int32)
+        scores = (np.concatenate([r[1] for r in video_results]) if video_results
+                  else np.empty((0, len(emotion_names)), np.float32))
+        history = build_history(frame_numbers, scores, emotion_names, fps, total_frames)
+        analyses.append(VideoAnalysis(video_path, fps, total_frames, emotion_names, frame_numbers, scores, history))
+    return analyses
+
+
+def analyze_video(video_path: str, **kwargs) -> VideoAnalysis:
+    """Analiza un solo video (mismos argumentos que analyze_videos)."""
+    return analyze_videos([video_path], **kwargs)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('videos', nargs='*', help="videos a analizar (por defecto session_videos/*.avi)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=300)
+    parser.add_argument('--stride', type=int, default=1, help="analizar uno de cada N frames")
+    parser.add_argument('--profile', choices=['accurate', 'fast'], default='accurate')
+    parser.add_argument('--output-dir', default=None, help="carpeta para los resúmenes JSON")
+    args = parser.parse_args()
+
+    videos = args.videos or sorted(glob.glob('session_videos/*.avi'))
+    if not videos:
+        raise SystemExit("No hay videos para analizar")
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    analyses = analyze_videos(videos, workers=args.workers, chunk_size=args.chunk_size,
+                              stride=args.stride, landmark_profile=args.profile)
+    elapsed = time.perf_counter() - start
+
+    total_frames = 0
+    for analysis in analyses:
+        total_frames += analysis.total_frames
+        output_dir = args.output_dir or os.path.dirname(analysis.video_path)
+        name = os.path.splitext(os.path.basename(analysis.video_path))[0]
+        filename = os.path.join(output_dir, f"{name}_emotions.json")
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(analysis.get_summary(), f, indent=2, ensure_ascii=False)
+        print(f"🎞️ {analysis.video_path}: {len(analysis.frame_numbers)}/{analysis.total_frames} frames con cara "
+              f"-> {filename}")
+    print(f"✅ {len(analyses)} videos, {total_frames} frames en {elapsed:.1f}s "
+          f"({total_frames / elapsed:.1f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
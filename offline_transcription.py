@@ -0,0 +1,217 @@
+"""
+Transcripción offline de audio grabado (WAV o arreglo) con un pool de procesos.
+
+El audio se segmenta en enunciados con el mismo VAD que la captura en vivo (voice_activity); los
+segmentos se agrupan en lotes que se reparten entre procesos, cada uno con su propio modelo Whisper,
+y se reensamblan en orden. El texto se une igual que SpeechRecognizer.get_all_text y cada enunciado
+conserva su inicio y fin. Se reporta el factor de tiempo real (segundos de proceso por segundo de audio).
+
+    python offline_transcription.py grabaciones/*.wav --model medium --workers 2 --output-dir transcripciones/
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Iterable, List, Optional, Tuple, Union
+import numpy as np
+from streaming_transcription import run_whisper, words_from_result
+from voice_activity import find_utterances, read_wav
+
+SAMPLE_RATE = 16000
+
+# Estado de cada proceso del pool (se crea una sola vez por proceso en _init_worker)
+_worker = None
+
+
+@dataclass
+class TranscriptSegment:
+    """Enunciado transcrito; start/end en segundos desde el inicio del audio."""
+    text: str
+    start: float
+    end: float
+    words: Optional[List[Tuple[str, float, float]]] = None
+
+
+@dataclass
+class AudioTranscription:
+    source: str
+    audio_seconds: float
+    speech_seconds: float
+    processing_seconds: float
+    segments: List[TranscriptSegment]
+
+    @property
+    def text(self) -> str:
+        return " ".join(segment.text for segment in self.segments if segment.text)
+
+    @property
+    def real_time_factor(self) -> float:
+        """Segundos de proceso por segundo de audio (< 1: más rápido que tiempo real)."""
+        return self.processing_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'text': self.text,
+            'audio_seconds': round(self.audio_seconds, 2),
+            'speech_seconds': round(self.speech_seconds, 2),
+            'processing_seconds': round(self.processing_seconds, 2),
+            'real_time_factor': round(self.real_time_factor, 4),
+            'segments': [asdict(segment) for segment in self.segments],
+        }
+
+
+def _init_worker(model_size: str, device: Optional[str], threads: int):
+    """Carga el modelo Whisper del proceso; los hilos de torch se reparten entre los procesos."""
+    global _worker
+    import torch
+    import whisper
+
+    torch.set_num_threads(threads)
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    _worker = {'model': whisper.load_model(model_size, device=device), 'device': device}
+
+
+def _transcribe_batch(task: Tuple[List[np.ndarray], bool]) -> List[Tuple[str, Optional[list]]]:
+    """Transcribe un lote de segmentos; retorna (texto, palabras con tiempos relativos al segmento)."""
+    segments, word_timestamps = task
+    results = []
+    for audio in segments:
+        result = run_whisper(_worker['model'], audio, _worker['device'], word_timestamps)
+        words = words_from_result(result) if word_timestamps else None
+        results.append((result["text"].strip(), words))
+    return results
+
+
+def resample(audio: np.ndarray, sample_rate: int, target_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Remuestreo lineal (suficiente para voz) a la frecuencia de Whisper."""
+    if sample_rate == target_rate:
+        return audio.astype(np.float32, copy=False)
+    duration = len(audio) / sample_rate
+    positions = np.arange(int(duration * target_rate)) * (sample_rate / target_rate)
+    return np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+
+def _load(source: Union[str, np.ndarray], sample_rate: int) -> Tuple[str, np.ndarray]:
+    if isinstance(source, str):
+        audio, sample_rate = read_wav(source)
+        return source, resample(audio, sample_rate)
+    return '<array>', resample(np.asarray(source, dtype=np.float32).reshape(-1), sample_rate)
+
+
+def transcribe_sources(sources: Iterable[Union[str, np.ndarray]], sample_rate: int = SAMPLE_RATE,
+                       model_size: str = "medium", workers: Optional[int] = None, batch_seconds: float = 60.0,
+                       word_timestamps: bool = False, device: Optional[str] = None,
+                       silence_duration: float = 1.5, max_duration: float = 30.0,
+                       min_audio_length: float = 0.5) -> List[AudioTranscription]:
+    """
+    Transcribe varios audios compartiendo un único pool: los lotes de todos los audios se reparten
+    entre los procesos.
+
+    Args:
+        sources: Rutas de WAV (PCM 16 bits) o arreglos float mono en [-1, 1]
+        sample_rate: Frecuencia de los arreglos (los WAV usan la de su cabecera)
+        model_size: Modelo Whisper ('base', 'small', 'medium', 'large', ...)
+        workers: Procesos del pool (por defecto, 2: cada uno carga su propio modelo)
+        batch_seconds: Segundos de voz aproximados por tarea
+        word_timestamps: Incluir los tiempos de cada palabra
+        device: 'cpu' o 'cuda' (por defecto, cuda si está disponible)
+        silence_duration, max_duration: Segmentación en enunciados (ver UtteranceSegmenter)
+        min_audio_length: Segmentos más cortos se descartan, como en SpeechRecognizer
+    """
+    workers = workers or 2
+    start_time = time.perf_counter()
+    audios = []
+    tasks = []
+    for source in sources:
+        name, audio = _load(source, sample_rate)
+        spans = [(start, end) for start, end in find_utterances(audio, SAMPLE_RATE, silence_duration, max_duration)
+                 if end - start >= min_audio_length * SAMPLE_RATE]
+
+        # lotes contiguos de ~batch_seconds de voz; las vistas se serializan al enviarse al pool
+        batches, batch, batch_samples = [], [], 0
+        for start, end in spans:
+            batch.append(audio[start:end])
+            batch_samples += end - start
+            if batch_samples >= batch_seconds * SAMPLE_RATE:
+                batches.append(batch)
+                batch, batch_samples = [], 0
+        if batch:
+            batches.append(batch)
+
+        audios.append((name, audio, spans, len(batches)))
+        tasks.extend((batch, word_timestamps) for batch in batches)
+
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_size, device, threads)) as executor:
+        # map conserva el orden de las tareas: los segmentos se reensamblan tal cual
+        results = list(executor.map(_transcribe_batch, tasks))
+    processing_seconds = time.perf_counter() - start_time
+
+    total_audio = sum(len(audio) for _, audio, _, _ in audios) or 1
+    transcriptions = []
+    offset = 0
+    for name, audio, spans, n_batches in audios:
+        texts = [item for batch in results[offset:offset + n_batches] for item in batch]
+        offset += n_batches
+        segments = []
+        for (start, end), (text, words) in zip(spans, texts):
+            start_seconds = start / SAMPLE_RATE
+            if words is not None:
+                words = [(word, round(start_seconds + t0, 3), round(start_seconds + t1, 3)) for word, t0, t1 in words]
+            segments.append(TranscriptSegment(text, start_seconds, end / SAMPLE_RATE, words))
+        # el tiempo del pool compartido se reparte en proporción a la duración de cada audio
+        transcriptions.append(AudioTranscription(
+            source=name,
+            audio_seconds=len(audio) / SAMPLE_RATE,
+            speech_seconds=sum(end - start for start, end in spans) / SAMPLE_RATE,
+            processing_seconds=processing_seconds * len(audio) / total_audio,
+            segments=segments,
+        ))
+    return transcriptions
+
+
+def transcribe(source: Union[str, np.ndarray], **kwargs) -> AudioTranscription:
+    """Transcribe un solo WAV o arreglo (mismos argumentos que transcribe_sources)."""
+    return transcribe_sources([source], **kwargs)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('audios', nargs='+', help="archivos WAV a transcribir")
+    parser.add_argument('--model', default='medium')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-seconds', type=float, default=60.0)
+    parser.add_argument('--device', choices=['cpu', 'cuda'], default=None)
+    parser.add_argument('--word-timestamps', action='store_true')
+    parser.add_argument('--output-dir', default=None, help="carpeta para las transcripciones JSON")
+    args = parser.parse_args()
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    transcriptions = transcribe_sources(args.audios, model_size=args.model, workers=args.workers,
+                                        batch_seconds=args.batch_seconds, word_timestamps=args.word_timestamps,
+                                        device=args.device)
+    elapsed = time.perf_counter() - start
+
+    total_audio = 0.0
+    for transcription in transcriptions:
+        total_audio += transcription.audio_seconds
+        output_dir = args.output_dir or os.path.dirname(transcription.source)
+        name = os.path.splitext(os.path.basename(transcription.source))[0]
+        filename = os.path.join(output_dir, f"{name}_transcript.json")
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(transcription.to_dict(), f, indent=2, ensure_ascii=False)
+        print(f"📝 {transcription.source}: {len(transcription.segments)} enunciados, "
+              f"{transcription.speech_seconds:.1f}s de voz en {transcription.audio_seconds:.1f}s -> {filename}")
+    print(f"✅ {len(transcriptions)} audios, {total_audio:.1f}s de audio en {elapsed:.1f}s "
+          f"(factor de tiempo real {elapsed / max(total_audio, 1e-9):.3f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 # openrouter_therapist.py
 import requests
 import json
+from metrics import timed
 
 class OpenRouterTherapist:
     def __init__(self, api_key: str = None, model: str = "meta-llama/llama-3-8b-instruct:free"):
@@ -61,7 +62,8 @@ INSTRUCCIONES:
         }
 
         try:
-            response = requests.post(self.url, headers=self.headers, json=payload, timeout=30)
+            with timed('llm_request'):
+                response = requests.post(self.url, headers=self.headers, json=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
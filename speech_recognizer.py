@@ -1,19 +1,73 @@
 """
 Reconocedor de voz con Whisper - Transcribe cuando dejas de hablar
 """
+import os
 import whisper
 import sounddevice as sd
 import numpy as np
+from dataclasses import dataclass
 from threading import Thread
-from queue import Queue
+from queue import Queue, Empty, Full
+from typing import Dict, List, Optional
 import torch
 import time
+from metrics import timed, observe
+from audio_ring_buffer import AudioRingBuffer
+from audio_recorder import AudioRecorder
+from voice_activity import VoiceActivityDetector, UtteranceSegmenter
+from streaming_transcription import StreamingTranscript, Word, run_whisper, words_from_result
+
+
+@dataclass
+class TranscriptionJob:
+    """Segmento de audio entregado por el hilo de VAD al hilo de transcripción."""
+    kind: str              # 'partial' (ventana de un enunciado en curso) o 'final' (fin del enunciado)
+    utterance: int         # número de enunciado en la sesión
+    position: int          # posición absoluta en el buffer circular de la primera muestra del enunciado
+    audio: Optional[np.ndarray]  # vista del buffer circular desde el inicio del enunciado; None si ya
+                                 # estaba sobrescrito al encolar
+    enqueued_at: float     # time.monotonic() al encolar
+    start: Optional[float] = None  # time.perf_counter() de la primera muestra del enunciado
+
+
+@dataclass
+class Utterance:
+    """Enunciado transcrito con sus tiempos en el reloj time.perf_counter() (el de EmotionHistory)."""
+    text: str
+    start: float
+    end: float
+    words: Optional[List[Word]] = None  # (palabra, inicio, fin) en el mismo reloj, si se pidieron
+
+
+def speech_options_from_env() -> Dict:
+    """
+    Argumentos de SpeechRecognizer para las apps, tomados del entorno (por defecto, los del constructor).
+    FACESENSE_STREAMING: '1' activa las transcripciones parciales (una pasada de Whisper extra por
+        segundo de voz), 'auto' solo si hay GPU; por defecto '0'.
+    FACESENSE_WORD_TIMESTAMPS=1: guarda los tiempos de cada palabra de los enunciados.
+    """
+    streaming = os.environ.get('FACESENSE_STREAMING', '0')
+    return {
+        'streaming': streaming == '1' or (streaming == 'auto' and torch.cuda.is_available()),
+        'word_timestamps': os.environ.get('FACESENSE_WORD_TIMESTAMPS', '0') == '1',
+    }
+
 
 class SpeechRecognizer:
-    def __init__(self, model_size="base"):
+    def __init__(self, model_size="base", streaming=False, stream_interval=1.0, max_window=20.0,
+                 max_pending_jobs=8, buffer_seconds=120.0, max_utterance=30.0, word_timestamps=False):
         """
         Inicializa el reconocedor con Whisper
         model_size: 'tiny', 'base', 'small', 'medium', 'large'
+        streaming: transcribir ventanas parciales mientras el usuario sigue hablando; las palabras
+                   estables se confirman y al final solo queda por decodificar el último tramo
+        stream_interval: segundos de audio nuevo entre transcripciones parciales
+        max_window: segundos máximos sin confirmar antes de aceptar la hipótesis vigente
+        max_pending_jobs: capacidad de la cola entre el hilo de VAD y el de transcripción
+        buffer_seconds: capacidad del buffer circular de audio; debe cubrir el enunciado más largo
+                        más el audio que aún espera en la cola de transcripción
+        max_utterance: duración máxima de un enunciado antes de cortarlo y transcribirlo
+        word_timestamps: guardar los tiempos de cada palabra en los enunciados (get_utterances)
         """
         print("🎤 Cargando modelo Whisper...")
         
@@ -23,19 +77,50 @@ class SpeechRecognizer:
         # Configuración de audio
         self.sample_rate = 16000
         self.channels = 1
+        self.block_size = 2048
         
         # Configuración de detección de voz
-        self.silence_threshold = 0.01  # Umbral de energía para considerar silencio
+        # VAD con piso de ruido adaptativo: solo el audio con voz llega a Whisper
+        self.vad = VoiceActivityDetector(self.sample_rate)
         self.silence_duration = 1.5    # Segundos de silencio para considerar que terminaste de hablar
+        self.max_utterance = max_utterance
         self.min_audio_length = 0.5    # Mínimo de audio en segundos para procesar
+        self.segmenter = UtteranceSegmenter(self.vad, self.silence_duration, self.max_utterance)
+        
+        # Transcripción incremental
+        self.streaming = streaming
+        self.stream_interval = stream_interval
+        self.max_window = max_window
+        self.word_timestamps = word_timestamps
+        self.transcript = StreamingTranscript()
+        self._samples_since_partial = 0
+        self._committed_samples = 0    # audio del enunciado en curso ya confirmado por el worker
+        
+        # Buffer circular escrito por el callback del micrófono (sin copias por bloque)
+        self.ring = AudioRingBuffer(buffer_seconds, self.sample_rate)
+        # Grabación opcional de la sesión a WAV, desde el mismo buffer y en su propio hilo
+        self.recorder = AudioRecorder(self.ring)
+        self.last_recording = None
         
         # Colas y estado
-        self.audio_queue = Queue()
         self.text_queue = Queue()
+        self.utterances: List[Utterance] = []
+        self.on_utterance = None       # callback(Utterance) desde el hilo de transcripción
+        # Cola acotada VAD -> transcripción; un único worker la consume en orden (FIFO)
+        self.job_queue = Queue(maxsize=max_pending_jobs)
         self.is_listening = False
-        self.audio_buffer = []
         self.is_speaking = False
-        self.last_sound_time = None
+        self._read_position = 0        # siguiente muestra del buffer circular a analizar
+        self._utterance = 0
+        self._process_thread = None
+        self._worker_thread = None
+        
+        # Métricas de la transcripción
+        self.last_transcription_lag = None
+        self.dropped_partial_jobs = 0
+        self.stale_jobs = 0            # trabajos cuyo audio se sobrescribió antes de transcribirse
+        self.audio_overruns = 0
+        self.decoded_audio_seconds = 0.0
         
         # Detectar si hay GPU disponible
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
@@ -47,31 +132,39 @@ class SpeechRecognizer:
         Limpia completamente el historial de texto y audio
         Llamar esto antes de iniciar una nueva sesión
         """
-        # Limpiar cola de texto
-        while not self.text_queue.empty():
-            try:
-                self.text_queue.get_nowait()
-            except:
-                break
+        # Limpiar colas de texto y trabajos pendientes
+        for queue in (self.text_queue, self.job_queue):
+            while True:
+                try:
+                    queue.get_nowait()
+                except Empty:
+                    break
+                if queue is self.job_queue:
+                    queue.task_done()
         
-        # Limpiar cola de audio
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except:
-                break
-        
-        # Limpiar buffer de audio
-        self.audio_buffer = []
+        # Limpiar enunciados y buffer de audio
+        self.utterances = []
+        self.ring.reset()
+        self._read_position = 0
+        self.segmenter = UtteranceSegmenter(self.vad, self.silence_duration, self.max_utterance)
+        self.transcript.reset()
+        self._samples_since_partial = 0
+        self._committed_samples = 0
+        self._utterance = 0
         
         # Resetear estado de voz
         self.is_speaking = False
-        self.last_sound_time = None
+        self.decoded_audio_seconds = 0.0
         
         print("🔄 Sesión de voz reseteada - Todo el historial limpiado")
     
-    def start_listening(self):
-        """Inicia captura de voz - LIMPIA EL HISTORIAL AUTOMÁTICAMENTE"""
+    def start_listening(self, audio_path=None, audio_start_clock=None):
+        """
+        Inicia captura de voz - LIMPIA EL HISTORIAL AUTOMÁTICAMENTE
+        audio_path: si se indica, el audio del micrófono también se guarda en este WAV (16 kHz)
+        audio_start_clock: time.perf_counter() que corresponde al segundo 0 del WAV
+                           (p. ej. EmotionHistory.start_clock, para alinear audio e historial)
+        """
         if self.is_listening:
             return
         
@@ -79,24 +172,42 @@ class SpeechRecognizer:
         self.reset_session()
         
         self.is_listening = True
+        self.last_recording = None
+        if audio_path:
+            self.recorder.start(audio_path, audio_start_clock)
+        
+        # Thread de transcripción (consume la cola de trabajos)
+        self._worker_thread = Thread(target=self._transcription_worker, daemon=True)
+        self._worker_thread.start()
         
         # Thread para capturar audio
         capture_thread = Thread(target=self._capture_audio, daemon=True)
         capture_thread.start()
         
-        # Thread para procesar audio
-        process_thread = Thread(target=self._process_audio, daemon=True)
-        process_thread.start()
+        # Thread para procesar audio (VAD)
+        self._process_thread = Thread(target=self._process_audio, daemon=True)
+        self._process_thread.start()
         
         print("🔴 Escuchando... (Sesión nueva)")
     
     def stop_listening(self):
-        """Detiene captura"""
+        """Detiene captura y espera a que se transcriba el audio pendiente"""
+        if not self.is_listening:
+            return
         self.is_listening = False
         
-        # Procesar audio restante si hay
-        if self.audio_buffer:
-            self._transcribe_buffer()
+        # El hilo de VAD termina y entrega el enunciado en curso como trabajo final
+        if self._process_thread is not None:
+            self._process_thread.join()
+        
+        # Esperar a que el worker vacíe la cola (en modo streaming, solo falta el tramo sin confirmar)
+        self.job_queue.join()
+        self.job_queue.put(None)
+        if self._worker_thread is not None:
+            self._worker_thread.join()
+        
+        if self.recorder.is_recording:
+            self.last_recording = self.recorder.stop()
         
         print("⏹️  Voz detenida")
     
@@ -115,11 +226,32 @@ class SpeechRecognizer:
         
         return result
     
+    def get_utterances(self) -> List[Utterance]:
+        """Enunciados de la sesión actual, en orden, con sus tiempos de inicio y fin"""
+        return list(self.utterances)
+    
+    def get_partial_text(self):
+        """Texto del enunciado en curso: palabras confirmadas más la hipótesis parcial."""
+        return " ".join(filter(None, [self.transcript.committed_text, self.transcript.partial_text]))
+    
+    def get_metrics(self):
+        """Audio pendiente de analizar, profundidad de la cola y retardo de la última transcripción (segundos)."""
+        return {
+            'audio_backlog_seconds': (self.ring.written - self._read_position) / self.sample_rate,
+            'audio_overruns': self.audio_overruns,
+            'job_queue_depth': self.job_queue.qsize(),
+            'last_transcription_lag': self.last_transcription_lag,
+            'dropped_partial_jobs': self.dropped_partial_jobs,
+            'stale_jobs': self.stale_jobs,
+            'decoded_audio_seconds': self.decoded_audio_seconds,
+            'noise_floor_db': self.vad.noise_floor_db,
+        }
+    
     def _audio_callback(self, indata, frames, time_info, status):
         """Callback para capturar audio del micrófono"""
         if status:
             print(f"⚠️  Estado: {status}")
-        self.audio_queue.put(indata.copy())
+        self.ring.write(indata)
     
     def _capture_audio(self):
         """Captura audio del micrófono"""
@@ -129,97 +261,183 @@ class SpeechRecognizer:
             samplerate=self.sample_rate,
             channels=self.channels,
             callback=self._audio_callback,
-            blocksize=2048
+            dtype='float32',
+            blocksize=self.block_size
         ):
             print("✅ Listo para escuchar")
             while self.is_listening:
                 sd.sleep(100)
     
-    def _calculate_energy(self, audio_chunk):
-        """Calcula la energía del audio para detectar voz"""
-        return np.sqrt(np.mean(audio_chunk.astype(np.float32) ** 2))
-    
     def _process_audio(self):
-        """Procesa audio y transcribe cuando detecta silencio"""
+        """Detecta inicio y fin de voz y entrega los enunciados al hilo de transcripción"""
         while self.is_listening:
+            block_end = self._read_position + self.block_size
+            # Espera bloqueante; el timeout solo sirve para notar el fin de la escucha
+            if not self.ring.wait_for(block_end, timeout=0.1):
+                continue
+            
             try:
-                if not self.audio_queue.empty():
-                    chunk = self.audio_queue.get()
-                    audio_flat = chunk.flatten()
-                    
-                    # Calcular energía del chunk actual
-                    energy = self._calculate_energy(audio_flat)
-                    current_time = time.time()
-                    
-                    # Detectar si hay voz
-                    if energy > self.silence_threshold:
-                        # Hay voz
-                        if not self.is_speaking:
-                            self.is_speaking = True
-                            print("🎙️  Detectado inicio de voz...")
-                        
-                        self.audio_buffer.append(audio_flat)
-                        self.last_sound_time = current_time
-                    
-                    else:
-                        # Silencio detectado
-                        if self.is_speaking:
-                            # Si estábamos hablando, agregamos el silencio al buffer
-                            self.audio_buffer.append(audio_flat)
-                            
-                            # Verificar si ha pasado suficiente tiempo de silencio
-                            if self.last_sound_time and (current_time - self.last_sound_time) >= self.silence_duration:
-                                print("⏸️  Silencio detectado, transcribiendo...")
-                                self._transcribe_buffer()
-                                self.is_speaking = False
-                                self.audio_buffer = []
-                                self.last_sound_time = None
+                if self._read_position < self.ring.oldest:
+                    # El análisis quedó más de una vuelta atrás: se pierde el audio sobrescrito
+                    self.audio_overruns += 1
+                    print("⚠️  Buffer de audio desbordado, descartando audio antiguo")
+                    self._read_position = self.ring.oldest
+                    self.segmenter.reset(self._read_position)
+                    self.is_speaking = False
+                    continue
                 
+                # VAD sobre el bloque actual (vista, sin copia)
+                closed = self.segmenter.push(self.ring.view(self._read_position, block_end))
+                self._read_position = block_end
+                
+                for start, end in closed:
+                    print("⏸️  Silencio detectado, transcribiendo...")
+                    self._submit_utterance(start, end)
+                
+                if self.segmenter.in_utterance:
+                    if not self.is_speaking:
+                        print("🎙️  Detectado inicio de voz...")
+                    self.is_speaking = True
+                    self._maybe_submit_partial(self.block_size)
                 else:
-                    time.sleep(0.01)  # Pequeña pausa si no hay audio
-                    
+                    self.is_speaking = False
+            
             except Exception as e:
                 print(f"❌ Error en procesamiento: {e}")
                 break
+        
+        # Fin de la escucha: el enunciado en curso también se transcribe (incluido el bloque incompleto)
+        last = self.segmenter.flush(end=self.ring.written)
+        if last is not None:
+            self._submit_utterance(*last)
+        self.is_speaking = False
+    
+    def _make_job(self, kind, start, end):
+        """Trabajo con la vista del buffer circular del audio [start, end) de un enunciado"""
+        # Sin recortar el inicio: correrlo desalinearía Utterance.start y el audio ya confirmado
+        audio = self.ring.view(start, end) if start >= self.ring.oldest else None
+        return TranscriptionJob(kind, self._utterance, start, audio, time.monotonic(), self.ring.clock_at(start))
+    
+    def _snapshot(self, job):
+        """
+        Copia el audio del trabajo (la única copia por transcripción) y confirma que el callback no lo alcanzó mientras esperaba en la cola
+        o durante la copia (con el margen de un bloque en escritura); None si ya no es válido.
+        """
+        if job.audio is None:
+            return None
+        # un bloque en escritura ya pudo pisar las posiciones [written - capacity, written - capacity + bloque)
+        return self.ring.snapshot(job.position, job.position + len(job.audio), margin=self.block_size)
+    
+    def _maybe_submit_partial(self, new_samples):
+        """En modo streaming, encola una ventana parcial cada stream_interval segundos de audio"""
+        if not self.streaming:
+            return
+        self._samples_since_partial += new_samples
+        if self._samples_since_partial >= self.stream_interval * self.sample_rate:
+            self._samples_since_partial = 0
+            job = self._make_job('partial', self.segmenter.start, self._read_position)
+            try:
+                # las ventanas parciales son prescindibles: si el worker va atrasado se descartan
+                self.job_queue.put_nowait(job)
+            except Full:
+                self.dropped_partial_jobs += 1
+    
+    def _submit_utterance(self, start, end):
+        """Entrega el enunciado completo como trabajo final (bloquea si la cola está llena)"""
+        job = self._make_job('final', start, end)
+        self.job_queue.put(job)
+        self._utterance += 1
+        self._samples_since_partial = 0
     
-    def _transcribe_buffer(self):
-        """Transcribe el buffer de audio acumulado"""
-        if not self.audio_buffer:
+    def _transcription_worker(self):
+        """Único consumidor de la cola: los textos salen en el mismo orden en que se encolaron"""
+        while True:
+            job = self.job_queue.get()
+            try:
+                if job is None:
+                    return
+                audio = self._snapshot(job)
+                if audio is None:
+                    # El worker quedó una vuelta atrás del buffer: se descarta en lugar de transcribir otro audio
+                    self.stale_jobs += 1
+                    print(f"⚠️  Audio del enunciado {job.utterance} sobrescrito antes de transcribirse, descartado")
+                    if job.kind == 'final':
+                        self.transcript.reset()
+                        self._committed_samples = 0
+                elif job.kind == 'partial':
+                    self._transcribe_partial(audio)
+                else:
+                    self._transcribe_buffer(audio, job.start)
+                    self.last_transcription_lag = time.monotonic() - job.enqueued_at
+                    observe('transcription_lag', self.last_transcription_lag)
+            except Exception as e:
+                print(f"❌ Error en transcripción: {e}")
+            finally:
+                self.job_queue.task_done()
+    
+    def _run_whisper(self, audio_data, word_timestamps=False, initial_prompt=None, stage='whisper_transcription'):
+        """Normaliza el audio y lo transcribe con Whisper"""
+        self.decoded_audio_seconds += len(audio_data) / self.sample_rate
+        with timed(stage):
+            # audio_data es parte de la copia de _snapshot, usada una sola vez: se normaliza sin otra copia
+            return run_whisper(self.model, audio_data, self.device, word_timestamps, initial_prompt, in_place=True)
+    
+    def _transcribe_partial(self, utterance_audio):
+        """Transcribe la porción sin confirmar del enunciado y avanza el punto confirmado"""
+        audio_data = utterance_audio[self._committed_samples:]
+        if len(audio_data) < int(self.min_audio_length * self.sample_rate):
             return
         
+        # Tiempos de palabra relativos al inicio del enunciado
+        offset = self._committed_samples / self.sample_rate
+        result = self._run_whisper(audio_data, word_timestamps=True, initial_prompt=self.transcript.prompt(),
+                                   stage='whisper_partial_transcription')
+        committed_until = self.transcript.update(words_from_result(result, offset))
+        if len(audio_data) > self.max_window * self.sample_rate:
+            committed_until = self.transcript.commit_all() or committed_until
+        
+        if committed_until:
+            self._committed_samples = min(len(utterance_audio), max(self._committed_samples,
+                                                                    int(committed_until * self.sample_rate)))
+            print(f"✏️  Parcial: {self.get_partial_text()}")
+    
+    def _transcribe_buffer(self, utterance_audio: np.ndarray, start: Optional[float] = None):
+        """Transcribe un enunciado completo (en modo streaming, solo lo que falta confirmar)"""
         try:
-            # Concatenar todo el audio
-            audio_data = np.concatenate(self.audio_buffer)
+            tail_text = ""
+            tail_words = []
+            audio_data = utterance_audio[self._committed_samples:]
             
             # Verificar longitud mínima
             min_samples = int(self.min_audio_length * self.sample_rate)
-            if len(audio_data) < min_samples:
-                return
+            if len(audio_data) >= min_samples:
+                # Transcribir con Whisper
+                result = self._run_whisper(audio_data, word_timestamps=self.word_timestamps,
+                                           initial_prompt=self.transcript.prompt())
+                tail_text = result["text"].strip()
+                if self.word_timestamps:
+                    tail_words = words_from_result(result, self._committed_samples / self.sample_rate)
             
-            # Normalizar audio
-            audio_float = audio_data.astype(np.float32)
-            max_val = np.max(np.abs(audio_float))
-            
-            if max_val > 0:
-                audio_float = audio_float / max_val
-            
-            # Transcribir con Whisper
-            result = self.model.transcribe(
-                audio_float,
-                language="es",
-                fp16=(self.device == "cuda"),
-                task="transcribe",
-                without_timestamps=True
-            )
-            
-            text = result["text"].strip()
+            text = " ".join(filter(None, [self.transcript.committed_text, tail_text]))
             
             if text:
                 self.text_queue.put(text)
+                if start is not None:
+                    words = None
+                    if self.word_timestamps:
+                        words = [(word, start + t0, start + t1) for word, t0, t1 in self.transcript.committed + tail_words]
+                    utterance = Utterance(text, start, start + len(utterance_audio) / self.sample_rate, words)
+                    self.utterances.append(utterance)
+                    if self.on_utterance is not None:
+                        self.on_utterance(utterance)
                 print(f"📝 Transcrito: {text}")
-            
+        
         except Exception as e:
             print(f"❌ Error en transcripción: {e}")
+        
+        finally:
+            self.transcript.reset()
+            self._committed_samples = 0
 
 
 # Ejemplo de uso
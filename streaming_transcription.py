@@ -0,0 +1,118 @@
+"""
+Confirmación incremental de transcripciones parciales (política de acuerdo local)
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# (palabra, inicio, fin) con tiempos en segundos (relativos al inicio del audio transcrito + offset)
+Word = Tuple[str, float, float]
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+def words_from_result(result: Dict, offset: float = 0.0) -> List[Word]:
+    """Extrae las palabras con tiempos de un resultado de whisper.transcribe(word_timestamps=True)."""
+    words = []
+    for segment in result.get("segments", []):
+        for word in segment.get("words", []):
+            text = word["word"].strip()
+            if text:
+                words.append((text, offset + float(word["start"]), offset + float(word["end"])))
+    return words
+
+
+def run_whisper(model, audio_data, device="cpu", word_timestamps=False, initial_prompt=None, in_place=False):
+    """
+    Normaliza el audio (16 kHz mono) por su pico y lo transcribe en español con Whisper.
+
+    Sin `in_place`, la normalización hace una copia y el audio recibido no se modifica. Con
+    `in_place=True` se normaliza sobre el mismo arreglo float32, que debe pertenecer al llamador
+    (p. ej. la copia que SpeechRecognizer toma del buffer circular).
+    """
+    audio_float = audio_data.astype(np.float32, copy=False)
+    max_val = max(float(audio_float.max()), -float(audio_float.min())) if len(audio_float) else 0.0
+
+    if max_val > 0:
+        if in_place and audio_float is audio_data:
+            audio_float *= np.float32(1.0 / max_val)
+        else:
+            audio_float = np.multiply(audio_float, 1.0 / max_val, dtype=np.float32)
+
+    return model.transcribe(
+        audio_float,
+        language="es",
+        fp16=(device == "cuda"),
+        task="transcribe",
+        without_timestamps=not word_timestamps,
+        word_timestamps=word_timestamps,
+        initial_prompt=initial_prompt
+    )
+
+
+class StreamingTranscript:
+    """
+    Mantiene la transcripción de un enunciado mientras el usuario sigue hablando.
+
+    Cada ventana se transcribe de nuevo desde el último punto confirmado; las palabras en las que
+    coinciden dos hipótesis consecutivas se consideran estables y se confirman, y el audio hasta el
+    final de la última palabra confirmada ya no vuelve a decodificarse. El resto de la hipótesis
+    queda como texto parcial. Los tiempos de todas las hipótesis deben compartir la misma
+    referencia (p. ej. el inicio del enunciado, usando el offset de words_from_result).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.committed: List[Word] = []
+        self.previous: List[Word] = []
+        self.partial: List[Word] = []
+
+    def update(self, words: List[Word]) -> Optional[float]:
+        """
+        Registra una nueva hipótesis de la porción no confirmada.
+
+        Returns:
+            Tiempo (segundos, misma referencia que `words`) hasta el que el audio quedó confirmado,
+            o None si esta hipótesis no confirmó nada nuevo.
+        """
+        if self.committed:
+            # palabras que terminan dentro del audio ya confirmado (ventana atrasada o tiempos imprecisos)
+            committed_end = self.committed[-1][2]
+            words = [word for word in words if word[2] > committed_end]
+        agreed = 0
+        for (current, _, _), (previous, _, _) in zip(words, self.previous):
+            if _normalize(current) != _normalize(previous):
+                break
+            agreed += 1
+
+        self.committed.extend(words[:agreed])
+        self.previous = words[agreed:]
+        self.partial = words[agreed:]
+        return words[agreed - 1][2] if agreed else None
+
+    def commit_all(self) -> Optional[float]:
+        """Confirma toda la hipótesis vigente (ventana demasiado larga sin acuerdo)."""
+        if not self.partial:
+            return None
+        self.committed.extend(self.partial)
+        end = self.partial[-1][2]
+        self.previous = []
+        self.partial = []
+        return end
+
+    @property
+    def committed_text(self) -> str:
+        return " ".join(text for text, _, _ in self.committed)
+
+    @property
+    def partial_text(self) -> str:
+        return " ".join(text for text, _, _ in self.partial)
+
+    def prompt(self, max_chars: int = 200) -> Optional[str]:
+        """Texto confirmado reciente, usado como contexto (initial_prompt) de la siguiente ventana."""
+        text = self.committed_text
+        return text[-max_chars:] if text else None
@@ -0,0 +1,107 @@
+"""
+Pruebas del buffer circular de audio: escrituras que dan la vuelta, la copia espejo que hace
+contiguas las vistas y el rechazo de rangos ya sobrescritos.
+
+    python -m pytest tests/test_audio_ring_buffer.py
+"""
+import numpy as np
+import pytest
+from audio_ring_buffer import AudioRingBuffer
+
+CAPACITY = 10
+
+
+@pytest.fixture
+def ring():
+    return AudioRingBuffer(seconds=1.0, sample_rate=CAPACITY)
+
+
+def _ramp(start: int, stop: int) -> np.ndarray:
+    """Muestras cuyo valor es su posición absoluta, para reconocerlas al leerlas."""
+    return np.arange(start, stop, dtype=np.float32)
+
+
+def test_view_before_wrap(ring):
+    ring.write(_ramp(0, 6))
+    assert ring.written == 6
+    assert ring.oldest == 0
+    np.testing.assert_array_equal(ring.view(2, 6), _ramp(2, 6))
+
+
+def test_view_across_wrap_is_contiguous(ring):
+    # bloques de 4: el tercero cruza el final (posiciones 8..11) y el cuarto queda en 12..15
+    for start in range(0, 16, 4):
+        ring.write(_ramp(start, start + 4))
+
+    assert ring.written == 16
+    assert ring.oldest == 6
+    view = ring.view(6, 16)
+    assert view.base is not None  # vista sin copia sobre el arreglo espejado
+    np.testing.assert_array_equal(view, _ramp(6, 16))
+    np.testing.assert_array_equal(ring.view(9, 13), _ramp(9, 13))
+
+
+def test_block_longer_than_capacity_keeps_the_tail(ring):
+    ring.write(_ramp(0, 25))
+    assert ring.written == 25
+    assert ring.oldest == 15
+    np.testing.assert_array_equal(ring.view(15, 25), _ramp(15, 25))
+
+
+def test_two_column_block_uses_first_channel(ring):
+    block = np.stack([_ramp(0, 4), -_ramp(0, 4)], axis=1)
+    ring.write(block)
+    np.testing.assert_array_equal(ring.view(0, 4), _ramp(0, 4))
+
+
+def test_view_rejects_ranges_outside_the_buffer(ring):
+    ring.write(_ramp(0, 14))
+    with pytest.raises(ValueError):
+        ring.view(3, 8)   # 3 ya se sobrescribió
+    with pytest.raises(ValueError):
+        ring.view(10, 15)  # 14 todavía no se escribe
+
+
+def test_view_is_overwritten_by_later_writes(ring):
+    ring.write(_ramp(0, 8))
+    view = ring.view(0, 8)
+    ring.write(_ramp(8, 14))
+    # la vista apunta a memoria que el escritor ya alcanzó: por eso se copia antes de transcribir
+    assert view[0] == 10.0
+
+
+def test_snapshot_is_an_independent_copy(ring):
+    ring.write(_ramp(0, 8))
+    audio = ring.snapshot(2, 8)
+    ring.write(_ramp(8, 14))
+    np.testing.assert_array_equal(audio, _ramp(2, 8))
+
+
+def test_snapshot_rejects_overwritten_start(ring):
+    ring.write(_ramp(0, 8))
+    ring.write(_ramp(8, 14))
+    assert ring.snapshot(3, 8) is None
+    np.testing.assert_array_equal(ring.snapshot(4, 14), _ramp(4, 14))
+
+
+def test_snapshot_margin_rejects_positions_a_block_may_be_overwriting(ring):
+    ring.write(_ramp(0, 14))
+    # oldest es 4; con un bloque de 2 en escritura, 4 y 5 pueden estar siendo pisados
+    assert ring.snapshot(4, 14, margin=2) is None
+    assert ring.snapshot(5, 14, margin=2) is None
+    np.testing.assert_array_equal(ring.snapshot(6, 14, margin=2), _ramp(6, 14))
+
+
+def test_reset_starts_positions_over(ring):
+    ring.write(_ramp(0, 14))
+    ring.reset()
+    assert ring.written == 0
+    assert ring.oldest == 0
+    assert ring.clock_at(0) is None
+    ring.write(_ramp(100, 103))
+    np.testing.assert_array_equal(ring.view(0, 3), _ramp(100, 103))
+
+
+def test_clock_at_counts_from_the_first_block(ring):
+    ring.write(_ramp(0, 5))
+    assert ring.clock_at(5) - ring.clock_at(0) == pytest.approx(5 / CAPACITY)
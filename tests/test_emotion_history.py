@@ -0,0 +1,170 @@
+"""
+Pruebas de EmotionHistory: almacenamiento columnar que crece por duplicación y estadísticas
+incrementales (Welford, transiciones en línea, sumas acumuladas, ventanas por enunciado) contra un
+recálculo directo.
+
+    python -m pytest tests/test_emotion_history.py
+"""
+import numpy as np
+import pytest
+from emotion_history import EmotionHistory
+
+EMOTIONS = ['angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'anxiety']
+
+
+def _frames(count: int, seed: int = 0):
+    """Scores al azar (float32, como los guarda el historial) con tiempos a 30 fps y números de frame."""
+    rng = np.random.default_rng(seed)
+    scores = rng.uniform(0.0, 100.0, size=(count, len(EMOTIONS))).astype(np.float32)
+    # tramos con una emoción muy por encima del resto y tramos de baja confianza, para que haya transiciones
+    scores[count // 3:count // 2, 3] += 100.0
+    scores[count // 2:2 * count // 3] *= 0.15
+    elapsed = np.arange(count) / 30.0
+    return scores, elapsed, np.arange(count) * 2
+
+
+def _record(scores, elapsed, numbers, initial_capacity: int = 4) -> EmotionHistory:
+    history = EmotionHistory(initial_capacity=initial_capacity)
+    history.start_recording()
+    for row, seconds, number in zip(scores, elapsed, numbers):
+        history.add_frame(dict(zip(EMOTIONS, map(float, row))), int(number), float(seconds))
+    history.stop_recording()
+    return history
+
+
+@pytest.mark.parametrize('initial_capacity', [0, 1, 4, 1024])
+def test_columns_survive_growth(initial_capacity):
+    scores, elapsed, numbers = _frames(150)
+    history = _record(scores, elapsed, numbers, initial_capacity)
+
+    assert len(history) == 150
+    assert history.emotion_names == EMOTIONS
+    np.testing.assert_array_equal(history.scores, scores)
+    np.testing.assert_array_equal(history.elapsed_seconds, elapsed)
+    np.testing.assert_array_equal(history.frame_numbers, numbers)
+
+
+def test_history_view_keeps_the_frame_dicts():
+    scores, elapsed, numbers = _frames(40)
+    history = _record(scores, elapsed, numbers)
+    frames = history.history
+    assert [frame['frame'] for frame in frames] == numbers.tolist()
+    assert frames[7]['emotions'] == dict(zip(EMOTIONS, map(float, scores[7])))
+    assert frames[7]['elapsed_seconds'] == round(float(elapsed[7]), 2)
+
+
+def test_frames_outside_recording_are_ignored():
+    history = EmotionHistory(initial_capacity=0)
+    history.add_frame(dict.fromkeys(EMOTIONS, 10.0), 0, 0.0)
+    assert len(history) == 0
+    assert history.get_summary()['status'] == 'no_data'
+
+
+def _reference_transitions(frames):
+    """Recorrido frame a frame del historial, como lo hacía _detect_transitions antes de los acumuladores."""
+    transitions = []
+    previous = None
+    for frame in frames:
+        dominant = max(frame['emotions'], key=frame['emotions'].get)
+        score = frame['emotions'][dominant]
+        if score > EmotionHistory.TRANSITION_THRESHOLD:
+            if previous and dominant != previous:
+                transitions.append({'frame': frame['frame'], 'time': frame['elapsed_seconds'], 'from': previous,
+                                    'to': dominant, 'confidence': round(score, 2)})
+            previous = dominant
+    return transitions
+
+
+def _reference_timeline(frames, segments: int = 10):
+    segment_size = max(1, len(frames) // segments)
+    timeline = []
+    for i in range(0, len(frames), segment_size):
+        segment = frames[i:i + segment_size]
+        sums = {emotion: sum(frame['emotions'][emotion] for frame in segment) for emotion in EMOTIONS}
+        dominant = max(sums, key=sums.get)
+        timeline.append({'segment': i // segment_size + 1, 'start_time': segment[0]['elapsed_seconds'],
+                         'end_time': segment[-1]['elapsed_seconds'], 'dominant_emotion': dominant,
+                         'confidence': round(sums[dominant] / len(segment), 2)})
+    return timeline
+
+
+def test_cumulative_sums_follow_growth():
+    scores, elapsed, numbers = _frames(150)
+    history = _record(scores, elapsed, numbers)
+    np.testing.assert_allclose(history._cumulative[1:151], np.cumsum(scores.astype(np.float64), axis=0), rtol=1e-12)
+
+
+def test_statistics_match_numpy_over_the_columns():
+    scores, elapsed, numbers = _frames(300)
+    history = _record(scores, elapsed, numbers)
+    stats = history.get_summary()['emotion_statistics']
+
+    values = history.scores.astype(np.float64)
+    dominant = np.bincount(values.argmax(axis=1), minlength=len(EMOTIONS)) / len(values) * 100
+    for j, emotion in enumerate(EMOTIONS):
+        # los acumuladores de Welford pueden diferir en el último decimal tras redondear
+        assert stats[emotion]['mean'] == pytest.approx(values[:, j].mean(), abs=0.006)
+        assert stats[emotion]['std'] == pytest.approx(values[:, j].std(), abs=0.006)
+        assert stats[emotion]['min'] == round(float(values[:, j].min()), 2)
+        assert stats[emotion]['max'] == round(float(values[:, j].max()), 2)
+        assert stats[emotion]['dominant_percentage'] == pytest.approx(dominant[j], abs=0.006)
+
+
+def test_transitions_match_a_frame_by_frame_pass():
+    scores, elapsed, numbers = _frames(300)
+    history = _record(scores, elapsed, numbers)
+    transitions = history.get_summary()['emotion_transitions']
+
+    expected = _reference_transitions(history.history)
+    assert len(expected) >= 2
+    assert transitions == expected
+
+
+@pytest.mark.parametrize('count', [7, 150, 301])
+def test_timeline_after_growth_matches_a_segment_pass(count):
+    scores, elapsed, numbers = _frames(count)
+    history = _record(scores, elapsed, numbers)
+    timeline = history.get_summary()['timeline']
+
+    expected = _reference_timeline(history.history)
+    assert [segment['dominant_emotion'] for segment in timeline] == [s['dominant_emotion'] for s in expected]
+    for segment, reference in zip(timeline, expected):
+        assert segment['segment'] == reference['segment']
+        assert segment['start_time'] == reference['start_time']
+        assert segment['end_time'] == reference['end_time']
+        assert segment['confidence'] == pytest.approx(reference['confidence'], abs=0.006)
+
+
+@pytest.mark.parametrize('start, end', [(0.0, 1.0), (0.5, 0.5), (1.234, 3.9), (2.0, 1.0), (-5.0, 0.0),
+                                        (4.95, 20.0), (-1.0, 100.0)])
+def test_window_statistics_match_a_frame_scan(start, end):
+    # tiempos irregulares (frames perdidos), en un historial que creció varias veces
+    rng = np.random.default_rng(7)
+    scores, _, numbers = _frames(150)
+    elapsed = np.cumsum(rng.uniform(0.01, 0.06, 150))
+    history = _record(scores, elapsed, numbers)
+
+    window = history.window_statistics(start, end)
+
+    inside = (elapsed >= start) & (elapsed <= end)
+    assert window['frames'] == int(inside.sum())
+    if not inside.any():
+        assert window == {'frames': 0, 'mean': {}, 'dominant_emotion': None, 'confidence': 0.0}
+        return
+    means = scores[inside].astype(np.float64).mean(axis=0)
+    for j, emotion in enumerate(EMOTIONS):
+        assert window['mean'][emotion] == pytest.approx(means[j], abs=0.006)
+    assert window['dominant_emotion'] == EMOTIONS[int(means.argmax())]
+    assert window['confidence'] == pytest.approx(means.max(), abs=0.006)
+
+
+def test_utterance_emotions_use_their_own_window():
+    scores, elapsed, numbers = _frames(150)
+    history = _record(scores, elapsed, numbers)
+    history.add_utterance("hola", 1.0, 2.0)
+    history.add_utterance("fuera de rango", 10.0, 11.0)
+
+    first, second = history.get_utterance_emotions()
+    assert first['face_emotions'] == history.window_statistics(1.0, 2.0)
+    assert first['face_emotions']['frames'] == int(((elapsed >= 1.0) & (elapsed <= 2.0)).sum())
+    assert second['face_emotions']['frames'] == 0
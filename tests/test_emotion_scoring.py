@@ -0,0 +1,142 @@
+"""
+Pruebas del scoring en dos etapas (FrameChecks una vez por frame + score_checks por emoción) contra la
+ruta anterior, en la que cada emoción evaluaba sus propios cuatro checks, y de las rutas por lotes
+(recognize_batch, score_checks_batch, normalize_batch) contra las de un frame.
+
+    python -m pytest tests/test_emotion_scoring.py
+"""
+import numpy as np
+import pytest
+from benchmarks.fixtures import PRESETS, face_template, landmark_frames
+from emotion_normalizer import EmotionNormalizer
+from emotion_processor.data_processing.main import PointsProcessing
+from emotion_processor.emotions_recognition.features.feature_implementation import (BasicEyebrowsCheck, BasicEyesCheck,
+                                                                                    BasicNoseCheck, BasicMouthCheck)
+from emotion_processor.emotions_recognition.main import EmotionRecognition
+
+
+def _legacy_scores(recognition, features):
+    """Ruta anterior a FrameChecks: checks nuevos por emoción y la suma ponderada de sus cuatro scores."""
+    scores = {}
+    for emotion in recognition.emotions.values():
+        eyebrows = BasicEyebrowsCheck().check_eyebrows(features['eyebrows'])
+        eyes = BasicEyesCheck().check_eyes(features['eyes'])
+        nose = BasicNoseCheck().check_nose(features['nose'])
+        mouth = BasicMouthCheck().check_mouth(features['mouth'])
+        scores[emotion.name] = (emotion.calculate_eyebrows_score(eyebrows) * emotion.eyebrows_weight +
+                                emotion.calculate_eyes_score(eyes) * emotion.eyes_weight +
+                                emotion.calculate_nose_score(nose) * emotion.nose_weight +
+                                emotion.calculate_mouth_score(mouth) * emotion.mouth_weight)
+    return scores
+
+
+def _sweep(frames: int, seed: int = 0):
+    """
+    Features de los presets con cada distancia escalada al azar: recorre rostros con ojos cerrados y muy
+    abiertos, boca cerrada y abierta, cejas juntas y separadas, y así las ramas de salida temprana.
+    """
+    rng = np.random.default_rng(seed)
+    processing = PointsProcessing()
+    bases = [processing.main(face_template(preset).astype(np.int16)) for preset in PRESETS]
+    sweep = []
+    for _ in range(frames):
+        base = bases[rng.integers(len(bases))]
+        features = {feature: {name: value if name == 'face_width' or 'arch' in name else value * rng.uniform(0.0, 3.0)
+                              for name, value in values.items()}
+                    for feature, values in base.items()}
+        # arcos de los ojos con signo y tamaño al azar para cubrir tension 0 y 1
+        features['eyes']['arch_right'] = base['eyes']['arch_right'] * rng.uniform(-2.0, 2.0)
+        features['eyes']['arch_left'] = base['eyes']['arch_left'] * rng.uniform(-2.0, 2.0)
+        sweep.append(features)
+    return sweep
+
+
+@pytest.fixture(scope='module')
+def recognition():
+    return EmotionRecognition()
+
+
+@pytest.fixture(scope='module')
+def sweep():
+    return _sweep(2000)
+
+
+@pytest.mark.parametrize('preset', PRESETS)
+def test_presets_score_identically(recognition, preset):
+    features = PointsProcessing().main(face_template(preset).astype(np.int16))
+    assert recognition.recognize_emotion(features) == _legacy_scores(recognition, features)
+
+
+def test_sweep_scores_identically(recognition, sweep):
+    for features in sweep:
+        assert recognition.recognize_emotion(features) == _legacy_scores(recognition, features)
+
+
+def test_sweep_reaches_the_early_exit_branches(recognition, sweep):
+    checks = [recognition.frame_checks.evaluate(features) for features in sweep]
+    openness = np.array([c['eyes']['openness'] for c in checks])
+    eye_tension = np.array([c['eyes']['tension'] for c in checks])
+    mouth_tension = np.array([c['mouth']['tension'] for c in checks])
+    no_smile = np.array([c['mouth']['no_smile'] for c in checks])
+    together = np.array([c['eyebrows']['together'] for c in checks])
+
+    # HappyScore.calculate_eyes_score: 0, 40, curva, 50 y 0 por encima de 0.95
+    for low, high in [(0.0, 0.1), (0.1, 0.15), (0.15, 0.85), (0.85, 0.95), (0.95, 1.01)]:
+        assert np.any((openness >= low) & (openness < high)), (low, high)
+    # SurpriseScore.calculate_eyes_score sale en 0 por debajo de 0.3
+    assert np.any(openness < 0.3) and np.any(openness >= 0.3)
+    assert np.any(eye_tension == 0.0) and np.any(eye_tension > 0.7)
+    assert np.any(mouth_tension == 0.0) and np.any(mouth_tension > 0.0)
+    assert set(np.unique(no_smile)) == {0.0, 0.5, 1.0}
+    assert np.any(together == 0.0) and np.any(together > 0.0)
+
+
+def test_recognize_batch_matches_per_frame(recognition):
+    processing = PointsProcessing()
+    rng = np.random.default_rng(1)
+    landmarks = np.concatenate([landmark_frames(24, preset='mixed', seed=1, segment=4),
+                                rng.uniform((220, 140), (420, 380), size=(8, 478, 2)).astype(np.int16)])
+
+    batch = recognition.recognize_batch(processing.feature_matrix(landmarks))
+
+    assert batch.shape == (len(landmarks), len(recognition.emotion_names))
+    for row, frame in zip(batch, landmarks):
+        scores = recognition.recognize_emotion(processing.main(frame))
+        # pow() vectorizado puede diferir en 1 ulp
+        np.testing.assert_allclose(row, [scores[name] for name in recognition.emotion_names], rtol=1e-12, atol=1e-12)
+
+
+def test_score_checks_batch_matches_per_frame_on_check_records(recognition):
+    # registros de checks al azar, incluidos valores que las features reales no producen (p. ej. flared < 0.2)
+    rng = np.random.default_rng(2)
+    frames = 500
+    checks = {
+        'eyebrows': {name: np.where(rng.uniform(size=frames) < 0.3, 0.0, rng.uniform(0.0, 1.0, frames))
+                     for name in ('together', 'right_raised', 'left_raised')},
+        'eyes': {'openness': rng.uniform(0.0, 1.0, frames), 'tension': rng.uniform(0.0, 1.0, frames)},
+        'nose': {'flared': rng.uniform(0.0, 1.0, frames)},
+        'mouth': {'tension': rng.uniform(0.0, 1.0, frames), 'no_smile': rng.choice([0.0, 0.5, 1.0], size=frames)},
+    }
+    for emotion in recognition.emotions.values():
+        batch = emotion.score_checks_batch(checks)
+        for t in range(frames):
+            record = {feature: {name: float(values[t]) for name, values in group.items()}
+                      for feature, group in checks.items()}
+            assert batch[t] == pytest.approx(emotion.score_checks(record)[emotion.name], rel=1e-12, abs=1e-12)
+
+
+def test_normalize_batch_matches_per_frame():
+    normalizer = EmotionNormalizer()
+    names = EmotionRecognition().emotion_names
+    rng = np.random.default_rng(3)
+    scores = rng.uniform(0.0, 100.0, size=(200, len(names)))
+    # filas con pocos valores altos, para que no todas pasen por la competencia suave
+    scores[100:] *= rng.uniform(size=(100, len(names))) < 0.3
+    scores[0] = 0.0
+
+    batch = normalizer.normalize_batch(scores, names)
+
+    for row, frame in zip(batch, scores):
+        expected = normalizer.normalize(dict(zip(names, frame)))
+        np.testing.assert_allclose(row, [expected[name] for name in names], rtol=1e-12, atol=1e-12)
+    np.testing.assert_array_equal(batch[0], np.zeros(len(names)))
@@ -0,0 +1,75 @@
+"""
+Pruebas de EmotionWindow: desalojo por número de frames y por antigüedad, y promedio incremental.
+
+    python -m pytest tests/test_frame_buffers.py
+"""
+import numpy as np
+import pytest
+from emotion_processor.frame_buffers import EmotionWindow
+
+EMOTIONS = ['angry', 'happy', 'sad']
+
+
+def _emotions(count: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [dict(zip(EMOTIONS, map(float, row))) for row in rng.uniform(0.0, 100.0, size=(count, len(EMOTIONS)))]
+
+
+def _mean(frames):
+    return {emotion: float(np.mean([frame[emotion] for frame in frames])) for emotion in EMOTIONS}
+
+
+def test_evicts_oldest_frames_at_max_frames():
+    frames = _emotions(25)
+    window = EmotionWindow(max_frames=10)
+    for i, emotions in enumerate(frames):
+        window.append(emotions, timestamp=float(i))
+        assert len(window) == min(i + 1, 10)
+
+    assert list(window) == frames[-10:]
+    assert window[0] is frames[15]
+    assert window[-1] is frames[-1]
+
+
+@pytest.mark.parametrize('count', [1, 9, 10, 11, 37, 500])
+def test_running_mean_after_eviction(count):
+    frames = _emotions(count, seed=count)
+    window = EmotionWindow(max_frames=10)
+    for i, emotions in enumerate(frames):
+        window.append(emotions, timestamp=float(i))
+
+    mean = window.mean()
+    expected = _mean(frames[-10:])
+    assert mean.keys() == expected.keys()
+    for emotion in EMOTIONS:
+        assert mean[emotion] == pytest.approx(expected[emotion], rel=1e-12)
+
+
+def test_evicts_frames_older_than_max_seconds():
+    frames = _emotions(40)
+    window = EmotionWindow(max_frames=100, max_seconds=1.0)
+    for i, emotions in enumerate(frames):
+        window.append(emotions, timestamp=i * 0.1)
+
+    # con 0.1 s entre frames, un segundo abarca los últimos 11 (los extremos incluidos)
+    assert list(window) == frames[-11:]
+    for emotion, value in window.mean().items():
+        assert value == pytest.approx(_mean(frames[-11:])[emotion], rel=1e-12)
+
+
+def test_max_seconds_keeps_the_latest_frame_after_a_gap():
+    window = EmotionWindow(max_frames=100, max_seconds=1.0)
+    first, second = _emotions(2)
+    window.append(first, timestamp=0.0)
+    window.append(second, timestamp=5.0)
+    assert list(window) == [second]
+    assert window.mean() == second
+
+
+def test_clear_empties_the_window():
+    window = EmotionWindow(max_frames=5)
+    for emotions in _emotions(8):
+        window.append(emotions, timestamp=0.0)
+    window.clear()
+    assert len(window) == 0
+    assert window.mean() == {}
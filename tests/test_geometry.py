@@ -0,0 +1,75 @@
+"""
+Pruebas de FeatureGeometry contra el cálculo característica por característica que reemplazó:
+np.linalg.norm para cada par de distancias y np.polyfit(x, y, 2)[0] para cada arco.
+
+    python -m pytest tests/test_geometry.py
+"""
+import numpy as np
+import pytest
+from benchmarks.fixtures import PRESETS, face_points, face_template, landmark_frames
+from emotion_processor.face_mesh.landmark_indices import FEATURE_INDEX_TABLE, FEATURE_SLICES
+from emotion_processor.data_processing.geometry import (ARCHES, DISTANCE_PAIRS, FEATURE_LAYOUT, FEATURE_NAMES,
+                                                        FeatureGeometry)
+
+
+def _reference(points):
+    """Features de un frame calculadas como los antiguos *PointsProcessing, a partir del dict anidado."""
+    features = {feature: {} for feature in FEATURE_LAYOUT}
+    for feature, name, sub_feature, a, b in DISTANCE_PAIRS:
+        pair = points[feature][sub_feature]
+        features[feature][name] = np.linalg.norm(np.array(pair[a]) - np.array(pair[b]))
+    for feature, name, sub_feature in ARCHES:
+        arch = points[feature][sub_feature]
+        features[feature][name] = np.polyfit([p[0] for p in arch], [p[1] for p in arch], 2)[0]
+    eyes = points['eyes']
+    features['eyes']['face_width'] = np.linalg.norm(np.array(eyes['right arch'][0]) - np.array(eyes['left arch'][0]))
+    return np.array([features[feature][name] for feature, name in FEATURE_NAMES])
+
+
+@pytest.fixture(scope='module')
+def geometry():
+    return FeatureGeometry()
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return landmark_frames(60, preset='mixed', seed=3, segment=10)
+
+
+@pytest.mark.parametrize('preset', PRESETS)
+def test_dict_input_matches_per_feature_reference(geometry, preset):
+    points = face_points(face_template(preset).astype(np.int16))
+    np.testing.assert_allclose(geometry.vector(points), _reference(points), rtol=1e-7, atol=1e-9)
+
+
+def test_compute_keeps_the_nested_layout(geometry):
+    points = face_points(face_template('smile').astype(np.int16))
+    features = geometry.compute(points)
+    assert {feature: list(values) for feature, values in features.items()} == FEATURE_LAYOUT
+
+
+def test_batch_matches_per_frame_reference(geometry, frames):
+    expected = np.stack([_reference(face_points(frame)) for frame in frames])
+    np.testing.assert_allclose(geometry.vector(frames), expected, rtol=1e-7, atol=1e-9)
+
+
+def test_single_landmark_array_matches_its_batch_row(geometry, frames):
+    batch = geometry.vector(frames)
+    for i in (0, 17, 59):
+        np.testing.assert_allclose(geometry.vector(frames[i]), batch[i], rtol=1e-12)
+
+
+def test_singular_arch_only_affects_its_own_arch(geometry, frames):
+    healthy = geometry.vector(frames)
+    degenerate = frames.copy()
+    # todos los puntos del arco derecho de la ceja en una misma x: sistema singular solo en el frame 5
+    arch = FEATURE_INDEX_TABLE[FEATURE_SLICES['eyebrows']['right arch']]
+    degenerate[5, arch, 0] = degenerate[5, arch[0], 0]
+
+    values = geometry.vector(degenerate)
+
+    assert np.all(np.isfinite(values))
+    rows = np.arange(len(frames)) != 5
+    np.testing.assert_array_equal(values[rows], healthy[rows])
+    other_arches = [FEATURE_NAMES.index((feature, name)) for feature, name, _ in ARCHES[1:]]
+    np.testing.assert_array_equal(values[5, other_arches], healthy[5, other_arches])
@@ -0,0 +1,80 @@
+"""
+Pruebas de MotionGate sobre frames sintéticos: una "cara" texturizada que se queda quieta, se mueve o
+recibe ruido de cámara.
+
+    python -m pytest tests/test_motion_gate.py
+"""
+import numpy as np
+import pytest
+from emotion_processor.motion_gate import MotionGate
+
+ROI = (200, 120, 440, 360)
+
+
+def _frame(shift: int = 0, noise: float = 0.0, seed: int = 0) -> np.ndarray:
+    """Frame BGR 640x480 con un patrón de bloques en la zona de la cara, desplazado `shift` píxeles."""
+    rng = np.random.default_rng(seed)
+    frame = np.full((480, 640, 3), 90, dtype=np.uint8)
+    blocks = np.random.default_rng(42).integers(0, 256, size=(12, 12, 3), dtype=np.uint8)
+    face = np.kron(blocks, np.ones((20, 20, 1), dtype=np.uint8))
+    frame[120:360, 200 + shift:440 + shift] = face
+    if noise:
+        frame = np.clip(frame + rng.normal(0.0, noise, frame.shape), 0, 255).astype(np.uint8)
+    return frame
+
+
+def test_first_frame_is_never_static():
+    gate = MotionGate()
+    assert not gate.is_static(_frame())
+    assert gate.get_metrics()['frames_skipped'] == 0
+
+
+def test_still_frames_are_gated():
+    gate = MotionGate(max_static_frames=100)
+    gate.update(_frame(), ROI)
+    # ruido de sensor leve: el promedio sobre la miniatura queda muy por debajo del umbral
+    assert all(gate.is_static(_frame(noise=3.0, seed=seed)) for seed in range(20))
+    metrics = gate.get_metrics()
+    assert metrics['frames_checked'] == 20
+    assert metrics['frames_skipped'] == 20
+    assert metrics['last_energy'] < gate.threshold
+
+
+def test_motion_lets_the_frame_through():
+    gate = MotionGate()
+    gate.update(_frame(), ROI)
+    assert not gate.is_static(_frame(shift=15))
+    assert gate.last_energy >= gate.threshold
+
+
+def test_motion_outside_the_roi_is_ignored():
+    gate = MotionGate()
+    gate.update(_frame(), ROI)
+    frame = _frame()
+    frame[:100, :100] = 255
+    assert gate.is_static(frame)
+
+
+def test_forced_refresh_after_max_static_frames():
+    gate = MotionGate(max_static_frames=5)
+    gate.update(_frame(), ROI)
+    assert [gate.is_static(_frame()) for _ in range(7)] == [True] * 5 + [False] * 2
+
+    # el análisis forzado actualiza la referencia y vuelve a habilitar el salto
+    gate.update(_frame(), ROI)
+    assert gate.is_static(_frame())
+
+
+def test_reset_drops_the_reference():
+    gate = MotionGate()
+    gate.update(_frame(), ROI)
+    gate.reset()
+    assert not gate.is_static(_frame())
+
+
+@pytest.mark.parametrize('roi', [None, (300, 200, 300, 260), (300, 200, 250, 260)])
+def test_empty_or_missing_roi_uses_the_whole_frame(roi):
+    gate = MotionGate()
+    gate.update(_frame(), roi)
+    assert gate.is_static(_frame())
+    assert not gate.is_static(_frame(shift=15))
@@ -0,0 +1,105 @@
+"""
+Pruebas de AnalysisScheduler con un reloj inyectado (los timestamps de should_analyze).
+
+    python -m pytest tests/test_scheduler.py
+"""
+import numpy as np
+import pytest
+from emotion_processor.scheduler import AnalysisScheduler
+
+FPS = 30.0
+
+
+def _pattern(scheduler, timestamps):
+    return [scheduler.should_analyze(timestamp) for timestamp in timestamps]
+
+
+def test_default_analyzes_every_frame():
+    scheduler = AnalysisScheduler()
+    assert all(_pattern(scheduler, np.arange(60) / FPS))
+    assert scheduler.get_stats()['analysis_ratio'] == 1.0
+
+
+def test_every_n_frames_cadence():
+    scheduler = AnalysisScheduler(every_n_frames=3, adaptive=False)
+    assert _pattern(scheduler, np.arange(9) / FPS) == [True, False, False] * 3
+
+
+def test_target_hz_cadence_on_a_30_fps_clock():
+    scheduler = AnalysisScheduler(target_hz=10.0, adaptive=False)
+    analyzed = _pattern(scheduler, np.arange(90) / FPS)
+    assert analyzed == [True, False, False] * 30
+    assert scheduler.frames_seen == 90
+    assert scheduler.frames_analyzed == 30
+
+
+def test_target_hz_tolerates_capture_jitter():
+    # cada frame llega hasta 1 ms antes o después de su instante nominal
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(300) / FPS + rng.uniform(-0.001, 0.001, 300)
+    scheduler = AnalysisScheduler(target_hz=10.0, adaptive=False)
+    analyzed = np.flatnonzero(_pattern(scheduler, timestamps))
+    assert np.all(np.diff(analyzed) == 3)
+
+
+def test_target_hz_follows_wall_time_not_frame_count():
+    # a 15 fps, 10 Hz se cumple analizando un frame sí y uno no (0.133 s entre análisis)
+    scheduler = AnalysisScheduler(target_hz=10.0, adaptive=False)
+    assert _pattern(scheduler, np.arange(8) / 15.0) == [True, False] * 4
+
+
+def test_backoff_grows_over_budget_and_recovers():
+    scheduler = AnalysisScheduler(target_hz=10.0, frame_budget=0.05, max_backoff=3, smoothing=1.0)
+    for expected in (2, 3, 3):
+        scheduler.record(0.08)
+        assert scheduler.backoff == expected
+    assert scheduler.interval == pytest.approx(0.3)
+    assert _pattern(scheduler, np.arange(18) / FPS) == ([True] + [False] * 8) * 2
+
+    # entre recover_ratio * budget y budget el backoff se mantiene
+    scheduler.record(0.04)
+    assert scheduler.backoff == 3
+    for expected in (2, 1, 1):
+        scheduler.record(0.01)
+        assert scheduler.backoff == expected
+
+
+def test_backoff_stretches_the_stride_in_frame_mode():
+    scheduler = AnalysisScheduler(every_n_frames=2, frame_budget=0.05, smoothing=1.0)
+    scheduler.record(0.1)
+    assert scheduler.stride == 4
+    assert _pattern(scheduler, np.arange(8) / FPS) == [True, False, False, False] * 2
+
+
+def test_non_adaptive_only_tracks_the_average():
+    scheduler = AnalysisScheduler(target_hz=10.0, adaptive=False, frame_budget=0.01, smoothing=0.5)
+    scheduler.record(0.1)
+    scheduler.record(0.2)
+    assert scheduler.backoff == 1
+    assert scheduler.average_duration == pytest.approx(0.15)
+
+
+def test_reset_makes_the_next_frame_due():
+    scheduler = AnalysisScheduler(target_hz=10.0, frame_budget=0.01, smoothing=1.0)
+    assert scheduler.should_analyze(0.0)
+    scheduler.record(0.1)
+    assert not scheduler.should_analyze(0.05)
+    scheduler.reset()
+    assert scheduler.backoff == 1
+    assert scheduler.should_analyze(0.06)
+
+
+@pytest.mark.parametrize('kwargs', [{'target_hz': 0.0}, {'target_hz': -5.0}, {'every_n_frames': 0}])
+def test_rejects_invalid_rates(kwargs):
+    with pytest.raises(ValueError):
+        AnalysisScheduler(**kwargs)
+
+
+def test_analysis_rate_is_opt_in(monkeypatch):
+    pytest.importorskip('mediapipe')
+    from emotion_processor.main import options_from_env
+
+    monkeypatch.delenv('FACESENSE_ANALYSIS_HZ', raising=False)
+    assert 'analysis_hz' not in options_from_env()
+    monkeypatch.setenv('FACESENSE_ANALYSIS_HZ', '10')
+    assert options_from_env()['analysis_hz'] == 10.0
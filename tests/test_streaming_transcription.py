@@ -0,0 +1,88 @@
+"""
+Pruebas de StreamingTranscript: cómo se confirman y reemplazan las hipótesis parciales.
+
+    python -m pytest tests/test_streaming_transcription.py
+"""
+import pytest
+from streaming_transcription import StreamingTranscript, words_from_result
+
+
+def _words(text: str, start: float = 0.0, step: float = 0.4):
+    """Palabras con tiempos consecutivos de `step` segundos desde `start`."""
+    return [(word, start + i * step, start + (i + 1) * step) for i, word in enumerate(text.split())]
+
+
+def test_agreed_prefix_is_committed_and_the_rest_stays_partial():
+    transcript = StreamingTranscript()
+    assert transcript.update(_words("hoy me siento")) is None
+    assert transcript.partial_text == "hoy me siento"
+
+    committed_until = transcript.update(_words("hoy me siento bastante"))
+    assert transcript.committed_text == "hoy me siento"
+    assert transcript.partial_text == "bastante"
+    assert committed_until == pytest.approx(1.2)
+
+
+def test_agreement_ignores_case_and_punctuation():
+    transcript = StreamingTranscript()
+    transcript.update(_words("Hola, ¿cómo"))
+    transcript.update(_words("hola cómo estás"))
+    assert transcript.committed_text == "hola cómo"
+
+
+def test_partial_is_replaced_by_the_next_hypothesis():
+    transcript = StreamingTranscript()
+    transcript.update(_words("me siento"))
+    transcript.update(_words("me siento bien aunque"))
+    assert transcript.partial_text == "bien aunque"
+
+    # la siguiente ventana corrige el final: la parte no confirmada se reemplaza, no se concatena
+    transcript.update(_words("bien aunque cansado", start=0.8))
+    transcript.update(_words("cansada hoy", start=1.6))
+    assert transcript.committed_text == "me siento bien aunque"
+    assert transcript.partial_text == "cansada hoy"
+
+
+def test_final_commit_takes_the_latest_hypothesis():
+    transcript = StreamingTranscript()
+    transcript.update(_words("estoy muy"))
+    transcript.update(_words("estoy muy triste por"))
+    transcript.update(_words("cansado de todo", start=0.8))
+
+    # fin del enunciado: se confirma la última hipótesis entera, no la parcial anterior
+    assert transcript.commit_all() == 2.0
+    assert transcript.committed_text == "estoy muy cansado de todo"
+    assert transcript.partial_text == ""
+    assert transcript.commit_all() is None
+
+
+def test_out_of_order_update_does_not_duplicate_committed_words():
+    transcript = StreamingTranscript()
+    transcript.update(_words("creo que"))
+    transcript.update(_words("creo que todo va"))
+    assert transcript.committed_text == "creo que"
+
+    # llega una ventana atrasada que vuelve a cubrir el audio ya confirmado: solo cuenta lo posterior
+    assert transcript.update(_words("creo que todo")) == pytest.approx(1.2)
+    assert transcript.committed_text == "creo que todo"
+    assert transcript.partial_text == ""
+
+    transcript.update(_words("va mejor", start=1.2))
+    transcript.update(_words("va mejor hoy", start=1.2))
+    assert transcript.committed_text == "creo que todo va mejor"
+    assert transcript.partial_text == "hoy"
+
+
+def test_prompt_uses_the_end_of_the_committed_text():
+    transcript = StreamingTranscript()
+    assert transcript.prompt() is None
+    transcript.update(_words("uno dos tres"))
+    transcript.update(_words("uno dos tres cuatro"))
+    assert transcript.prompt(max_chars=8) == "dos tres"
+
+
+def test_words_from_result_applies_the_offset():
+    result = {"segments": [{"words": [{"word": " hola", "start": 0.0, "end": 0.3},
+                                      {"word": " ", "start": 0.3, "end": 0.3}]},
+                           {"words": [{"word": " mundo", "start": 0.5, "end": 0.9}]}]}
+    assert words_from_result(result, offset=2.0) == [("hola", 2.0, 2.3), ("mundo", 2.5, 2.9)]
@@ -0,0 +1,69 @@
+"""
+Pruebas de Camera en modo con hilo, con una captura falsa que entrega un frame cada vez que la prueba
+lo permite.
+
+    python -m pytest tests/test_threaded_camera.py
+"""
+from threading import Semaphore
+import cv2
+import numpy as np
+import pytest
+from examples.camera import Camera
+
+
+class FakeCapture:
+    """Sustituto de cv2.VideoCapture: read() espera a que la prueba libere el siguiente frame."""
+    def __init__(self, *args):
+        self.pending = Semaphore(1)  # el primer frame (start_grabber) está disponible de inmediato
+        self.count = 0
+        self.opened = True
+
+    def isOpened(self):
+        return self.opened
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        if not self.pending.acquire(timeout=0.05):
+            return False, None
+        self.count += 1
+        return True, np.full((4, 4, 3), self.count, dtype=np.uint8)
+
+    def release(self):
+        self.opened = False
+
+
+@pytest.fixture
+def camera(monkeypatch):
+    monkeypatch.setattr(cv2, 'VideoCapture', FakeCapture)
+    cam = Camera(0, 4, 4, threaded=True)
+    yield cam
+    cam.release()
+
+
+def test_delivers_each_frame_once(camera):
+    ret, frame = camera.read(timeout=0.5)
+    assert ret and frame[0, 0, 0] == 1
+
+    camera.cap.pending.release()
+    ret, frame = camera.read(timeout=0.5)
+    assert ret and frame[0, 0, 0] == 2
+
+
+def test_timeout_without_a_new_frame_is_not_a_frame(camera):
+    assert camera.read(timeout=0.5)[0]
+    timestamp = camera.last_read_timestamp
+
+    assert camera.read(timeout=0.1) == (False, None)
+    assert camera.last_read_timestamp == timestamp
+
+
+def test_non_blocking_read_only_returns_new_frames(camera):
+    assert camera.read(block=False)[0]
+    assert camera.read(block=False) == (False, None)
+
+    camera.cap.pending.release()
+    ret, _ = camera.read(timeout=0.5)
+    assert ret
+
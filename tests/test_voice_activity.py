@@ -0,0 +1,132 @@
+"""
+Pruebas del VAD (voice_activity) sobre WAV generados: ráfagas de tonos en la banda de voz sobre un
+zumbido de 60 Hz que va subiendo de nivel.
+
+    python -m pytest tests/test_voice_activity.py
+"""
+import wave
+import numpy as np
+import pytest
+from voice_activity import UtteranceSegmenter, VoiceActivityDetector, find_utterances, read_wav
+
+SAMPLE_RATE = 16000
+DURATION = 12.0
+# (inicio, fin) en segundos; las dos primeras están separadas por menos de silence_duration (1.5 s)
+BURSTS = [(1.0, 2.0), (2.5, 3.2), (6.0, 7.5), (10.0, 10.8)]
+EXPECTED = [(1.0, 3.2), (6.0, 7.5), (10.0, 10.8)]
+PADDING = 0.1
+# la voz se mantiene activa hangover_frames (10) tramas de 32 ms después de la última trama con voz
+HANGOVER = 10 * 512 / SAMPLE_RATE
+# onset de 3 tramas de 32 ms más el redondeo a trama en cada borde
+TOLERANCE = 0.1
+
+
+def _hum(duration: float, rng: np.random.Generator) -> np.ndarray:
+    """Zumbido de 60 Hz que sube de 0.02 a 0.2 de amplitud, con un piso de ruido blanco a -66 dB."""
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    amplitude = np.linspace(0.02, 0.2, len(t))
+    return amplitude * np.sin(2 * np.pi * 60.0 * t) + rng.normal(0.0, 0.0005, len(t))
+
+
+def _tones(duration: float, bursts) -> np.ndarray:
+    """Ráfagas de 500 Hz + 1200 Hz (dentro de la banda de voz) con rampas de 10 ms."""
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    signal = np.zeros_like(t)
+    ramp = int(0.01 * SAMPLE_RATE)
+    for start, end in bursts:
+        i, j = int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)
+        envelope = np.ones(j - i)
+        envelope[:ramp] = np.linspace(0.0, 1.0, ramp)
+        envelope[-ramp:] = np.linspace(1.0, 0.0, ramp)
+        signal[i:j] = envelope * 0.05 * (np.sin(2 * np.pi * 500.0 * t[i:j]) + np.sin(2 * np.pi * 1200.0 * t[i:j]))
+    return signal
+
+
+def _write_wav(path, audio: np.ndarray):
+    with wave.open(str(path), 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes((np.clip(audio, -1.0, 1.0) * 32767.0).astype('<i2').tobytes())
+
+
+@pytest.fixture
+def speech_wav(tmp_path):
+    path = tmp_path / "bursts_over_hum.wav"
+    _write_wav(path, _hum(DURATION, np.random.default_rng(0)) + _tones(DURATION, BURSTS))
+    return path
+
+
+@pytest.fixture
+def hum_wav(tmp_path):
+    path = tmp_path / "hum.wav"
+    _write_wav(path, _hum(DURATION, np.random.default_rng(1)))
+    return path
+
+
+def _seconds(segments):
+    return [(start / SAMPLE_RATE, end / SAMPLE_RATE) for start, end in segments]
+
+
+def test_segment_boundaries(speech_wav):
+    audio, rate = read_wav(str(speech_wav))
+    assert rate == SAMPLE_RATE
+
+    segments = _seconds(find_utterances(audio, rate))
+
+    assert len(segments) == len(EXPECTED)
+    for (start, end), (expected_start, expected_end) in zip(segments, EXPECTED):
+        assert start == pytest.approx(expected_start - PADDING, abs=TOLERANCE)
+        assert end == pytest.approx(expected_end + HANGOVER + PADDING, abs=TOLERANCE)
+
+
+def test_hum_alone_produces_no_segments(hum_wav):
+    audio, rate = read_wav(str(hum_wav))
+    assert find_utterances(audio, rate) == []
+
+
+def test_short_click_does_not_start_speech():
+    # una trama de tono toca como mucho 2 tramas del VAD: menos que onset_frames (3)
+    vad = VoiceActivityDetector(SAMPLE_RATE)
+    click = vad.frame_length / SAMPLE_RATE
+    audio = _hum(4.0, np.random.default_rng(2)) + _tones(4.0, [(2.0, 2.0 + click)])
+    assert find_utterances(audio, SAMPLE_RATE, vad=vad) == []
+
+
+def test_noise_floor_adapts_to_stationary_noise():
+    # Ruido blanco (también dentro de la banda de voz) que se enciende a los 2 s y no se apaga:
+    # el piso de ruido lo alcanza en floor_window segundos y el enunciado se cierra
+    rng = np.random.default_rng(3)
+    audio = _hum(20.0, rng)
+    audio[2 * SAMPLE_RATE:] += rng.normal(0.0, 0.02, 18 * SAMPLE_RATE)
+
+    vad = VoiceActivityDetector(SAMPLE_RATE, floor_window=5.0)
+    segments = _seconds(find_utterances(audio, SAMPLE_RATE, max_duration=60.0, vad=vad))
+
+    assert len(segments) == 1
+    start, end = segments[0]
+    assert start == pytest.approx(2.0 - PADDING, abs=TOLERANCE)
+    assert end < 2.0 + 5.0 + 1.0
+
+
+def test_flush_extends_active_speech_to_end():
+    audio = _hum(4.0, np.random.default_rng(4)) + _tones(4.0, [(2.0, 4.0)])
+    segmenter = UtteranceSegmenter(VoiceActivityDetector(SAMPLE_RATE))
+
+    assert segmenter.push(audio) == []
+    assert segmenter.in_utterance
+    start, end = segmenter.flush(end=len(audio))
+    assert start / SAMPLE_RATE == pytest.approx(2.0 - PADDING, abs=TOLERANCE)
+    assert end == len(audio)
+
+
+def test_flush_after_speech_ends_adds_padding():
+    # La voz (con su hangover) terminó antes del fin sin llegar a silence_duration: flush cierra en
+    # fin de voz + padding, no en el fin del audio
+    audio = _hum(5.0, np.random.default_rng(5)) + _tones(5.0, [(2.0, 3.5)])
+    segmenter = UtteranceSegmenter(VoiceActivityDetector(SAMPLE_RATE))
+
+    assert segmenter.push(audio) == []
+    start, end = segmenter.flush(end=len(audio))
+    assert end / SAMPLE_RATE == pytest.approx(3.5 + HANGOVER + PADDING, abs=TOLERANCE)
+    assert segmenter.flush() is None
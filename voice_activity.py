@@ -0,0 +1,204 @@
+"""
+Detección de actividad de voz (VAD) con piso de ruido adaptativo y segmentación en enunciados
+"""
+from collections import deque
+from typing import List, Optional, Tuple
+import numpy as np
+
+# (inicio, fin) en muestras absolutas
+Segment = Tuple[int, int]
+
+
+class VoiceActivityDetector:
+    """
+    Clasifica el audio en tramas de `frame_length` muestras como voz o no voz.
+
+    Solo se mide la energía espectral en la banda de voz (`speech_band`): el zumbido de equipos
+    (50/60 Hz) o el siseo de alta frecuencia no cuentan aunque sean fuertes. Una trama es candidata
+    a voz si esa energía supera el piso de ruido en `snr_db` (y un mínimo absoluto). El piso de ruido
+    es el mínimo de la energía en los últimos `floor_window` segundos (estadística de mínimos): la voz
+    siempre tiene pausas dentro de esa ventana, el ruido estacionario no, así que un ventilador que se
+    enciende deja de contar como voz a los pocos segundos y un enunciado no queda abierto para siempre.
+
+    Histéresis: la voz empieza tras `onset_frames` tramas candidatas seguidas y se mantiene
+    `hangover_frames` tramas después de la última, para no cortar pausas cortas ni consonantes débiles.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_length: int = 512, snr_db: float = 9.0,
+                 min_energy_db: float = -55.0, speech_band: Tuple[float, float] = (200.0, 4000.0),
+                 onset_frames: int = 3, hangover_frames: int = 10, floor_window: float = 5.0):
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.snr_db = snr_db
+        self.min_energy_db = min_energy_db
+        self.onset_frames = onset_frames
+        self.hangover_frames = hangover_frames
+        self.floor_frames = max(1, int(floor_window * sample_rate / frame_length))
+
+        frequencies = np.fft.rfftfreq(frame_length, 1.0 / sample_rate)
+        self._band = (frequencies >= speech_band[0]) & (frequencies <= speech_band[1])
+        self._window = np.hanning(frame_length).astype(np.float32)
+        self._window_power = float(np.sum(self._window.astype(np.float64) ** 2))
+        self.reset()
+
+    def reset(self):
+        self.noise_floor_db: Optional[float] = None
+        self.speaking = False
+        self._frame_index = 0
+        self._minimum = deque()  # (trama, energía) crecientes en energía: mínimo deslizante en O(1)
+        self._speech_run = 0
+        self._silence_run = 0
+
+    def features(self, samples: np.ndarray) -> np.ndarray:
+        """Energía (dB respecto a escala completa) en la banda de voz de cada trama completa."""
+        count = len(samples) // self.frame_length
+        frames = np.asarray(samples[:count * self.frame_length], dtype=np.float32).reshape(count, self.frame_length)
+        spectrum = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2
+        # Parseval con la ventana de Hann: energía media por muestra de la banda
+        band_energy = 2.0 * spectrum[:, self._band].sum(axis=1) / (self.frame_length * self._window_power)
+        return 10.0 * np.log10(band_energy + 1e-12)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Procesa las tramas completas de `samples` (el resto se ignora) y retorna un bool por trama:
+        True mientras la voz está activa, con la histéresis ya aplicada.
+        """
+        energy_db = self.features(samples)
+        flags = np.zeros(len(energy_db), dtype=bool)
+
+        minimum = self._minimum
+
+        for i, level in enumerate(energy_db.tolist()):
+            # Piso de ruido: mínimo de la energía en la ventana deslizante
+            while minimum and minimum[-1][1] >= level:
+                minimum.pop()
+            minimum.append((self._frame_index, level))
+            if minimum[0][0] <= self._frame_index - self.floor_frames:
+                minimum.popleft()
+            self._frame_index += 1
+            self.noise_floor_db = minimum[0][1]
+
+            candidate = level > self.noise_floor_db + self.snr_db and level > self.min_energy_db
+
+            if candidate:
+                self._speech_run += 1
+                self._silence_run = 0
+            else:
+                self._speech_run = 0
+                self._silence_run += 1
+
+            if not self.speaking and self._speech_run >= self.onset_frames:
+                self.speaking = True
+            elif self.speaking and self._silence_run > self.hangover_frames:
+                self.speaking = False
+            flags[i] = self.speaking
+        return flags
+
+
+class UtteranceSegmenter:
+    """
+    Agrupa la salida del VAD en enunciados: un enunciado termina tras `silence_duration` segundos
+    sin voz o al llegar a `max_duration` segundos. El silencio final no se incluye; se agregan
+    `padding` segundos antes y después de la voz.
+
+    Se alimenta con bloques consecutivos de audio (múltiplos de vad.frame_length) y trabaja con
+    posiciones absolutas en muestras, las mismas del buffer circular de captura.
+    """
+
+    def __init__(self, vad: VoiceActivityDetector, silence_duration: float = 1.5, max_duration: float = 30.0,
+                 padding: float = 0.1):
+        self.vad = vad
+        self.silence_samples = int(silence_duration * vad.sample_rate)
+        self.max_samples = int(max_duration * vad.sample_rate)
+        self.padding_samples = int(padding * vad.sample_rate)
+        self.reset()
+
+    def reset(self, position: int = 0):
+        self.vad.reset()
+        self.position = position         # siguiente muestra a procesar
+        self.start: Optional[int] = None  # inicio del enunciado en curso
+        self._speech_end = None           # fin de la última trama con voz del enunciado en curso
+        self._previous_end = position
+
+    @property
+    def in_utterance(self) -> bool:
+        return self.start is not None
+
+    def push(self, samples: np.ndarray) -> List[Segment]:
+        """Procesa un bloque y retorna los enunciados que quedaron cerrados."""
+        closed = []
+        frame_length = self.vad.frame_length
+        flags = self.vad.process(samples)
+
+        for i, speaking in enumerate(flags.tolist()):
+            frame_start = self.position + i * frame_length
+            frame_end = frame_start + frame_length
+
+            if speaking:
+                if self.start is None:
+                    onset = frame_start - (self.vad.onset_frames - 1) * frame_length
+                    self.start = max(onset - self.padding_samples, self._previous_end)
+                self._speech_end = frame_end
+                if frame_end - self.start >= self.max_samples:
+                    closed.append(self._close(frame_end))
+            elif self.start is not None and frame_end - self._speech_end >= self.silence_samples:
+                closed.append(self._close(min(self._speech_end + self.padding_samples, frame_end)))
+
+        self.position += len(flags) * frame_length
+        return closed
+
+    def flush(self, end: Optional[int] = None) -> Optional[Segment]:
+        """Cierra el enunciado en curso (fin de la captura); `end` extiende la voz activa hasta esa posición."""
+        if self.start is None:
+            return None
+        if self.vad.speaking:
+            stop = max(end or self.position, self._speech_end)
+        else:
+            stop = min(self._speech_end + self.padding_samples, self.position)
+        return self._close(stop)
+
+    def _close(self, end: int) -> Segment:
+        segment = (self.start, end)
+        self._previous_end = end
+        self.start = None
+        self._speech_end = None
+        return segment
+
+
+def find_utterances(audio: np.ndarray, sample_rate: int = 16000, silence_duration: float = 1.5,
+                    max_duration: float = 30.0, vad: Optional[VoiceActivityDetector] = None) -> List[Segment]:
+    """Enunciados (inicio, fin) en muestras de una grabación completa, p. ej. un WAV de 16 kHz mono."""
+    segmenter = UtteranceSegmenter(vad or VoiceActivityDetector(sample_rate), silence_duration, max_duration)
+    segments = segmenter.push(audio)
+    last = segmenter.flush(end=len(audio))
+    if last is not None:
+        segments.append(last)
+    return segments
+
+
+def read_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Lee un WAV PCM de 16 bits como float32 mono en [-1, 1] (promedia los canales)."""
+    import wave
+    with wave.open(path, 'rb') as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Only 16-bit PCM WAV files are supported: {path}")
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        pcm = np.frombuffer(wav.readframes(wav.getnframes()), dtype='<i2')
+    audio = pcm.reshape(-1, channels).mean(axis=1) if channels > 1 else pcm
+    return audio.astype(np.float32) / 32768.0, sample_rate
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Uso: python voice_activity.py grabacion.wav")
+        sys.exit(1)
+
+    audio, rate = read_wav(sys.argv[1])
+    utterances = find_utterances(audio, rate)
+    speech = sum(end - start for start, end in utterances) / rate
+    for start, end in utterances:
+        print(f"🎙️  {start / rate:8.2f}s - {end / rate:8.2f}s ({(end - start) / rate:.2f}s)")
+    print(f"✅ {len(utterances)} enunciados, {speech:.1f}s de voz en {len(audio) / rate:.1f}s de audio")
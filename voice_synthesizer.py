@@ -9,6 +9,7 @@ import tempfile
 import os
 from threading import Thread
 import time
+from metrics import timed
 
 
 class VoiceSynthesizer:
@@ -77,7 +78,8 @@ class VoiceSynthesizer:
                 pitch=pitch
             )
             
-            await communicate.save(audio_file)
+            with timed('tts_synthesis'):
+                await communicate.save(audio_file)
             
             # Reproducir audio
             print("🔊 Reproduciendo voz...")
@@ -146,8 +148,9 @@ class SimpleVoiceSynthesizer:
             audio_file = os.path.join(self.temp_dir, f"tts_{int(time.time())}.mp3")
             
             # Generar audio
-            tts = gTTS(text=text, lang='es', slow=slow)
-            tts.save(audio_file)
+            with timed('tts_synthesis'):
+                tts = gTTS(text=text, lang='es', slow=slow)
+                tts.save(audio_file)
             
             # Reproducir
             pygame.mixer.music.load(audio_file)